@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from benchmarks.harness import (
+    Metric,
+    compare,
+    format_comparison,
+    format_metric,
+    load_baseline,
+    save_baseline,
+)
+
+SUITES = {
+    "core": "benchmarks.bench_core",
+    "alloc": "benchmarks.bench_alloc",
+    "pygame": "benchmarks.bench_pygame",
+    "textual": "benchmarks.bench_textual",
+}
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+
+
+def collect(suites: Sequence[str], quick: bool, match: str | None) -> Iterator[Metric]:
+    for suite in suites:
+        module = importlib.import_module(SUITES[suite])
+        for metric in module.collect(quick):
+            if match is None or match in metric.name:
+                print(format_metric(metric), file=sys.stderr, flush=True)
+                yield metric
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("run", "measure and write a baseline file"),
+        ("compare", "measure and fail on regressions against a baseline"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+        command.add_argument("--suite", choices=SUITES, action="append")
+        command.add_argument("--match", help="only metrics containing this text")
+        command.add_argument("--quick", action="store_true", help="small grids only")
+        if name == "compare":
+            command.add_argument(
+                "--threshold",
+                type=float,
+                default=0.25,
+                help="allowed relative slowdown before failing (default 0.25)",
+            )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    metrics = list(collect(args.suite or list(SUITES), args.quick, args.match))
+    if args.command == "run":
+        save_baseline(metrics, args.baseline)
+        print(f"wrote {len(metrics)} metrics to {args.baseline}")
+        return 0
+
+    results = compare(load_baseline(args.baseline), metrics, args.threshold)
+    for result in results:
+        print(format_comparison(result))
+    regressions = [result for result in results if result.regressed]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed past {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
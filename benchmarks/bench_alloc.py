@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import replace
+
+from benchmarks.harness import Metric
+from benchmarks.scenarios import game_on_cycle, snake_length
+from snake_game.core import DOWN, RIGHT
+
+TICKS = 5000
+
+
+def collect(quick: bool) -> Iterator[Metric]:
+    size = 20 if quick else 100
+    game, turns = game_on_cycle(size, size, snake_length(size, size, 0.1))
+    label = f"{size}x{size}"
+
+    def steps() -> list[object]:
+        kept = []
+        for _ in range(TICKS):
+            game.set_direction(turns[game.state.head])
+            kept.append(game.step())
+        return kept
+
+    yield from _metrics(f"alloc.step/{label}", steps, TICKS)
+
+    def history() -> list[object]:
+        # Snapshots whose body was read, as undo stacks or replays would.
+        kept = []
+        for _ in range(TICKS):
+            game.set_direction(turns[game.state.head])
+            state = game.step().state
+            kept.append((state, state.snake[-1]))
+        return kept
+
+    yield from _metrics(f"alloc.history/{label}", history, TICKS)
+
+    def turns_only() -> list[object]:
+        for _ in range(TICKS):
+            game.set_direction(DOWN)
+            game.set_direction(RIGHT)
+        return []
+
+    yield from _metrics(f"alloc.set_direction/{label}", turns_only, TICKS * 2)
+
+    state = game.state
+    yield from _metrics(
+        f"alloc.replace/{label}",
+        lambda: [replace(state, direction=DOWN) for _ in range(TICKS)],
+        TICKS,
+    )
+
+
+def _metrics(
+    name: str, run: Callable[[], list[object]], calls: int
+) -> Iterator[Metric]:
+    # Per call: bytes and blocks still held after ``run`` (which keeps its
+    # results alive, as a caller storing StepResults would), and the peak.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes, _peak = tracemalloc.get_traced_memory()
+        kept = run()
+        _current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del kept
+    yield Metric(f"{name}/bytes", size / calls, "B")
+    yield Metric(f"{name}/blocks", blocks / calls, "blocks")
+    yield Metric(f"{name}/peak", (peak - start_bytes) / calls, "B")
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import replace
+from pathlib import Path
+from random import Random
+
+from benchmarks.harness import Metric, time_per_call
+from benchmarks.scenarios import (
+    FILLS,
+    GRID_SIZES,
+    QUICK_GRID_SIZES,
+    cycle_moves,
+    game_on_cycle,
+    snake_length,
+)
+from snake_game.controllers import (
+    AutopilotController,
+    GreedyController,
+    HamiltonianController,
+)
+from snake_game.core import DOWN, LEFT, RIGHT, UP
+from snake_game.hamiltonian import CycleCache, build_cycle
+from snake_game.headless import play_game
+from snake_game.reachability import Reachability
+from snake_game.replay import ReplayFile, ReplayRecorder, play
+from snake_game.snapshot import dump_game, load_game
+
+STEPS_PER_SAMPLE = 2000
+AUTOPILOT_SIZES = (20, 50, 100)
+QUICK_AUTOPILOT_SIZES = (20,)
+AUTOPILOT_TICKS = 5000
+HAMILTONIAN_SIZES = (20, 100)
+QUICK_HAMILTONIAN_SIZES = (20,)
+CYCLE_SIZE = 1000
+REACHABILITY_SIZES = (20, 100, 500)
+QUICK_REACHABILITY_SIZES = (20, 100)
+REPLAY_TICKS = 5000
+LOOKAHEAD_STEPS = 10
+SEEK_TICKS = 40_000
+
+
+def collect(quick: bool) -> Iterator[Metric]:
+    for size in QUICK_GRID_SIZES if quick else GRID_SIZES:
+        for fill in FILLS:
+            yield from _collect_grid(size, fill, quick)
+    yield from _collect_replay(quick)
+    yield from _collect_seek(quick)
+    yield from _collect_autopilot(quick)
+    yield from _collect_hamiltonian(quick)
+    yield from _collect_reachability(quick)
+
+
+def _collect_replay(quick: bool) -> Iterator[Metric]:
+    # A greedy wraparound game recorded tick by tick, then played back at full
+    # speed through step_many().
+    recorder = ReplayRecorder(20, 20, wrap=True, seed=0)
+    controller = GreedyController(wrap=True)
+    for _ in range(REPLAY_TICKS):
+        direction = controller.choose(recorder)
+        if direction is not None:
+            recorder.set_direction(direction)
+        if recorder.step().game_over:
+            break
+    replay = recorder.replay()
+    per_tick = (
+        time_per_call(lambda: play(replay), number=1, repeat=3 if quick else 5)
+        / replay.ticks
+    )
+    yield Metric("core.replay_playback/20x20", per_tick)
+    yield Metric("core.replay_ticks_per_sec/20x20", 1 / per_tick, "ticks/s", True)
+
+
+def _collect_grid(size: int, fill: float, quick: bool) -> Iterator[Metric]:
+    label = f"{size}x{size}/fill{int(fill * 100):02d}"
+    repeat = 3 if quick else 5
+    game, turns = game_on_cycle(size, size, snake_length(size, size, fill))
+
+    def advance() -> None:
+        for _ in range(STEPS_PER_SAMPLE):
+            game.set_direction(turns[game.state.head])
+            game.step()
+
+    per_step = time_per_call(advance, number=1, repeat=repeat) / STEPS_PER_SAMPLE
+    yield Metric(f"core.step/{label}", per_step)
+    yield Metric(f"core.ticks_per_sec/{label}", 1 / per_step, "ticks/s", True)
+
+    def fast_forward() -> None:
+        game.step_many(cycle_moves(turns, game.state.head, STEPS_PER_SAMPLE))
+
+    yield Metric(
+        f"core.step_many/{label}",
+        time_per_call(fast_forward, number=1, repeat=repeat) / STEPS_PER_SAMPLE,
+    )
+
+    yield Metric(
+        f"core.place_food/{label}",
+        time_per_call(game._place_food, number=1000, repeat=repeat),
+    )
+
+    def turn() -> None:
+        game.set_direction(DOWN)
+        game.set_direction(RIGHT)
+
+    yield Metric(
+        f"core.set_direction/{label}",
+        time_per_call(turn, number=1000, repeat=repeat) / 2,
+    )
+
+    state = game.state
+    yield Metric(
+        f"core.replace_direction/{label}",
+        time_per_call(
+            lambda: replace(state, direction=DOWN), number=1000, repeat=repeat
+        ),
+    )
+
+    # Neither fork() nor a fork's moves copy the body or the board: the fork reads
+    # its parent's trail and occupancy map through an overlay of its own changes.
+    # fork_step guards that; it grew with body + board while the first move copied.
+    yield Metric(
+        f"core.fork/{label}", time_per_call(game.fork, number=1000, repeat=repeat)
+    )
+    yield Metric(
+        f"core.fork_step/{label}",
+        time_per_call(lambda: game.fork().step(), number=200, repeat=repeat),
+    )
+
+    def lookahead() -> None:
+        child = game.fork()
+        for _ in range(LOOKAHEAD_STEPS):
+            child.set_direction(turns[child.state.head])
+            child.step()
+
+    yield Metric(
+        f"core.fork_lookahead/{label}",
+        time_per_call(lookahead, number=50, repeat=repeat),
+    )
+
+    # Both directions are linear in the body length, not the board size.
+    snapshots = 200 if size <= 100 else 5
+    yield Metric(
+        f"core.snapshot/{label}",
+        time_per_call(lambda: dump_game(game), number=snapshots, repeat=repeat),
+    )
+    data = dump_game(game)
+    yield Metric(
+        f"core.snapshot_restore/{label}",
+        time_per_call(lambda: load_game(data), number=snapshots, repeat=repeat),
+    )
+
+
+def _collect_seek(quick: bool) -> Iterator[Metric]:
+    # A long wraparound game on a large board, saved with keyframes; seeking
+    # restores one keyframe and re-simulates less than one interval.
+    size = 100
+    ticks = SEEK_TICKS // 4 if quick else SEEK_TICKS
+    recorder = ReplayRecorder(size, size, wrap=True, seed=0)
+    for tick in range(ticks):
+        if tick % 37 == 0:
+            recorder.set_direction(DOWN if tick % 74 else RIGHT)
+        recorder.step()
+    replay = recorder.replay()
+    targets = Random(0).choices(range(replay.ticks + 1), k=20)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "seek.snkr"
+        replay.save(path)
+        with ReplayFile(path) as reader:
+            yield Metric(
+                f"core.replay_seek/{size}x{size}/{ticks}ticks",
+                time_per_call(
+                    lambda: [reader.state_at(tick) for tick in targets],
+                    number=1,
+                    repeat=3 if quick else 5,
+                )
+                / len(targets),
+            )
+
+
+def _collect_autopilot(quick: bool) -> Iterator[Metric]:
+    # Headless autopilot games: one distance-field decision plus one step per tick.
+    for size in QUICK_AUTOPILOT_SIZES if quick else AUTOPILOT_SIZES:
+        for wrap in (False, True):
+            best = float("inf")
+            for _ in range(3 if quick else 5):
+                started = time.perf_counter()
+                outcome = play_game(
+                    AutopilotController(wrap=wrap),
+                    size,
+                    size,
+                    seed=0,
+                    wrap=wrap,
+                    max_ticks=AUTOPILOT_TICKS,
+                )
+                best = min(best, (time.perf_counter() - started) / outcome.ticks)
+            mode = "wrap" if wrap else "walls"
+            yield Metric(f"core.autopilot_tick/{size}x{size}/{mode}", best)
+
+
+def _collect_hamiltonian(quick: bool) -> Iterator[Metric]:
+    # One cycle-following decision plus one step per tick, starting from a snake
+    # laid along the cycle at each fill.
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CycleCache(Path(directory))
+        for size in QUICK_HAMILTONIAN_SIZES if quick else HAMILTONIAN_SIZES:
+            for fill in FILLS:
+                best = float("inf")
+                for _ in range(3 if quick else 5):
+                    game, _turns = game_on_cycle(
+                        size, size, snake_length(size, size, fill)
+                    )
+                    controller = HamiltonianController(cache=cache)
+                    ticks = 0
+                    started = time.perf_counter()
+                    while ticks < STEPS_PER_SAMPLE:
+                        ticks += 1
+                        game.set_direction(controller.choose(game))
+                        if game.step().game_over:
+                            break
+                    best = min(best, (time.perf_counter() - started) / ticks)
+                label = f"{size}x{size}/fill{int(fill * 100):02d}"
+                yield Metric(f"core.hamiltonian_tick/{label}", best)
+
+        label = f"{CYCLE_SIZE}x{CYCLE_SIZE}"
+        cache.load(CYCLE_SIZE, CYCLE_SIZE, wrap=False)
+        repeat = 3 if quick else 5
+        yield Metric(
+            f"core.cycle_build/{label}",
+            time_per_call(
+                lambda: build_cycle(CYCLE_SIZE, CYCLE_SIZE, wrap=False),
+                number=1,
+                repeat=repeat,
+            ),
+        )
+        yield Metric(
+            f"core.cycle_load/{label}",
+            time_per_call(
+                lambda: CycleCache(Path(directory)).load(
+                    CYCLE_SIZE, CYCLE_SIZE, wrap=False
+                ),
+                number=1,
+                repeat=repeat,
+            ),
+        )
+
+
+def _collect_reachability(quick: bool) -> Iterator[Metric]:
+    for size in QUICK_REACHABILITY_SIZES if quick else REACHABILITY_SIZES:
+        for fill in FILLS:
+            yield from _collect_regions(size, fill, quick)
+
+
+def _collect_regions(size: int, fill: float, quick: bool) -> Iterator[Metric]:
+    # Per tick: update the regions after one step, then ask for the region size in
+    # front of the head in all four directions. ``relabel`` is the flood fill the
+    # incremental update replaces.
+    label = f"{size}x{size}/fill{int(fill * 100):02d}"
+    repeat = 3 if quick else 5
+    game, turns = game_on_cycle(size, size, snake_length(size, size, fill))
+    reachability = Reachability()
+    reachability.update(game.state)
+    reachability.region_size(game.state.head)
+
+    def advance() -> None:
+        for _ in range(STEPS_PER_SAMPLE):
+            game.set_direction(turns[game.state.head])
+            game.step()
+            state = game.state
+            reachability.update(state)
+            x, y = state.head
+            for dx, dy in (UP, DOWN, LEFT, RIGHT):
+                if 0 <= x + dx < size and 0 <= y + dy < size:
+                    reachability.region_size((x + dx, y + dy))
+
+    yield Metric(
+        f"core.reachability_tick/{label}",
+        time_per_call(advance, number=1, repeat=repeat) / STEPS_PER_SAMPLE,
+    )
+    yield Metric(
+        f"core.reachability_relabel/{label}",
+        time_per_call(reachability._relabel, number=1, repeat=repeat),
+    )
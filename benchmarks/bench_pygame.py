@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from benchmarks.harness import Metric, time_per_call
+from benchmarks.scenarios import FILLS, game_on_cycle, snake_length
+from snake_game import pygame_ui as ui
+from snake_game.settings import SettingsStore
+
+# Window sizes grow with the board (CELL_SIZE px per cell), so stay well below
+# the sizes used for the core benchmarks.
+RENDER_SIZES = (20, 50, 100)
+QUICK_RENDER_SIZES = (20,)
+FRAMES_PER_SAMPLE = 200
+# Seconds the scripted main loop spends in each phase; GAME_OVER lasts as long as
+# its countdown.
+PHASE_SECONDS = 2.0
+QUICK_PHASE_SECONDS = 0.5
+
+
+def collect(quick: bool) -> Iterator[Metric]:
+    pygame.init()
+    try:
+        pygame.display.set_mode((1, 1))
+        yield from _collect_text(quick)
+        for size in QUICK_RENDER_SIZES if quick else RENDER_SIZES:
+            for fill in FILLS:
+                yield from _collect_board(size, fill, quick)
+        yield from _collect_loop(quick)
+    finally:
+        pygame.quit()
+
+
+def _collect_text(quick: bool) -> Iterator[Metric]:
+    surface = pygame.Surface((640, 120))
+    status = "Score: 123  RUNNING  Wrap: OFF"
+    number = 20 if quick else 100
+    repeat = 3 if quick else 5
+    yield Metric(
+        "pygame.draw_bitmap_text/status_line",
+        time_per_call(
+            lambda: ui._draw_bitmap_text(surface, status, (0, 0), ui.COLOR_TEXT),
+            number=number,
+            repeat=repeat,
+        ),
+    )
+    # The three HUD lines a PLAYING frame draws, from the string cache and with
+    # both caches emptied first (the cost of lines never drawn before).
+    lines = (
+        status,
+        "Controls: arrows/WASD move, P pause",
+        "R restart, T autopilot, Esc menu",
+    )
+
+    def hud() -> None:
+        for index, line in enumerate(lines):
+            ui._draw_text(surface, line, (0, index * 20))
+
+    def cold_hud() -> None:
+        ui._text_surface.cache_clear()
+        ui._glyph_surface.cache_clear()
+        hud()
+
+    yield Metric(
+        "pygame.hud_frame/cached",
+        time_per_call(hud, number=number, repeat=repeat),
+    )
+    yield Metric(
+        "pygame.hud_frame/uncached",
+        time_per_call(cold_hud, number=number, repeat=repeat),
+    )
+
+
+def _collect_board(size: int, fill: float, quick: bool) -> Iterator[Metric]:
+    game, _turns = game_on_cycle(size, size, snake_length(size, size, fill))
+    grid_w = size * ui.CELL_SIZE
+    grid_h = size * ui.CELL_SIZE
+    surface = pygame.Surface(
+        (grid_w + ui.PADDING * 2, grid_h + ui.PADDING * 2 + ui.INFO_HEIGHT)
+    )
+    yield Metric(
+        f"pygame.render_playing/{size}x{size}/fill{int(fill * 100):02d}",
+        time_per_call(
+            lambda: ui._render_playing(surface, game, False, False, grid_w, grid_h),
+            number=3 if quick else 10,
+            repeat=3 if quick else 5,
+        ),
+    )
+    yield _incremental_frame(size, fill, quick)
+
+
+def _incremental_frame(size: int, fill: float, quick: bool) -> Metric:
+    # One step plus one dirty-rectangle render per frame, the way the PLAYING loop
+    # runs; unlike render_playing this should not grow with the snake.
+    best = float("inf")
+    for _ in range(3 if quick else 5):
+        game, turns = game_on_cycle(size, size, snake_length(size, size, fill))
+        grid_w = size * ui.CELL_SIZE
+        grid_h = size * ui.CELL_SIZE
+        surface = pygame.Surface(
+            (grid_w + ui.PADDING * 2, grid_h + ui.PADDING * 2 + ui.INFO_HEIGHT)
+        )
+        renderer = ui._PlayingRenderer(grid_w, grid_h)
+        ui._render_playing(surface, game, False, False, grid_w, grid_h, False, renderer)
+        started = time.perf_counter()
+        for _ in range(FRAMES_PER_SAMPLE):
+            game.set_direction(turns[game.state.snake[0]])
+            game.step()
+            ui._render_playing(
+                surface, game, False, False, grid_w, grid_h, False, renderer
+            )
+        best = min(best, (time.perf_counter() - started) / FRAMES_PER_SAMPLE)
+    return Metric(
+        f"pygame.render_playing_tick/{size}x{size}/fill{int(fill * 100):02d}", best
+    )
+
+
+def _collect_loop(quick: bool) -> Iterator[Metric]:
+    # The real main loop on the dummy driver, driven by key presses posted from
+    # timer threads: menu, options, the autopilot playing, paused, then the
+    # snake steered straight into a wall and the game-over countdown. Reports
+    # frames rendered and presented per second and the share of a CPU used in
+    # each phase.
+    phase = QUICK_PHASE_SECONDS if quick else PHASE_SECONDS
+
+    def keys(*names: int) -> list[pygame.event.Event]:
+        return [pygame.event.Event(pygame.KEYDOWN, key=key) for key in names]
+
+    script = [
+        (phase, keys(pygame.K_DOWN, pygame.K_RETURN)),
+        (2 * phase, keys(pygame.K_ESCAPE, pygame.K_UP, pygame.K_RETURN, pygame.K_t)),
+        (3 * phase, keys(pygame.K_p)),
+        (4 * phase, keys(pygame.K_p, pygame.K_t)),
+        # Time enough to cross the board, die and sit out the countdown.
+        (5 * phase + 6.0, [pygame.event.Event(pygame.QUIT)]),
+    ]
+    timers = [threading.Timer(at, _post_all, (events,)) for at, events in script]
+    stats = ui._FrameStats()
+    with tempfile.TemporaryDirectory() as directory:
+        for timer in timers:
+            timer.start()
+        try:
+            ui._main(SettingsStore(Path(directory) / "settings.json"), stats)
+        finally:
+            for timer in timers:
+                timer.cancel()
+    for name in ("MENU", "OPTIONS", "PLAYING", "PAUSED", "GAME_OVER"):
+        seconds = max(stats.seconds[name], 1e-9)
+        yield Metric(
+            f"pygame.loop/{name.lower()}/frames",
+            stats.frames[name] / seconds,
+            "frames/s",
+        )
+        yield Metric(
+            f"pygame.loop/{name.lower()}/presents",
+            stats.presents[name] / seconds,
+            "frames/s",
+        )
+        yield Metric(
+            f"pygame.loop/{name.lower()}/cpu", stats.cpu[name] / seconds * 100, "%"
+        )
+
+
+def _post_all(events: list[pygame.event.Event]) -> None:
+    for event in events:
+        pygame.event.post(event)
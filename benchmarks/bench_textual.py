@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from benchmarks.harness import Metric, time_per_call
+from benchmarks.scenarios import FILLS, game_on_cycle, snake_length
+from snake_game import textual_ui as ui
+
+RENDER_SIZES = (20, 50, 100)
+QUICK_RENDER_SIZES = (20,)
+
+
+def collect(quick: bool) -> Iterator[Metric]:
+    repeat = 3 if quick else 5
+    for size in QUICK_RENDER_SIZES if quick else RENDER_SIZES:
+        for fill in FILLS:
+            game, _turns = game_on_cycle(size, size, snake_length(size, size, fill))
+            label = f"{size}x{size}/fill{int(fill * 100):02d}"
+            yield Metric(
+                f"textual.render_board/{label}",
+                time_per_call(
+                    lambda game=game: ui._render_board(game),
+                    number=3 if quick else 10,
+                    repeat=repeat,
+                ),
+            )
+    game, _turns = game_on_cycle(20, 20, 3)
+    yield Metric(
+        "textual.render_status",
+        time_per_call(
+            lambda: ui._render_status(game, paused=False, wrap_enabled=True),
+            number=200,
+            repeat=repeat,
+        ),
+    )
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import platform
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    value: float
+    unit: str = "s"
+    higher_is_better: bool = False
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    unit: str
+    # Relative change in the "worse" direction: +0.25 means 25% worse.
+    change: float
+    regressed: bool
+
+
+Collector = Callable[[bool], Iterable[Metric]]
+
+
+def time_per_call(fn: Callable[[], object], number: int, repeat: int = 5) -> float:
+    # Best of ``repeat`` samples, each averaging ``number`` calls.
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def save_baseline(metrics: Iterable[Metric], path: Path) -> None:
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "metrics": {metric.name: asdict(metric) for metric in metrics},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def load_baseline(path: Path) -> dict[str, Metric]:
+    payload = json.loads(path.read_text())
+    return {name: Metric(**data) for name, data in payload["metrics"].items()}
+
+
+def compare(
+    baseline: Mapping[str, Metric],
+    current: Iterable[Metric],
+    threshold: float,
+) -> list[Comparison]:
+    results = []
+    for metric in current:
+        before = baseline.get(metric.name)
+        if before is None or before.value <= 0 or metric.value <= 0:
+            continue
+        if metric.higher_is_better:
+            change = before.value / metric.value - 1
+        else:
+            change = metric.value / before.value - 1
+        results.append(
+            Comparison(
+                name=metric.name,
+                baseline=before.value,
+                current=metric.value,
+                unit=metric.unit,
+                change=change,
+                regressed=change > threshold,
+            )
+        )
+    return results
+
+
+def format_metric(metric: Metric) -> str:
+    return f"{metric.name:<48} {_format_value(metric.value, metric.unit)}"
+
+
+def format_comparison(result: Comparison) -> str:
+    flag = "REGRESSED" if result.regressed else "ok"
+    return (
+        f"{result.name:<48} {_format_value(result.baseline, result.unit)} -> "
+        f"{_format_value(result.current, result.unit)} "
+        f"({result.change:+.1%}) {flag}"
+    )
+
+
+def _format_value(value: float, unit: str) -> str:
+    if unit != "s":
+        return f"{value:>12.1f} {unit}"
+    for scale, suffix in ((1e-6, "ns"), (1e-3, "us"), (1.0, "ms")):
+        if value < scale:
+            return f"{value / scale * 1e3:>12.2f} {suffix}"
+    return f"{value:>12.3f} s"
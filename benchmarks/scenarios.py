@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from random import Random
+
+from snake_game.core import (
+    Direction,
+    Game,
+    GameState,
+    Position,
+    StandardMovementStrategy,
+    WraparoundMovementStrategy,
+    cell_positions,
+)
+from snake_game.hamiltonian import build_cycle
+
+GRID_SIZES = (20, 100, 500, 1000)
+QUICK_GRID_SIZES = (20, 100)
+FILLS = (0.0, 0.1, 0.5, 0.9)
+
+
+def cycle_positions(width: int, height: int) -> list[Position]:
+    # The cells of build_cycle()'s walls cycle in cycle order. It takes only unit
+    # steps, so it also keeps a snake alive on a wraparound board.
+    rank = build_cycle(width, height, wrap=False).rank
+    order = [0] * len(rank)
+    for cell, index in enumerate(rank):
+        order[index] = cell
+    positions = cell_positions(width, height)
+    return [positions[cell] for cell in order]
+
+
+def snake_length(width: int, height: int, fill: float) -> int:
+    return max(3, int(width * height * fill))
+
+
+def game_on_cycle(
+    width: int, height: int, length: int, wrap: bool = False, seed: int = 0
+) -> tuple[Game, dict[Position, Direction]]:
+    # The snake lies on a Hamiltonian cycle; steering with turns[state.head] keeps
+    # it alive indefinitely, so step costs can be measured at a fixed board fill.
+    strategy = WraparoundMovementStrategy() if wrap else StandardMovementStrategy()
+    cycle = cycle_positions(width, height)
+    turns = {
+        cell: (nxt[0] - cell[0], nxt[1] - cell[1])
+        for cell, nxt in zip(cycle, cycle[1:] + cycle[:1], strict=True)
+    }
+    head = cycle[length - 1]
+    free = cycle[length:]
+    state = GameState(
+        width=width,
+        height=height,
+        snake=tuple(reversed(cycle[:length])),
+        direction=turns[cycle[length - 2]],
+        food=free[len(free) // 2] if free else (-1, -1),
+    )
+    game = Game.from_state(state, Random(seed).getstate(), strategy)
+    game.set_direction(turns[head])
+    return game, turns
+
+
+def cycle_moves(
+    turns: dict[Position, Direction], head: Position, count: int
+) -> list[Direction]:
+    # The next ``count`` directions a snake steered by ``turns`` takes from head.
+    moves = []
+    x, y = head
+    for _ in range(count):
+        dx, dy = turns[x, y]
+        moves.append((dx, dy))
+        x, y = x + dx, y + dy
+    return moves
@@ -2,16 +2,25 @@ from snake_game.core import (
     EVENT_GAME_OVER,
     EVENT_RESET,
     EVENT_STEP,
+    EVENTS,
+    NO_FOOD,
+    WALL,
     Game,
     GameFactory,
     GameObserver,
     GameProtocol,
     GameState,
     MovementStrategy,
+    MultiStepResult,
+    NeighborTable,
+    ObserverStats,
+    SnakeBody,
     StandardMovementStrategy,
+    StepDelta,
     StepResult,
     WraparoundGameFactory,
     WraparoundMovementStrategy,
+    cell_positions,
 )
 from snake_game.settings import (
     SPEED_TICK_INTERVALS,
@@ -21,21 +30,30 @@ from snake_game.settings import (
 )
 
 __all__ = [
+    "EVENTS",
     "EVENT_GAME_OVER",
     "EVENT_RESET",
     "EVENT_STEP",
+    "NO_FOOD",
     "SPEED_TICK_INTERVALS",
+    "WALL",
     "Game",
     "GameFactory",
     "GameObserver",
     "GameProtocol",
     "GameState",
     "MovementStrategy",
+    "MultiStepResult",
+    "NeighborTable",
+    "ObserverStats",
     "Settings",
     "SettingsStore",
+    "SnakeBody",
     "SpeedPreset",
     "StandardMovementStrategy",
+    "StepDelta",
     "StepResult",
     "WraparoundGameFactory",
     "WraparoundMovementStrategy",
+    "cell_positions",
 ]
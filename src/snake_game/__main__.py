@@ -0,0 +1,4 @@
+from snake_game.headless import main
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
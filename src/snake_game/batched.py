@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from random import Random
+
+import numpy as np
+import numpy.typing as npt
+
+from snake_game.core import (
+    DOWN,
+    LEFT,
+    NO_FOOD,
+    OPPOSITE,
+    RIGHT,
+    UP,
+    WALL,
+    Direction,
+    GameState,
+    MovementStrategy,
+    StandardMovementStrategy,
+    cell_positions,
+)
+
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+# Direction codes used by BatchedGame.step(); KEEP leaves a game's heading as is.
+DIRECTIONS: tuple[Direction, ...] = (UP, DOWN, LEFT, RIGHT)
+KEEP = -1
+
+_OPPOSITE_CODES = np.array([DIRECTIONS.index(OPPOSITE[d]) for d in DIRECTIONS])
+_RIGHT_CODE = DIRECTIONS.index(RIGHT)
+
+
+@dataclass(frozen=True)
+class BatchStepResult:
+    grew: BoolArray
+    game_over: BoolArray
+    # Score and length each finished game ended with (zero for games still
+    # running); the games themselves have already been reset.
+    final_score: IntArray
+    final_length: IntArray
+
+
+# N independent games stepped together with NumPy. Each game follows the rules of
+# core.Game exactly (same neighbor tables, same Random draws for food, picked from
+# the free cells in row-major order), so game i reproduces
+# Game(seed=episode_seeds[i]) fed the same directions. Games that die are reset
+# within the same step() call; the next episode seed comes from a per-game stream
+# derived from the game's initial seed.
+class BatchedGame:
+    def __init__(
+        self,
+        seeds: Sequence[int],
+        width: int = 20,
+        height: int = 15,
+        strategy: MovementStrategy | None = None,
+    ) -> None:
+        if width < 5 or height < 5:
+            raise ValueError("Grid too small for Snake")
+        if not seeds:
+            raise ValueError("BatchedGame needs at least one seed")
+        strategy = strategy or StandardMovementStrategy()
+        neighbor_table = getattr(strategy, "neighbor_table", None)
+        if neighbor_table is None:
+            raise TypeError("BatchedGame needs a strategy with neighbor_table()")
+        table = neighbor_table(width, height)
+
+        count = len(seeds)
+        size = width * height
+        self._width = width
+        self._height = height
+        self._size = size
+        self._table = np.array([table[d] for d in DIRECTIONS], dtype=np.int64)
+        self._rows = np.arange(count)
+        self._ring = np.zeros((count, size), dtype=np.int64)
+        self._tail = np.zeros(count, dtype=np.int64)
+        self._length = np.zeros(count, dtype=np.int64)
+        self._head = np.zeros(count, dtype=np.int64)
+        self._direction = np.zeros(count, dtype=np.int64)
+        self._occupied = np.zeros((count, size), dtype=np.bool_)
+        self._free_count = np.zeros(count, dtype=np.int64)
+        self._food = np.zeros(count, dtype=np.int64)
+        self._score = np.zeros(count, dtype=np.int64)
+        self._episode_seeds = np.zeros(count, dtype=np.int64)
+        self._rngs = [Random() for _ in range(count)]
+        self._seed_streams = [Random(f"{seed}/episodes") for seed in seeds]
+        self._reset_rows(self._rows, list(seeds))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def heads(self) -> IntArray:
+        return self._head.copy()
+
+    @property
+    def food(self) -> IntArray:
+        return self._food.copy()
+
+    @property
+    def scores(self) -> IntArray:
+        return self._score.copy()
+
+    @property
+    def lengths(self) -> IntArray:
+        return self._length.copy()
+
+    @property
+    def directions(self) -> IntArray:
+        return self._direction.copy()
+
+    @property
+    def episode_seeds(self) -> IntArray:
+        return self._episode_seeds.copy()
+
+    def state(self, index: int) -> GameState:
+        positions = cell_positions(self._width, self._height)
+        length = int(self._length[index])
+        slots = (self._tail[index] + np.arange(length - 1, -1, -1)) % self._size
+        food = int(self._food[index])
+        return GameState(
+            width=self._width,
+            height=self._height,
+            snake=tuple(positions[cell] for cell in self._ring[index, slots].tolist()),
+            direction=DIRECTIONS[int(self._direction[index])],
+            food=positions[food] if food != WALL else NO_FOOD,
+            alive=True,
+            score=int(self._score[index]),
+        )
+
+    def step(self, directions: npt.ArrayLike | None = None) -> BatchStepResult:
+        if directions is not None:
+            wanted = np.asarray(directions, dtype=np.int64)
+            if wanted.shape != self._direction.shape:
+                raise ValueError(f"Expected {len(self)} direction codes")
+            turn = (wanted != KEEP) & (wanted != _OPPOSITE_CODES[self._direction])
+            self._direction = np.where(turn, wanted, self._direction)
+
+        rows = self._rows
+        target = self._table[self._direction, self._head]
+        wall = target == WALL
+        target[wall] = 0
+        tail = self._ring[rows, self._tail]
+        # The tail cell is vacated this tick, so moving into it is allowed.
+        hit = self._occupied[rows, target] & (target != tail)
+        game_over = wall | hit
+        alive = ~game_over
+        grew = alive & (target == self._food)
+        moved = alive & ~grew
+
+        moved_rows = rows[moved]
+        moved_tails = tail[moved]
+        self._occupied[moved_rows, moved_tails] = False
+        self._free_count[moved_rows] += 1
+        self._tail[moved_rows] = (self._tail[moved_rows] + 1) % self._size
+        self._length[grew] += 1
+
+        alive_rows = rows[alive]
+        heads = target[alive]
+        self._occupied[alive_rows, heads] = True
+        self._free_count[alive_rows] -= 1
+        slots = (self._tail[alive_rows] + self._length[alive_rows] - 1) % self._size
+        self._ring[alive_rows, slots] = heads
+        self._head[alive_rows] = heads
+
+        self._score[grew] += 1
+        for row in rows[grew].tolist():
+            self._food[row] = self._sample_food(row)
+
+        final_score = np.where(game_over, self._score, 0)
+        final_length = np.where(game_over, self._length, 0)
+        if game_over.any():
+            dead_rows = rows[game_over]
+            seeds = [self._seed_streams[row].getrandbits(63) for row in dead_rows]
+            self._reset_rows(dead_rows, seeds)
+        return BatchStepResult(grew, game_over, final_score, final_length)
+
+    def _reset_rows(self, rows: IntArray, seeds: list[int]) -> None:
+        mid = (self._height // 2) * self._width + self._width // 2
+        body = np.array([mid - 2, mid - 1, mid], dtype=np.int64)
+        self._ring[rows, : len(body)] = body
+        self._tail[rows] = 0
+        self._length[rows] = len(body)
+        self._head[rows] = mid
+        self._direction[rows] = _RIGHT_CODE
+        self._score[rows] = 0
+        self._occupied[rows] = False
+        self._occupied[rows[:, None], body] = True
+        self._free_count[rows] = self._size - len(body)
+        self._episode_seeds[rows] = seeds
+        for row, seed in zip(rows.tolist(), seeds, strict=True):
+            self._rngs[row] = Random(seed)
+            self._food[row] = self._sample_food(row)
+
+    def _sample_food(self, row: int) -> int:
+        count = int(self._free_count[row])
+        if count == 0:
+            return WALL
+        # Random.choice(seq) is seq[_randbelow(len(seq))], as is randrange(len);
+        # core.Game draws the same k and takes the k-th free cell in row-major order.
+        rank = self._rngs[row].randrange(count)
+        return int(np.flatnonzero(~self._occupied[row])[rank])
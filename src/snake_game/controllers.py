@@ -0,0 +1,439 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from random import Random
+from typing import Protocol
+
+from snake_game.core import (
+    DOWN,
+    LEFT,
+    OPPOSITE,
+    RIGHT,
+    UP,
+    WALL,
+    Cell,
+    Direction,
+    GameProtocol,
+    GameState,
+    NeighborTable,
+    Position,
+    StandardMovementStrategy,
+    StepResult,
+    WraparoundMovementStrategy,
+    cell_positions,
+)
+from snake_game.hamiltonian import CycleCache, HamiltonianCycle
+
+DIRECTIONS: tuple[Direction, ...] = (UP, DOWN, LEFT, RIGHT)
+
+SCRIPT_TOKENS: dict[str, Direction | None] = {
+    "U": UP,
+    "D": DOWN,
+    "L": LEFT,
+    "R": RIGHT,
+    ".": None,
+}
+
+# Distance field value of cells the food cannot be reached from.
+UNREACHABLE = 1 << 62
+
+# HamiltonianController cuts corners only while the snake covers less than this
+# share of the board.
+SHORTCUT_FILL = 0.5
+
+
+class Controller(Protocol):
+    def choose(self, game: GameProtocol) -> Direction | None: ...
+
+
+class RandomController(Controller):
+    def __init__(self, seed: int | None = None) -> None:
+        self._rng = Random(seed)
+
+    def choose(self, game: GameProtocol) -> Direction | None:
+        del game
+        return self._rng.choice(DIRECTIONS)
+
+
+class GreedyController(Controller):
+    def __init__(self, wrap: bool = False) -> None:
+        self._wrap = wrap
+
+    def choose(self, game: GameProtocol) -> Direction | None:
+        state = game.state
+        # The tail moves away this tick, so it does not block.
+        blocked = set(state.snake[:-1])
+        best: tuple[int, Direction] | None = None
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE[state.direction]:
+                continue
+            cell = self._move(state.head, direction, state.width, state.height)
+            if cell is None or cell in blocked:
+                continue
+            distance = self._distance(cell, state.food, state.width, state.height)
+            if best is None or distance < best[0]:
+                best = distance, direction
+        return best[1] if best is not None else None
+
+    def _move(
+        self, pos: Position, direction: Direction, width: int, height: int
+    ) -> Position | None:
+        x = pos[0] + direction[0]
+        y = pos[1] + direction[1]
+        if self._wrap:
+            return x % width, y % height
+        if 0 <= x < width and 0 <= y < height:
+            return x, y
+        return None
+
+    def _distance(self, a: Position, b: Position, width: int, height: int) -> int:
+        dx = abs(a[0] - b[0])
+        dy = abs(a[1] - b[1])
+        if self._wrap:
+            dx = min(dx, width - dx)
+            dy = min(dy, height - dy)
+        return dx + dy
+
+
+class AutopilotController(Controller):
+    # Follows a BFS distance field from the food over the cells the snake does not
+    # cover. The field is built once per food placement. Between placements each
+    # tick only blocks the new head and frees the old tail, so only the cells whose
+    # shortest path ran through the head, or now runs through the tail, change.
+    # Those patches need the step itself: pass each StepResult of the steered game
+    # to advance(). Any state that is not the result of such a step from the one
+    # the field was built for (a reset, a restore, a step not reported) rebuilds.
+    def __init__(self, wrap: bool = False) -> None:
+        self._wrap = wrap
+        self._grid: tuple[int, int] | None = None
+        self._table: NeighborTable = {}
+        self._adjacent: tuple[tuple[Cell, ...], ...] = ()
+        self._blocked = bytearray()
+        self._distance: list[int] = []
+        self._food = WALL
+        self._head = WALL
+        self._tail = WALL
+        self._length = 0
+        self._state: GameState | None = None
+        self._step: StepResult | None = None
+
+    def advance(self, result: StepResult) -> None:
+        self._step = result
+
+    def choose(self, game: GameProtocol) -> Direction | None:
+        state = game.state
+        if not state.alive:
+            return None
+        self._sync(state)
+        best: tuple[int, Direction] | None = None
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE[state.direction]:
+                continue
+            cell = self._table[direction][self._head]
+            # The tail moves away this tick, so it does not block.
+            if cell == WALL or (self._blocked[cell] and cell != self._tail):
+                continue
+            distance = self._distance[cell]
+            if best is None or distance < best[0]:
+                best = distance, direction
+        return best[1] if best is not None else None
+
+    def _sync(self, state: GameState) -> None:
+        step, self._step = self._step, None
+        if state is self._state:
+            return
+        self._state = state
+        width = state.width
+        head_x, head_y = state.snake[0]
+        tail_x, tail_y = state.snake[-1]
+        food_x, food_y = state.food
+        head = head_y * width + head_x
+        food = food_y * width + food_x if food_x >= 0 else WALL
+        delta = step.delta if step is not None and step.state is state else None
+        vacated = WALL
+        if delta is not None and delta.tail is not None:
+            vacated = delta.tail[1] * width + delta.tail[0]
+        if (
+            self._grid != (width, state.height)
+            or food != self._food
+            or len(state.snake) != self._length
+            or vacated != self._tail
+        ):
+            self._rebuild(state, food)
+        elif head != vacated:
+            self._block(head)
+            self._unblock(vacated)
+        self._head = head
+        self._tail = tail_y * width + tail_x
+
+    def _rebuild(self, state: GameState, food: Cell) -> None:
+        width = state.width
+        grid = (width, state.height)
+        if grid != self._grid:
+            self._grid = grid
+            self._table = _neighbor_table(width, state.height, self._wrap)
+            self._adjacent = _adjacency(width, state.height, self._wrap)
+        blocked = bytearray(width * state.height)
+        for x, y in state.snake:
+            blocked[y * width + x] = 1
+        distance = [UNREACHABLE] * len(blocked)
+        self._blocked = blocked
+        self._distance = distance
+        self._food = food
+        self._length = len(state.snake)
+        if food == WALL:
+            return
+        adjacent = self._adjacent
+        distance[food] = 0
+        frontier = [food]
+        steps = 0
+        while frontier:
+            steps += 1
+            reached = []
+            for cell in frontier:
+                for neighbor in adjacent[cell]:
+                    if distance[neighbor] == UNREACHABLE and not blocked[neighbor]:
+                        distance[neighbor] = steps
+                        reached.append(neighbor)
+            frontier = reached
+
+    def _block(self, cell: Cell) -> None:
+        # Drop every cell whose distance was only supported by a path through
+        # ``cell``, then settle those cells again from their remaining neighbors.
+        distance = self._distance
+        adjacent = self._adjacent
+        self._blocked[cell] = 1
+        if distance[cell] == UNREACHABLE:
+            return
+        lost = [(cell, distance[cell])]
+        distance[cell] = UNREACHABLE
+        for dropped, steps in lost:
+            for neighbor in adjacent[dropped]:
+                if distance[neighbor] != steps + 1:
+                    continue
+                if any(distance[other] == steps for other in adjacent[neighbor]):
+                    continue
+                distance[neighbor] = UNREACHABLE
+                lost.append((neighbor, steps + 1))
+        seeds = []
+        for dropped, _steps in lost[1:]:
+            nearest = min(distance[other] for other in adjacent[dropped])
+            if nearest != UNREACHABLE:
+                seeds.append((nearest + 1, dropped))
+        self._settle(seeds)
+
+    def _unblock(self, cell: Cell) -> None:
+        self._blocked[cell] = 0
+        nearest = min(self._distance[other] for other in self._adjacent[cell])
+        if nearest != UNREACHABLE:
+            self._settle([(nearest + 1, cell)])
+
+    def _settle(self, seeds: list[tuple[int, Cell]]) -> None:
+        # Multi-source BFS from cells with known upper-bound distances. Edges all
+        # cost one step, so merging the sorted seeds level by level visits cells
+        # in distance order without a heap.
+        distance = self._distance
+        adjacent = self._adjacent
+        blocked = self._blocked
+        seeds.sort()
+        index = 0
+        frontier: list[Cell] = []
+        steps = 0
+        while frontier or index < len(seeds):
+            if not frontier:
+                steps = seeds[index][0]
+            while index < len(seeds) and seeds[index][0] == steps:
+                cell = seeds[index][1]
+                index += 1
+                if steps < distance[cell]:
+                    distance[cell] = steps
+                    frontier.append(cell)
+            steps += 1
+            reached = []
+            for cell in frontier:
+                for neighbor in adjacent[cell]:
+                    if distance[neighbor] > steps and not blocked[neighbor]:
+                        distance[neighbor] = steps
+                        reached.append(neighbor)
+            frontier = reached
+
+
+class HamiltonianController(Controller):
+    # Follows a Hamiltonian cycle of the board, on which the snake can never trap
+    # itself. While the body lies in cycle order from tail to head, every cell
+    # strictly between the head and the tail going forward along the cycle is free,
+    # so a short snake can jump ahead to any of them, up to the food, and stay in
+    # order. A snake that is not in order (e.g. when the controller takes over a
+    # running game) follows the cycle where it can until it is.
+    def __init__(
+        self,
+        wrap: bool = False,
+        cache: CycleCache | None = None,
+        shortcut_fill: float = SHORTCUT_FILL,
+    ) -> None:
+        self._wrap = wrap
+        self._cache = cache or CycleCache()
+        self._shortcut_fill = shortcut_fill
+        self._cycle: HamiltonianCycle | None = None
+        self._table: NeighborTable = {}
+        self._ordered = False
+        # Where the last decision left the snake: its head, tail and length, the
+        # cell it chose to move to, and the tail that move leaves behind.
+        self._head = WALL
+        self._tail = WALL
+        self._length = 0
+        self._target = WALL
+        self._next_tail = WALL
+
+    def choose(self, game: GameProtocol) -> Direction | None:
+        state = game.state
+        if not state.alive:
+            return None
+        width = state.width
+        cycle = self._cycle
+        if cycle is None or (cycle.width, cycle.height) != (width, state.height):
+            cycle = self._cycle = self._cache.load(width, state.height, self._wrap)
+            self._table = _neighbor_table(width, state.height, self._wrap)
+            self._ordered = False
+        snake = state.snake
+        head_x, head_y = snake[0]
+        head = head_y * width + head_x
+        tail_x, tail_y = snake[-1]
+        tail = tail_y * width + tail_x
+        length = len(snake)
+        if not (self._ordered and self._continues(head, tail, length)):
+            # A reset, a restore or someone else moved the snake since.
+            self._ordered = _in_cycle_order(cycle, snake)
+        if self._ordered:
+            direction = self._shortcut(state, cycle, head)
+        else:
+            direction = self._rejoin(state, cycle, head)
+        target = self._table[direction][head] if direction else WALL
+        if length > 1:
+            next_x, next_y = snake[-2]
+            self._next_tail = next_y * width + next_x
+        else:
+            self._next_tail = target
+        self._head = head
+        self._tail = tail
+        self._length = length
+        self._target = target
+        return direction
+
+    def _continues(self, head: Cell, tail: Cell, length: int) -> bool:
+        # Whether the snake is still where the last decision left it, or took the
+        # chosen step from there, with or without eating.
+        if head == self._head:
+            return tail == self._tail and length == self._length
+        return head == self._target and (
+            (tail == self._next_tail and length == self._length)
+            or (tail == self._tail and length == self._length + 1)
+        )
+
+    def _shortcut(
+        self, state: GameState, cycle: HamiltonianCycle, head: Cell
+    ) -> Direction | None:
+        rank = cycle.rank
+        size = len(rank)
+        width = state.width
+        tail_x, tail_y = state.snake[-1]
+        food_x, food_y = state.food
+        base = rank[head]
+        # Steps along the cycle from the head to the tail and to the food.
+        gap = (rank[tail_y * width + tail_x] - base) % size or size
+        reach = (rank[food_y * width + food_x] - base) % size if food_x >= 0 else 1
+        if len(state.snake) >= size * self._shortcut_fill:
+            reach = 1
+        best: tuple[int, Direction] | None = None
+        for direction in DIRECTIONS:
+            cell = self._table[direction][head]
+            if cell == WALL:
+                continue
+            steps = (rank[cell] - base) % size
+            # The next cycle cell is free or the (departing) tail.
+            if steps != 1 and not (steps < gap and steps <= reach):
+                continue
+            if best is None or steps > best[0]:
+                best = steps, direction
+        return best[1] if best is not None else None
+
+    def _rejoin(
+        self, state: GameState, cycle: HamiltonianCycle, head: Cell
+    ) -> Direction | None:
+        rank = cycle.rank
+        positions = cell_positions(state.width, state.height)
+        # The tail moves away this tick, so it does not block.
+        blocked = set(state.snake[:-1])
+        best: tuple[int, Direction] | None = None
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE[state.direction]:
+                continue
+            cell = self._table[direction][head]
+            if cell == WALL or positions[cell] in blocked:
+                continue
+            steps = (rank[cell] - rank[head]) % len(rank)
+            if best is None or steps < best[0]:
+                best = steps, direction
+        return best[1] if best is not None else None
+
+
+class ScriptedController(Controller):
+    def __init__(self, moves: Sequence[Direction | None]) -> None:
+        self._moves = moves
+        self._tick = 0
+
+    @classmethod
+    def from_file(cls, path: Path) -> ScriptedController:
+        return cls(parse_script(path.read_text()))
+
+    def choose(self, game: GameProtocol) -> Direction | None:
+        del game
+        tick = self._tick
+        self._tick += 1
+        if tick < len(self._moves):
+            return self._moves[tick]
+        return None
+
+
+def _in_cycle_order(cycle: HamiltonianCycle, snake: Sequence[Position]) -> bool:
+    rank = cycle.rank
+    size = len(rank)
+    width = cycle.width
+    tail_x, tail_y = snake[-1]
+    base = rank[tail_y * width + tail_x]
+    previous = -1
+    for x, y in reversed(snake):
+        steps = (rank[y * width + x] - base) % size
+        if steps <= previous:
+            return False
+        previous = steps
+    return True
+
+
+def _neighbor_table(width: int, height: int, wrap: bool) -> NeighborTable:
+    strategy = WraparoundMovementStrategy() if wrap else StandardMovementStrategy()
+    return strategy.neighbor_table(width, height)
+
+
+@lru_cache(maxsize=8)
+def _adjacency(width: int, height: int, wrap: bool) -> tuple[tuple[Cell, ...], ...]:
+    rows = [_neighbor_table(width, height, wrap)[d] for d in DIRECTIONS]
+    return tuple(
+        tuple(row[cell] for row in rows if row[cell] != WALL)
+        for cell in range(width * height)
+    )
+
+
+def parse_script(text: str) -> list[Direction | None]:
+    # One token per tick: U, D, L, R, or "." to keep the current heading.
+    # Everything after "#" on a line is a comment.
+    moves: list[Direction | None] = []
+    for line in text.splitlines():
+        for token in line.split("#", 1)[0].split():
+            try:
+                moves.append(SCRIPT_TOKENS[token.upper()])
+            except KeyError:
+                raise ValueError(f"Unknown script token: {token!r}") from None
+    return moves
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass, replace
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
+from math import isqrt
 from random import Random
-from typing import Protocol
+from time import perf_counter
+from typing import Any, Protocol, overload
 
 Direction = tuple[int, int]
 Position = tuple[int, int]
@@ -15,19 +19,139 @@ RIGHT: Direction = (1, 0)
 
 OPPOSITE: dict[Direction, Direction] = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
 
+# Cells are flat indices ``y * width + x``. A neighbor table maps each direction
+# to a list giving the next cell for every cell, with WALL where the move would
+# leave the board.
+Cell = int
+NeighborTable = dict[Direction, list[Cell]]
+WALL: Cell = -1
 
-@dataclass(frozen=True)
+NO_FOOD: Position = (-1, -1)
+
+# What random.Random.getstate() returns.
+RandomState = tuple[Any, ...]
+
+_TRAIL_SLACK = 64
+_NO_SLOT = -1
+
+
+@dataclass(frozen=True, slots=True)
+class StepDelta:
+    # What one step changed, so consumers can update in O(1) instead of diffing
+    # states. ``head`` is None when the snake did not move; ``tail`` is the cell
+    # it vacated, None when it grew or did not move.
+    head: Position | None
+    tail: Position | None
+    old_food: Position
+    food: Position
+    score_changed: bool = False
+    alive_changed: bool = False
+
+
+@dataclass(frozen=True, slots=True)
 class StepResult:
     state: GameState
     grew: bool
     game_over: bool
+    delta: StepDelta | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class MultiStepResult:
+    # Aggregate of Game.step_many(): ``ticks`` counts the moves attempted,
+    # including a fatal one, and ``grew`` how many of them ate food.
+    state: GameState
+    ticks: int
+    grew: int
+    game_over: bool
+
+
+class SnakeBody(Sequence[Position]):
+    # Head-first, read-only view of the window trail[start:end] of a Game's body
+    # trail. Game only ever appends to the trail, so every state it publishes
+    # shares the same list and a snapshot costs O(1) instead of a copy of the body.
+    # A fork's body starts out in its parent's trail: a negative start reaches back
+    # into base[:base_end]. Compares and hashes like the equivalent tuple.
+    __slots__ = ("_base", "_base_end", "_end", "_positions", "_start", "_trail")
+
+    def __init__(
+        self,
+        trail: list[Cell],
+        start: int,
+        end: int,
+        positions: tuple[Position, ...],
+        base: Sequence[Cell] = (),
+        base_end: int = 0,
+    ) -> None:
+        self._trail = trail
+        self._start = start
+        self._end = end
+        self._positions = positions
+        self._base = base
+        self._base_end = base_end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> Position: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[Position, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> Position | tuple[Position, ...]:
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        length = self._end - self._start
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("snake index out of range")
+        index = self._end - 1 - index
+        if index < 0:
+            return self._positions[self._base[self._base_end + index]]
+        return self._positions[self._trail[index]]
+
+    def __iter__(self) -> Iterator[Position]:
+        return map(self._positions.__getitem__, reversed(self._cells()))
+
+    def __reversed__(self) -> Iterator[Position]:
+        return map(self._positions.__getitem__, self._cells())
+
+    def __contains__(self, item: object) -> bool:
+        return item in map(self._positions.__getitem__, self._cells())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SnakeBody):
+            if len(other) != len(self):
+                return False
+            if other._trail is self._trail and other._end == self._end:
+                return True
+            return tuple(self) == tuple(other)
+        if isinstance(other, tuple):
+            return tuple(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return repr(tuple(self))
+
+    def _cells(self) -> list[Cell]:
+        # Tail-first copy of the window as flat cells.
+        start = self._start
+        if start >= 0:
+            return self._trail[start : self._end]
+        base_end = self._base_end
+        return [*self._base[base_end + start : base_end], *self._trail[: self._end]]
+
+
+@dataclass(frozen=True, slots=True)
 class GameState:
     width: int
     height: int
-    snake: tuple[Position, ...]
+    snake: Sequence[Position]
     direction: Direction
     food: Position
     alive: bool = True
@@ -38,6 +162,41 @@ class GameState:
         return self.snake[0]
 
 
+@lru_cache(maxsize=8)
+def cell_positions(width: int, height: int) -> tuple[Position, ...]:
+    return tuple((x, y) for y in range(height) for x in range(width))
+
+
+@lru_cache(maxsize=8)
+def _standard_neighbors(width: int, height: int) -> NeighborTable:
+    size = width * height
+    left = list(range(-1, size - 1))
+    left[::width] = repeat(WALL, height)
+    right = list(range(1, size + 1))
+    right[width - 1 :: width] = repeat(WALL, height)
+    return {
+        UP: [*repeat(WALL, width), *range(size - width)],
+        DOWN: [*range(width, size), *repeat(WALL, width)],
+        LEFT: left,
+        RIGHT: right,
+    }
+
+
+@lru_cache(maxsize=8)
+def _wraparound_neighbors(width: int, height: int) -> NeighborTable:
+    size = width * height
+    left = list(range(-1, size - 1))
+    left[::width] = range(width - 1, size, width)
+    right = list(range(1, size + 1))
+    right[width - 1 :: width] = range(0, size, width)
+    return {
+        UP: [*range(size - width, size), *range(size - width)],
+        DOWN: [*range(width, size), *range(width)],
+        LEFT: left,
+        RIGHT: right,
+    }
+
+
 class MovementStrategy(Protocol):
     def next_head(self, state: GameState) -> Position: ...
 
@@ -46,6 +205,9 @@ class StandardMovementStrategy(MovementStrategy):
     def next_head(self, state: GameState) -> Position:
         return state.head[0] + state.direction[0], state.head[1] + state.direction[1]
 
+    def neighbor_table(self, width: int, height: int) -> NeighborTable:
+        return _standard_neighbors(width, height)
+
 
 class WraparoundMovementStrategy(MovementStrategy):
     def next_head(self, state: GameState) -> Position:
@@ -53,6 +215,142 @@ class WraparoundMovementStrategy(MovementStrategy):
         y = (state.head[1] + state.direction[1]) % state.height
         return x, y
 
+    def neighbor_table(self, width: int, height: int) -> NeighborTable:
+        return _wraparound_neighbors(width, height)
+
+
+class _FreeCells:
+    # The cells not covered by the snake: a free flag per cell plus a Fenwick tree
+    # over the flags in row-major order, so add/discard are O(log n). choice()
+    # draws k the way rng.choice() would over the row-major list of free cells
+    # and finds the k-th free cell in O(log n). The food a seed produces thus
+    # depends only on which cells are free, never on the order they were freed
+    # in, and a game rebuilt from its state places the same food as the original.
+    #
+    # copy() is O(1): both copies keep the arrays, which are then never mutated
+    # again, and log their add/discard calls (cell, or ~cell for discard) until one
+    # of them is read or the log outgrows the board. Only that copy pays for
+    # private arrays, so forks that never place food never copy them. A new index
+    # starts out the same way, with the arrays built from the initial body on first
+    # read, so loading a game whose food is already placed costs O(body).
+    __slots__ = ("_body", "_count", "_flags", "_pending", "_size", "_top", "_tree")
+
+    def __init__(self, size: int, occupied: Iterable[int]) -> None:
+        self._size = size
+        # Highest power of two not above size: the first step of a tree descent.
+        self._top = 1 << (size.bit_length() - 1) if size else 0
+        self._body: list[int] | None = list(occupied)
+        self._count = 0
+        self._flags = bytearray()
+        self._tree: list[int] = []
+        self._pending: list[int] | None = []
+
+    def __len__(self) -> int:
+        self._materialize()
+        return self._count
+
+    def __contains__(self, cell: int) -> bool:
+        self._materialize()
+        return self._flags[cell] == 1
+
+    def add(self, cell: int) -> None:
+        pending = self._pending
+        if pending is not None:
+            self._log(pending, cell)
+            return
+        if self._flags[cell]:
+            return
+        self._flags[cell] = 1
+        self._count += 1
+        tree = self._tree
+        size = self._size
+        index = cell + 1
+        while index <= size:
+            tree[index] += 1
+            index += index & -index
+
+    def discard(self, cell: int) -> None:
+        pending = self._pending
+        if pending is not None:
+            self._log(pending, ~cell)
+            return
+        if not self._flags[cell]:
+            return
+        self._flags[cell] = 0
+        self._count -= 1
+        tree = self._tree
+        size = self._size
+        index = cell + 1
+        while index <= size:
+            tree[index] -= 1
+            index += index & -index
+
+    def choice(self, rng: Random) -> int:
+        # randrange(n) consumes the generator exactly as choice() over n cells.
+        self._materialize()
+        rest = rng.randrange(self._count)
+        tree = self._tree
+        size = self._size
+        position = 0
+        step = self._top
+        while step:
+            index = position + step
+            if index <= size and tree[index] <= rest:
+                position = index
+                rest -= tree[index]
+            step >>= 1
+        return position
+
+    def copy(self) -> _FreeCells:
+        if self._pending is None:
+            self._pending = []
+        clone = object.__new__(_FreeCells)
+        clone._size = self._size
+        clone._top = self._top
+        clone._body = self._body
+        clone._count = self._count
+        clone._flags = self._flags
+        clone._tree = self._tree
+        clone._pending = self._pending[:]
+        return clone
+
+    def _log(self, pending: list[int], entry: int) -> None:
+        pending.append(entry)
+        if len(pending) > self._size:
+            self._materialize()
+
+    def _materialize(self) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        body = self._body
+        if body is None:
+            self._flags = self._flags[:]
+            self._tree = self._tree[:]
+        else:
+            # An empty board's tree holds at each index the length of the range it
+            # covers, its lowest set bit; then the body is taken out.
+            self._body = None
+            size = self._size
+            self._flags = bytearray(b"\x01") * size
+            self._tree = [index & -index for index in range(size + 1)]
+            self._count = size
+            for cell in body:
+                self.discard(cell)
+        for entry in pending:
+            if entry >= 0:
+                self.add(entry)
+            else:
+                self.discard(~entry)
+
+
+def _random_from_state(state: RandomState) -> Random:
+    # Random() seeds itself from os.urandom, which setstate() overwrites anyway.
+    rng = Random.__new__(Random)
+    rng.setstate(state)
+    return rng
+
 
 class GameObserver(Protocol):
     def on_state_change(self, state: GameState, event: str) -> None: ...
@@ -61,6 +359,62 @@ class GameObserver(Protocol):
 EVENT_STEP = "step"
 EVENT_RESET = "reset"
 EVENT_GAME_OVER = "game_over"
+EVENTS = (EVENT_STEP, EVENT_RESET, EVENT_GAME_OVER)
+
+
+@dataclass(frozen=True)
+class ObserverStats:
+    observer: GameObserver
+    calls: int
+    seconds: float
+    # EVENT_STEP notifications folded into a later delivery.
+    coalesced: int
+
+
+class _Subscription:
+    # One add_observer() call: which events to deliver, how to coalesce steps, and
+    # how much time the observer has spent in on_state_change.
+    __slots__ = (
+        "calls",
+        "coalesced",
+        "every",
+        "interval",
+        "last_delivery",
+        "observer",
+        "pending",
+        "seconds",
+    )
+
+    def __init__(
+        self, observer: GameObserver, every: int, interval: float | None
+    ) -> None:
+        self.observer = observer
+        self.every = every
+        self.interval = interval
+        self.pending = 0
+        self.last_delivery = float("-inf")
+        self.calls = 0
+        self.seconds = 0.0
+        self.coalesced = 0
+
+    def step_due(self) -> bool:
+        self.pending += 1
+        if self.pending < self.every or (
+            self.interval is not None
+            and perf_counter() - self.last_delivery < self.interval
+        ):
+            self.coalesced += 1
+            return False
+        return True
+
+    def deliver(self, state: GameState, event: str) -> None:
+        started = perf_counter()
+        self.observer.on_state_change(state, event)
+        finished = perf_counter()
+        self.pending = 0
+        self.last_delivery = finished
+        self.calls += 1
+        self.seconds += finished - started
 
 
 class GameProtocol(Protocol):
@@ -84,110 +438,404 @@ class Game(GameProtocol):
         seed: int | None = None,
         strategy: MovementStrategy | None = None,
     ) -> None:
-        if width < 5 or height < 5:
-            raise ValueError("Grid too small for Snake")
-        self._strategy = strategy or StandardMovementStrategy()
-        self._observers: list[GameObserver] = []
-        self._rng = Random(seed)
+        self._setup(width, height, strategy, Random(seed))
         self._init_state(width, height)
 
-    _state: GameState
+    @classmethod
+    def from_state(
+        cls,
+        state: GameState,
+        rng_state: RandomState | None = None,
+        strategy: MovementStrategy | None = None,
+    ) -> Game:
+        # Build a game directly in ``state``. Unlike Game() followed by restore(),
+        # this never sets up (and places food on) a starting board first.
+        game = cls.__new__(cls)
+        rng = Random() if rng_state is None else _random_from_state(rng_state)
+        game._setup(state.width, state.height, strategy, rng)
+        game._state = state
+        return game
+
+    @property
+    def strategy(self) -> MovementStrategy:
+        return self._strategy
 
     @property
     def state(self) -> GameState:
         return self._state
 
+    @property
+    def _state(self) -> GameState:
+        state = self._cached_state
+        if state is None:
+            trail = self._trail
+            state = GameState(
+                self._width,
+                self._height,
+                SnakeBody(
+                    trail,
+                    self._start,
+                    len(trail),
+                    self._positions,
+                    self._base,
+                    self._base_end,
+                ),
+                self._direction,
+                self._food_position(),
+                self._alive,
+                self._score,
+            )
+            self._cached_state = state
+        return state
+
+    @_state.setter
+    def _state(self, state: GameState) -> None:
+        # Assigning a whole state (e.g. from tests or restore code) rebuilds the
+        # body and cell indexes; step() keeps them in sync incrementally.
+        width = state.width
+        self._set_grid(state.width, state.height)
+        snake = state.snake
+        if isinstance(snake, SnakeBody) and snake._positions is self._positions:
+            self._load_body(snake._cells())
+        else:
+            self._load_body([y * width + x for x, y in reversed(snake)])
+        food_x, food_y = state.food
+        self._food = food_y * width + food_x if food_x >= 0 else WALL
+        self._alive = state.alive
+        self._score = state.score
+        self._set_moves(state.direction)
+        self._cached_state = state
+
+    def restore(self, state: GameState, rng_state: RandomState | None = None) -> None:
+        # Load a whole state without notifying, optionally with an RNG state from
+        # rng_state(). Food depends only on the free cells and the RNG, so the
+        # game then continues exactly as the one the state came from.
+        self._state = state
+        if rng_state is not None:
+            self._rng = _random_from_state(rng_state)
+            self._rng_shared = False
+
+    def rng_state(self) -> RandomState:
+        return self._rng.getstate()
+
     def set_direction(self, direction: Direction) -> None:
-        if not self._state.alive:
+        if not self._alive:
             return
-        if direction == OPPOSITE[self._state.direction]:
+        if direction == OPPOSITE[self._direction]:
             return
-        self._state = replace(self._state, direction=direction)
+        self._set_moves(direction)
+        self._cached_state = None
 
-    def add_observer(self, observer: GameObserver) -> None:
-        if observer in self._observers:
+    def add_observer(
+        self,
+        observer: GameObserver,
+        events: Iterable[str] | None = None,
+        *,
+        every: int = 1,
+        interval: float | None = None,
+    ) -> None:
+        # ``events`` limits delivery to those event types (default: all). With
+        # ``every`` and/or ``interval`` set, EVENT_STEP is coalesced: at most one
+        # per ``every`` ticks and ``interval`` seconds, carrying the latest state.
+        if any(sub.observer is observer for sub in self._subscriptions):
             return
-        self._observers.append(observer)
-
-    def step(self) -> StepResult:
-        if not self._state.alive:
-            return StepResult(self._state, grew=False, game_over=True)
+        wanted = EVENTS if events is None else tuple(events)
+        unknown = set(wanted) - set(EVENTS)
+        if unknown:
+            raise ValueError(f"Unknown event(s): {', '.join(sorted(unknown))}")
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive")
+        subscription = _Subscription(observer, every, interval)
+        self._subscriptions.append(subscription)
+        for event in set(wanted):
+            self._dispatch[event] = [*self._dispatch.get(event, ()), subscription]
+
+    def observer_stats(self) -> list[ObserverStats]:
+        return [
+            ObserverStats(sub.observer, sub.calls, sub.seconds, sub.coalesced)
+            for sub in self._subscriptions
+        ]
 
-        next_head = self._strategy.next_head(self._state)
-        if self._hits_wall(next_head):
-            return self._end_game()
+    def fork(self, seed: int | None = None) -> Game:
+        # Independent copy for lookahead search, without copying the body or the
+        # board. The fork appends to a trail of its own that starts at the head and
+        # reads the rest of the body from this game's trail, which only ever grows
+        # at the head end. Both games then freeze the occupancy map and record
+        # their changes in overlays (see _advance_forked()); forking a game with an
+        # overlay copies it, at most isqrt(width * height) cells. The free-cell
+        # index and RNG are shared until either game places food. The fork has no
+        # observers and continues this game's RNG stream unless seeded.
+        if self._start < 0 and len(self._trail) > 1:
+            # A moved fork whose body still starts in its parent's trail: a fork
+            # of it could not read both, so take the body over in O(body).
+            self._flatten_trail()
+        trail = self._trail
+        overlay = self._overlay
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child._subscriptions = []
+        child._dispatch = {}
+        child._free = self._free.copy()
+        if self._start >= 0:
+            child._base = trail
+            child._base_end = len(trail) - 1
+            child._start = self._start - child._base_end
+        child._trail = [trail[-1]]
+        child._overlay = {} if overlay is None else overlay.copy()
+        if overlay is None:
+            self._overlay = {}
+        if seed is None:
+            self._rng_shared = child._rng_shared = True
+        else:
+            child._rng = Random(seed)
+            child._rng_shared = False
+        return child
 
-        snake_body = self._state.snake[:-1]
-        if next_head in snake_body:
+    def step(self) -> StepResult:
+        if not self._alive:
+            food = self._food_position()
+            delta = StepDelta(None, None, food, food)
+            return StepResult(self._state, grew=False, game_over=True, delta=delta)
+
+        food = self._food
+        tail = self._advance()
+        if tail is None:
             return self._end_game()
-
-        grew = next_head == self._state.food
-        if grew:
-            new_snake = (next_head, *self._state.snake)
-            food = self._place_food(new_snake)
-            score = self._state.score + 1
+        positions = self._positions
+        head = positions[self._trail[-1]]
+        if tail == WALL:
+            delta = StepDelta(
+                head, None, positions[food], self._food_position(), score_changed=True
+            )
         else:
-            new_snake = (next_head, *self._state.snake[:-1])
-            food = self._state.food
-            score = self._state.score
+            food_at = self._food_position()
+            delta = StepDelta(head, positions[tail], food_at, food_at)
 
-        new_state = replace(self._state, snake=new_snake, food=food, score=score)
-        self._state = new_state
         self._notify(EVENT_STEP)
-        return StepResult(new_state, grew=grew, game_over=False)
-
-    def reset(self) -> None:
-        width = self._state.width
-        height = self._state.height
-        self._rng = Random(None)
+        return StepResult(self._state, grew=tail == WALL, game_over=False, delta=delta)
+
+    def step_many(self, moves: int | Iterable[Direction | None]) -> MultiStepResult:
+        # Fast-forward: ``moves`` is a tick count, or one direction per tick (None
+        # keeps the heading). Runs without building intermediate states, stops at
+        # the first death, and notifies once at the end: EVENT_GAME_OVER if the
+        # snake died, else EVENT_STEP if it moved at all.
+        ticks = 0
+        grew = 0
+        if self._alive:
+            directions = repeat(None, moves) if isinstance(moves, int) else moves
+            advance = self._advance
+            for direction in directions:
+                if direction is not None:
+                    self.set_direction(direction)
+                ticks += 1
+                tail = advance()
+                if tail is None:
+                    break
+                if tail == WALL:
+                    grew += 1
+        if ticks:
+            self._cached_state = None
+            self._notify(EVENT_STEP if self._alive else EVENT_GAME_OVER)
+        return MultiStepResult(self._state, ticks, grew, game_over=not self._alive)
+
+    def reset(self, seed: int | None = None) -> None:
+        width = self._width
+        height = self._height
+        self._rng = Random(seed)
+        self._rng_shared = False
         self._init_state(width, height)
         self._notify(EVENT_RESET)
 
     def _hits_wall(self, pos: Position) -> bool:
         return (
-            pos[0] < 0
-            or pos[0] >= self._state.width
-            or pos[1] < 0
-            or pos[1] >= self._state.height
+            pos[0] < 0 or pos[0] >= self._width or pos[1] < 0 or pos[1] >= self._height
         )
 
-    def _place_food(self, snake: Iterable[Position]) -> Position:
-        occupied = set(snake)
-        free = [
-            (x, y)
-            for y in range(self._state.height)
-            for x in range(self._state.width)
-            if (x, y) not in occupied
-        ]
-        if not free:
-            return -1, -1
-        return self._rng.choice(free)
+    def _place_food(self) -> Cell:
+        if not self._free:
+            return WALL
+        if self._rng_shared:
+            # Every holder of a forked RNG clones it before drawing from it.
+            self._rng = _random_from_state(self._rng.getstate())
+            self._rng_shared = False
+        return self._free.choice(self._rng)
+
+    def _compact_trail(self) -> None:
+        # The trail only ever grows at the head end, so published SnakeBody views
+        # of it stay valid. Once the dead prefix outgrows the live body start a
+        # fresh list; the copy is amortised over at least len(body) ticks.
+        dead = self._start
+        if dead >= _TRAIL_SLACK and dead >= len(self._trail) - dead:
+            self._trail = self._trail[dead:]
+            self._start = 0
+
+    def _flatten_trail(self) -> None:
+        start = self._start
+        base_end = self._base_end
+        self._trail = [*self._base[base_end + start : base_end], *self._trail]
+        self._start = 0
+        self._base = ()
+
+    def _fold_overlay(self, overlay: dict[Cell, int]) -> None:
+        # Back to a private occupancy map, amortised over the isqrt(board) cells
+        # the overlay had to record first.
+        occupied = bytearray(self._occupied)
+        for cell, flag in overlay.items():
+            occupied[cell] = flag
+        self._occupied = occupied
+        self._overlay = None
+
+    def _advance(self) -> Cell | None:
+        # One tick of game rules, without notifying observers. Returns the vacated
+        # tail cell, WALL if the snake grew instead, or None if it died.
+        trail = self._trail
+        moves = self._moves
+        if moves is not None:
+            head = moves[trail[-1]]
+            if head == WALL:
+                self._alive = False
+                return None
+        else:
+            next_head = self._strategy.next_head(self._state)
+            if self._hits_wall(next_head):
+                self._alive = False
+                return None
+            head = next_head[1] * self._width + next_head[0]
+        overlay = self._overlay
+        if overlay is not None:
+            return self._advance_forked(head, overlay)
+
+        # The tail cell is vacated this tick, so moving into it is allowed.
+        tail = trail[self._start]
+        occupied = self._occupied
+        if occupied[head] and head != tail:
+            self._alive = False
+            return None
+
+        trail.append(head)
+        self._cached_state = None
+        if head == self._food:
+            occupied[head] = 1
+            self._free.discard(head)
+            self._food = self._place_food()
+            self._score += 1
+            return WALL
+        occupied[tail] = 0
+        self._free.add(tail)
+        occupied[head] = 1
+        self._free.discard(head)
+        self._start += 1
+        self._compact_trail()
+        return tail
+
+    def _advance_forked(self, head: Cell, overlay: dict[Cell, int]) -> Cell | None:
+        # The rest of _advance() after a fork(). The occupancy map is frozen, as
+        # other games read it: this game's changes go to its overlay, which is
+        # folded back once its body has left the shared trail and the overlay
+        # outgrows isqrt(width * height) cells.
+        trail = self._trail
+        start = self._start
+        tail = trail[start] if start >= 0 else self._base[self._base_end + start]
+        if head != tail and overlay.get(head, self._occupied[head]):
+            self._alive = False
+            return None
+
+        trail.append(head)
+        self._cached_state = None
+        if head == self._food:
+            overlay[head] = 1
+            self._free.discard(head)
+            self._food = self._place_food()
+            self._score += 1
+            return WALL
+        overlay[tail] = 0
+        self._free.add(tail)
+        overlay[head] = 1
+        self._free.discard(head)
+        start += 1
+        self._start = start
+        if start == 0:
+            self._base = ()
+        if start >= 0:
+            if len(overlay) > self._fold_at:
+                self._fold_overlay(overlay)
+            self._compact_trail()
+        return tail
+
+    def _food_position(self) -> Position:
+        return self._positions[self._food] if self._food != WALL else NO_FOOD
 
     def _end_game(self) -> StepResult:
-        new_state = replace(self._state, alive=False)
-        self._state = new_state
+        self._alive = False
+        self._cached_state = None
         self._notify(EVENT_GAME_OVER)
-        return StepResult(new_state, grew=False, game_over=True)
+        food = self._food_position()
+        delta = StepDelta(None, None, food, food, alive_changed=True)
+        return StepResult(self._state, grew=False, game_over=True, delta=delta)
 
     def _notify(self, event: str) -> None:
-        for observer in list(self._observers):
-            observer.on_state_change(self._state, event)
+        subscriptions = self._dispatch.get(event)
+        if not subscriptions:
+            return
+        coalesce = event == EVENT_STEP
+        for subscription in subscriptions:
+            if coalesce and not subscription.step_due():
+                continue
+            subscription.deliver(self._state, event)
+
+    def _setup(
+        self,
+        width: int,
+        height: int,
+        strategy: MovementStrategy | None,
+        rng: Random,
+    ) -> None:
+        if width < 5 or height < 5:
+            raise ValueError("Grid too small for Snake")
+        self._strategy = strategy or StandardMovementStrategy()
+        self._subscriptions: list[_Subscription] = []
+        # Event -> subscriptions that want it. Lists are replaced rather than
+        # mutated, so _notify can iterate them while observers subscribe.
+        self._dispatch: dict[str, list[_Subscription]] = {}
+        self._rng = rng
+        self._rng_shared = False
+
+    def _set_grid(self, width: int, height: int) -> None:
+        self._width = width
+        self._height = height
+        self._positions = cell_positions(width, height)
+        self._fold_at = isqrt(width * height)
+        table = getattr(self._strategy, "neighbor_table", None)
+        self._table: NeighborTable | None = table(width, height) if table else None
+
+    def _set_moves(self, direction: Direction) -> None:
+        self._direction = direction
+        self._moves = self._table[direction] if self._table is not None else None
+
+    def _load_body(self, trail: list[Cell]) -> None:
+        self._trail = trail
+        self._start = 0
+        self._occupied = bytearray(self._width * self._height)
+        for cell in trail:
+            self._occupied[cell] = 1
+        self._free = _FreeCells(self._width * self._height, trail)
+        # After a fork(): the parent trail a negative _start reaches back into,
+        # and the occupancy changes made since (None while the map is private).
+        self._base: Sequence[Cell] = ()
+        self._base_end = 0
+        self._overlay: dict[Cell, int] | None = None
 
     def _init_state(self, width: int, height: int) -> None:
-        mid_x = width // 2
-        mid_y = height // 2
-        snake = ((mid_x, mid_y), (mid_x - 1, mid_y), (mid_x - 2, mid_y))
-        self._state = GameState(
-            width=width,
-            height=height,
-            snake=snake,
-            direction=RIGHT,
-            food=(0, 0),
-            alive=True,
-            score=0,
-        )
-        food = self._place_food(self._state.snake)
-        self._state = replace(self._state, food=food)
+        mid = (height // 2) * width + width // 2
+        self._set_grid(width, height)
+        self._load_body([mid - 2, mid - 1, mid])
+        self._alive = True
+        self._score = 0
+        self._set_moves(RIGHT)
+        self._food = self._place_food()
+        self._cached_state = None
 
 
 class GameFactory:
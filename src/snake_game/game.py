@@ -5,19 +5,28 @@ from snake_game.core import (
     EVENT_GAME_OVER,
     EVENT_RESET,
     EVENT_STEP,
+    EVENTS,
     LEFT,
+    NO_FOOD,
     RIGHT,
     UP,
+    WALL,
     Game,
     GameFactory,
     GameObserver,
     GameProtocol,
     GameState,
     MovementStrategy,
+    MultiStepResult,
+    NeighborTable,
+    ObserverStats,
+    SnakeBody,
     StandardMovementStrategy,
+    StepDelta,
     StepResult,
     WraparoundGameFactory,
     WraparoundMovementStrategy,
+    cell_positions,
 )
 from snake_game.settings import (
     SPEED_TICK_INTERVALS,
@@ -28,24 +37,33 @@ from snake_game.settings import (
 
 __all__ = [
     "DOWN",
+    "EVENTS",
     "EVENT_GAME_OVER",
     "EVENT_RESET",
     "EVENT_STEP",
     "LEFT",
+    "NO_FOOD",
     "RIGHT",
     "SPEED_TICK_INTERVALS",
     "UP",
+    "WALL",
     "Game",
     "GameFactory",
     "GameObserver",
     "GameProtocol",
     "GameState",
     "MovementStrategy",
+    "MultiStepResult",
+    "NeighborTable",
+    "ObserverStats",
     "Settings",
     "SettingsStore",
+    "SnakeBody",
     "SpeedPreset",
     "StandardMovementStrategy",
+    "StepDelta",
     "StepResult",
     "WraparoundGameFactory",
     "WraparoundMovementStrategy",
+    "cell_positions",
 ]
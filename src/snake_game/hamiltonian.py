@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate, pairwise
+from pathlib import Path
+
+from snake_game.core import Cell
+
+# Cache file layout: HEADER (MAGIC, VERSION, wrap byte, width, height, crc32 of
+# the uncompressed differences), then the zlib-compressed rank array as int32
+# differences between consecutive cells. A serpentine cycle's ranks mostly step
+# by +-1 cell to cell, so a 1000x1000 cycle stores in about 14 kB and decodes with
+# one C-level accumulate(). The crc stands in for checking that the ranks are a
+# permutation, which would cost as much as building the cycle again.
+MAGIC = b"SNKC"
+VERSION = 2
+HEADER = struct.Struct("<4sBBIII")
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "snake-game" / "cycles"
+_SWAP = sys.byteorder != "little"
+
+
+@dataclass(frozen=True)
+class HamiltonianCycle:
+    width: int
+    height: int
+    wrap: bool
+    # Position of every cell along the cycle; consecutive ranks are neighbors and
+    # the last rank is a neighbor of rank 0.
+    rank: list[int]
+
+    def __len__(self) -> int:
+        return len(self.rank)
+
+
+def build_cycle(width: int, height: int, wrap: bool) -> HamiltonianCycle:
+    if height % 2 == 0:
+        order = _serpentine(width, height)
+    elif width % 2 == 0:
+        # Columns instead of rows: transpose a cycle of the mirrored board.
+        order = [
+            (cell % height) * width + cell // height
+            for cell in _serpentine(height, width)
+        ]
+    elif wrap:
+        order = _serpentine(width, height - 1)
+        # Splice in the last row: row height - 2 runs right to left, so replace its
+        # first step (width - 1 -> width - 2) with a detour down into the last row,
+        # once around it through the wrapped edge, and back up.
+        last = (height - 1) * width
+        start = order.index((height - 2) * width + width - 1) + 1
+        detour = [last + width - 1, *range(last, last + width - 1)]
+        order[start:start] = detour
+    else:
+        raise ValueError("No Hamiltonian cycle on an odd-sized board with walls")
+    rank = [0] * len(order)
+    for index, cell in enumerate(order):
+        rank[cell] = index
+    return HamiltonianCycle(width, height, wrap, rank)
+
+
+class CycleCache:
+    # Cycles by (width, height, wrap), kept in memory and in one file per board
+    # under ``directory``; unreadable files are rebuilt and overwritten. Without a
+    # writable directory, cycles are kept in memory only.
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory or DEFAULT_CACHE_DIR
+        self._cycles: dict[tuple[int, int, bool], HamiltonianCycle] = {}
+
+    def path(self, width: int, height: int, wrap: bool) -> Path:
+        mode = "wrap" if wrap else "walls"
+        return self._directory / f"{width}x{height}-{mode}.cycle"
+
+    def load(self, width: int, height: int, wrap: bool) -> HamiltonianCycle:
+        key = (width, height, wrap)
+        cycle = self._cycles.get(key)
+        if cycle is None:
+            path = self.path(width, height, wrap)
+            try:
+                cycle = decode_cycle(path.read_bytes())
+                if (cycle.width, cycle.height, cycle.wrap) != key:
+                    raise ValueError("Cycle file is for another board")
+            except (OSError, ValueError):
+                cycle = build_cycle(width, height, wrap)
+                self._save(path, cycle)
+            self._cycles[key] = cycle
+        return cycle
+
+    def _save(self, path: Path, cycle: HamiltonianCycle) -> None:
+        # Write and rename so concurrent readers never see a partial file.
+        partial = path.with_name(f".{path.name}.{os.getpid()}")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial.write_bytes(encode_cycle(cycle))
+            partial.replace(path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                partial.unlink(missing_ok=True)
+
+
+def encode_cycle(cycle: HamiltonianCycle) -> bytes:
+    rank = cycle.rank
+    deltas = array("i", rank[:1])
+    deltas.extend(b - a for a, b in pairwise(rank))
+    if _SWAP:
+        deltas.byteswap()
+    payload = deltas.tobytes()
+    header = HEADER.pack(
+        MAGIC, VERSION, cycle.wrap, cycle.width, cycle.height, zlib.crc32(payload)
+    )
+    return header + zlib.compress(payload)
+
+
+def decode_cycle(data: bytes) -> HamiltonianCycle:
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated cycle file")
+    magic, version, wrap, width, height, crc = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a snake cycle file")
+    try:
+        payload = zlib.decompress(data[HEADER.size :])
+    except zlib.error:
+        raise ValueError("Corrupt cycle file") from None
+    if zlib.crc32(payload) != crc:
+        raise ValueError("Corrupt cycle file")
+    deltas = array("i")
+    deltas.frombytes(payload)
+    if _SWAP:
+        deltas.byteswap()
+    rank = list(accumulate(deltas))
+    if len(rank) != width * height:
+        raise ValueError("Truncated cycle file")
+    return HamiltonianCycle(width, height, bool(wrap), rank)
+
+
+def _serpentine(width: int, height: int) -> list[Cell]:
+    # Even height: snake through columns 1.. row by row, then run back up column 0.
+    order: list[Cell] = []
+    for y in range(height):
+        row = y * width
+        if y % 2 == 0:
+            order.extend(range(row + 1, row + width))
+        else:
+            order.extend(range(row + width - 1, row, -1))
+    order.extend(range((height - 1) * width, -1, -width))
+    return order
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from snake_game.controllers import (
+    AutopilotController,
+    Controller,
+    GreedyController,
+    HamiltonianController,
+    RandomController,
+    ScriptedController,
+    parse_script,
+)
+from snake_game.core import Game, StandardMovementStrategy, WraparoundMovementStrategy
+from snake_game.hamiltonian import CycleCache
+
+ControllerFactory = Callable[[int], Controller]
+
+POLICIES = ("random", "greedy", "autopilot", "hamiltonian", "script")
+
+
+@dataclass(frozen=True)
+class Distribution:
+    min: int
+    max: int
+    mean: float
+    median: float
+    p90: float
+    counts: dict[str, int]
+
+    @classmethod
+    def of(cls, values: Sequence[int]) -> Distribution:
+        ordered = sorted(values)
+        p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+        counts = Counter(ordered)
+        return cls(
+            min=ordered[0],
+            max=ordered[-1],
+            mean=statistics.fmean(ordered),
+            median=statistics.median(ordered),
+            p90=p90,
+            counts={str(value): counts[value] for value in sorted(counts)},
+        )
+
+
+@dataclass(frozen=True)
+class GameOutcome:
+    seed: int
+    score: int
+    length: int
+    ticks: int
+    died: bool
+
+
+@dataclass(frozen=True)
+class SimulationReport:
+    policy: str
+    width: int
+    height: int
+    wrap: bool
+    games: int
+    ticks: int
+    seconds: float
+    ticks_per_sec: float
+    games_per_sec: float
+    scores: Distribution
+    lengths: Distribution
+    deaths: int
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+def play_game(
+    controller: Controller,
+    width: int,
+    height: int,
+    seed: int,
+    wrap: bool,
+    max_ticks: int,
+) -> GameOutcome:
+    strategy = WraparoundMovementStrategy() if wrap else StandardMovementStrategy()
+    game = Game(width=width, height=height, seed=seed, strategy=strategy)
+    # Controllers that patch state between ticks (AutopilotController) are told
+    # about each step.
+    advance = getattr(controller, "advance", None)
+    ticks = 0
+    died = False
+    while ticks < max_ticks:
+        direction = controller.choose(game)
+        if direction is not None:
+            game.set_direction(direction)
+        ticks += 1
+        result = game.step()
+        if advance is not None:
+            advance(result)
+        if result.game_over:
+            died = True
+            break
+    state = game.state
+    return GameOutcome(seed, state.score, len(state.snake), ticks, died)
+
+
+def simulate(
+    factory: ControllerFactory,
+    games: int,
+    width: int = 20,
+    height: int = 15,
+    wrap: bool = False,
+    seed: int = 0,
+    max_ticks: int | None = None,
+    policy: str = "custom",
+) -> SimulationReport:
+    if games < 1:
+        raise ValueError("Need at least one game")
+    limit = tick_limit(width, height, max_ticks)
+    started = time.perf_counter()
+    outcomes = [
+        play_game(factory(seed + index), width, height, seed + index, wrap, limit)
+        for index in range(games)
+    ]
+    seconds = time.perf_counter() - started
+    return build_report(outcomes, policy, width, height, wrap, seconds)
+
+
+def tick_limit(width: int, height: int, max_ticks: int | None = None) -> int:
+    # Games that neither die nor finish (e.g. a random walk) stop here.
+    return max_ticks if max_ticks is not None else width * height * 20
+
+
+def build_report(
+    outcomes: Sequence[GameOutcome],
+    policy: str,
+    width: int,
+    height: int,
+    wrap: bool,
+    seconds: float,
+) -> SimulationReport:
+    ticks = sum(outcome.ticks for outcome in outcomes)
+    elapsed = max(seconds, 1e-9)
+    return SimulationReport(
+        policy=policy,
+        width=width,
+        height=height,
+        wrap=wrap,
+        games=len(outcomes),
+        ticks=ticks,
+        seconds=seconds,
+        ticks_per_sec=ticks / elapsed,
+        games_per_sec=len(outcomes) / elapsed,
+        scores=Distribution.of([outcome.score for outcome in outcomes]),
+        lengths=Distribution.of([outcome.length for outcome in outcomes]),
+        deaths=sum(outcome.died for outcome in outcomes),
+    )
+
+
+def controller_factory(
+    policy: str, wrap: bool, script: Path | None = None
+) -> ControllerFactory:
+    if policy == "random":
+        return RandomController
+    if policy == "greedy":
+        return lambda _seed: GreedyController(wrap=wrap)
+    if policy == "autopilot":
+        return lambda _seed: AutopilotController(wrap=wrap)
+    if policy == "hamiltonian":
+        cache = CycleCache()
+        return lambda _seed: HamiltonianController(wrap=wrap, cache=cache)
+    if policy == "script":
+        if script is None:
+            raise ValueError("The script policy needs --script")
+        moves = parse_script(script.read_text())
+        return lambda _seed: ScriptedController(moves)
+    raise ValueError(f"Unknown policy: {policy}")
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m snake_game",
+        description="Play Snake headlessly and report throughput as JSON.",
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--height", type=int, default=15)
+    parser.add_argument("--wrap", action="store_true")
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument(
+        "--script", type=Path, help="direction file for --policy script"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-ticks", type=int, help="per-game tick cap")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        factory = controller_factory(args.policy, args.wrap, args.script)
+        report = simulate(
+            factory,
+            games=args.games,
+            width=args.width,
+            height=args.height,
+            wrap=args.wrap,
+            seed=args.seed,
+            max_ticks=args.max_ticks,
+            policy=args.policy,
+        )
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    text = report.to_json() + "\n"
+    if args.output is not None:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import math
+import time
+from collections import Counter
 from enum import Enum, auto
+from functools import lru_cache
 from typing import Protocol, cast
 
 import pygame
 
+from snake_game.controllers import AutopilotController
 from snake_game.core import (
     DOWN,
     LEFT,
+    NO_FOOD,
     RIGHT,
     UP,
     GameFactory,
     GameObserver,
     GameProtocol,
+    GameState,
+    Position,
+    StepResult,
     WraparoundGameFactory,
 )
 from snake_game.settings import (
@@ -37,7 +45,20 @@ KEY_MAP = {
 CELL_SIZE = 28
 PADDING = 20
 INFO_HEIGHT = 92
+# Bitmap font: 5x7 glyphs of GLYPH_PIXEL-sized squares, 2px apart.
+GLYPH_PIXEL = 2
+GLYPH_ADVANCE = 5 * GLYPH_PIXEL + 2
+LINE_HEIGHT = 7 * GLYPH_PIXEL + 2
+STATUS_HEIGHT = LINE_HEIGHT
+# Rendered strings kept for reuse; far more than the menus and HUD show at once.
+TEXT_CACHE_SIZE = 256
+GLYPH_CACHE_SIZE = 512
+# Background layers: PLAYING and GAME_OVER for the current board and the last one.
+STATIC_LAYER_CACHE_SIZE = 4
 FPS = 60
+# Longest sleep between checks while nothing moves on screen.
+IDLE_WAIT_MS = 500
+GAME_OVER_SECONDS = 2.0
 
 COLOR_BG = (22, 24, 28)
 COLOR_GRID = (40, 44, 52)
@@ -73,37 +94,137 @@ class _SurfaceLike(Protocol):
     def fill(self, color: tuple[int, int, int]) -> object: ...
 
 
-class _PygameObserver(GameObserver):
-    def __init__(
-        self,
-        screen: _SurfaceLike,
-        game: GameProtocol,
-        paused_getter: Callable[[], bool],
-        wraparound_getter: Callable[[], bool],
-        grid_w: int,
-        grid_h: int,
-    ) -> None:
-        self._screen = screen
-        self._game = game
-        self._paused_getter = paused_getter
-        self._wraparound_getter = wraparound_getter
-        self._grid_w = grid_w
-        self._grid_h = grid_h
+class _FrameScheduler(GameObserver):
+    # The one place that decides whether a frame is due. Game events and input
+    # only mark the frame dirty; the main loop takes the flag once per iteration
+    # and draws (and presents) at most one frame.
+    def __init__(self) -> None:
+        self._dirty = True
 
     def on_state_change(self, state: object, event: str) -> None:
-        _render_playing(
-            self._screen,
-            self._game,
-            self._paused_getter(),
-            self._wraparound_getter(),
-            self._grid_w,
-            self._grid_h,
+        self._dirty = True
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def take(self) -> bool:
+        dirty = self._dirty
+        self._dirty = False
+        return dirty
+
+
+class _PlayingRenderer:
+    # Retained-mode PLAYING screen. Remembers what the last frame showed; when the
+    # next state is the result of a step reported to advance() from that frame,
+    # repaints only the new head, the old head, the vacated tail, the food cells
+    # and the status line, and returns those rects for pygame.display.update().
+    # Anything else (first frame, reset, restore, an unreported step) repaints the
+    # whole screen.
+    def __init__(self, grid_w: int, grid_h: int) -> None:
+        self._grid_w = grid_w
+        self._grid_h = grid_h
+        self._drawn: GameState | None = None
+        self._step: StepResult | None = None
+        self._tail: Position = NO_FOOD
+        self._food: Position | None = None
+        self._status = ""
+
+    def invalidate(self) -> None:
+        self._drawn = None
+
+    def advance(self, result: StepResult) -> None:
+        self._step = result
+
+    def draw(
+        self, screen: _SurfaceLike, game: GameProtocol, status_line: str
+    ) -> list[pygame.Rect]:
+        state = game.state
+        step, self._step = self._step, None
+        if self._drawn is None:
+            return self._draw_all(screen, state, status_line)
+        snake = state.snake
+        food = state.food if state.alive and state.food[0] >= 0 else None
+        # Cell -> color to paint, None for the empty board.
+        cells: dict[Position, tuple[int, int, int] | None] = {}
+        if state is not self._drawn:
+            delta = step.delta if step is not None and step.state is state else None
+            if delta is None or delta.head is None:
+                return self._draw_all(screen, state, status_line)
+            # A step moves the tail off the old one, or keeps it when growing.
+            start = delta.tail if delta.tail is not None else snake[-1]
+            if start != self._tail:
+                return self._draw_all(screen, state, status_line)
+            if delta.tail is not None:
+                cells[delta.tail] = None
+            cells[snake[1]] = COLOR_SNAKE_BODY
+            cells[delta.head] = COLOR_SNAKE_HEAD
+        if food != self._food:
+            if self._food is not None:
+                cells.setdefault(self._food, None)
+            if food is not None:
+                cells[food] = COLOR_FOOD
+        rects = [self._paint_cell(screen, cell, color) for cell, color in cells.items()]
+        if status_line != self._status:
+            rects.append(self._paint_status(screen, status_line))
+        self._drawn = state
+        self._tail = snake[-1]
+        self._food = food
+        self._status = status_line
+        return rects
+
+    def _draw_all(
+        self, screen: _SurfaceLike, state: GameState, status_line: str
+    ) -> list[pygame.Rect]:
+        _draw_playing(screen, state, self._grid_w, self._grid_h, status_line)
+        self._drawn = state
+        self._tail = state.snake[-1]
+        self._food = state.food if state.alive and state.food[0] >= 0 else None
+        self._status = status_line
+        return [
+            pygame.Rect(
+                0,
+                0,
+                self._grid_w + PADDING * 2,
+                self._grid_h + PADDING * 2 + INFO_HEIGHT,
+            )
+        ]
+
+    def _paint_cell(
+        self,
+        screen: _SurfaceLike,
+        cell: Position,
+        color: tuple[int, int, int] | None,
+    ) -> pygame.Rect:
+        x, y = cell
+        rect = pygame.Rect(
+            PADDING + x * CELL_SIZE, PADDING + y * CELL_SIZE, CELL_SIZE, CELL_SIZE
+        )
+        if color is None:
+            # The empty board, border included, as the static layer has it.
+            self._restore(screen, rect)
+        else:
+            _draw_rect(screen, color, rect)
+        return rect
+
+    def _paint_status(self, screen: _SurfaceLike, status_line: str) -> pygame.Rect:
+        rect = pygame.Rect(
+            0, PADDING + self._grid_h + 14, self._grid_w + PADDING * 2, STATUS_HEIGHT
         )
+        self._restore(screen, rect)
+        _draw_text(screen, status_line, (PADDING, rect.y))
+        return rect
 
+    def _restore(self, screen: _SurfaceLike, rect: pygame.Rect) -> None:
+        surface = cast(pygame.Surface, screen)
+        layer = _static_layer(surface.get_size(), self._grid_w, self._grid_h, True)
+        surface.blit(layer, rect, rect)
 
-def _main(store: SettingsStore | None = None) -> None:
+
+def _main(store: SettingsStore | None = None, stats: _FrameStats | None = None) -> None:
     if store is None:
         store = SettingsStore()
+    if stats is None:
+        stats = _FrameStats()
 
     settings = store.load()
     width = 20
@@ -112,6 +233,7 @@ def _main(store: SettingsStore | None = None) -> None:
     menu_selection = 0
     options_selection = 0
     game: GameProtocol | None = None
+    autopilot: AutopilotController | None = None
     paused = False
     time_since_tick = 0.0
     game_over_timer = 0.0
@@ -126,27 +248,43 @@ def _main(store: SettingsStore | None = None) -> None:
     pygame.display.set_caption("Snake")
     clock = pygame.time.Clock()
 
-    def _paused_getter() -> bool:
-        return paused
-
-    def _wraparound_getter() -> bool:
-        return wraparound_enabled
-
-    observer: _PygameObserver | None = None
+    renderer: _PlayingRenderer | None = None
 
+    # Frames are drawn only when something on screen changed. Unless the game is
+    # running, the loop sleeps until input arrives or a timer runs out.
+    frame = _FrameScheduler()
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000
-
-        for event in pygame.event.get():
+        idle = state != _State.PLAYING or paused
+        if not idle:
+            dt = clock.tick(FPS) / 1000
+            events = pygame.event.get()
+        else:
+            if state == _State.GAME_OVER:
+                idle_ms = math.ceil((GAME_OVER_SECONDS - game_over_timer) * 1000)
+            else:
+                idle_ms = IDLE_WAIT_MS
+            events = _wait_events(max(idle_ms, 1))
+            dt = clock.tick(0) / 1000
+        stats.tick(_phase(state, paused), dt)
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
                 continue
 
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # The window contents were lost: redraw all of it.
+                frame.mark_dirty()
+                if renderer is not None:
+                    renderer.invalidate()
+                continue
+
             if event.type != pygame.KEYDOWN:
                 continue
 
             if state == _State.MENU:
+                frame.mark_dirty()
                 if event.key == pygame.K_UP:
                     menu_selection = (menu_selection - 1) % len(MENU_ITEMS)
                 elif event.key == pygame.K_DOWN:
@@ -160,15 +298,9 @@ def _main(store: SettingsStore | None = None) -> None:
                         )
                         grid_w = game.state.width * CELL_SIZE
                         grid_h = game.state.height * CELL_SIZE
-                        observer = _PygameObserver(
-                            screen,
-                            game,
-                            _paused_getter,
-                            _wraparound_getter,
-                            grid_w,
-                            grid_h,
-                        )
-                        game.add_observer(observer)
+                        renderer = _PlayingRenderer(grid_w, grid_h)
+                        game.add_observer(frame)
+                        autopilot = None
                         paused = False
                         time_since_tick = 0.0
                         state = _State.PLAYING
@@ -178,6 +310,7 @@ def _main(store: SettingsStore | None = None) -> None:
                         running = False
 
             elif state == _State.OPTIONS:
+                frame.mark_dirty()
                 if event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
                     state = _State.MENU
                 elif event.key == pygame.K_UP:
@@ -205,8 +338,16 @@ def _main(store: SettingsStore | None = None) -> None:
             elif state == _State.PLAYING:
                 if event.key in KEY_MAP and game is not None:
                     game.set_direction(KEY_MAP[event.key])
-                elif event.key == pygame.K_p:
+                    continue
+                frame.mark_dirty()
+                if event.key == pygame.K_p:
                     paused = not paused
+                elif event.key == pygame.K_t:
+                    # Demo mode: the autopilot steers until toggled off again.
+                    if autopilot is None:
+                        autopilot = AutopilotController(wrap=wraparound_enabled)
+                    else:
+                        autopilot = None
                 elif event.key == pygame.K_r:
                     if game is not None:
                         game.reset()
@@ -215,38 +356,97 @@ def _main(store: SettingsStore | None = None) -> None:
                 elif event.key == pygame.K_ESCAPE:
                     state = _State.MENU
                     game = None
-                    observer = None
 
             elif state == _State.GAME_OVER:
                 pass
 
+        if idle and state == _State.PLAYING and not paused:
+            # The game just started or resumed: time spent waiting for that key
+            # is not game time.
+            clock.tick()
+            dt = 0.0
+
+        if state == _State.PLAYING and game is not None and not paused:
+            time_since_tick += dt
+            if time_since_tick >= tick_interval:
+                if autopilot is not None:
+                    direction = autopilot.choose(game)
+                    if direction is not None:
+                        game.set_direction(direction)
+                # The step notifies the scheduler.
+                step_result = game.step()
+                if renderer is not None:
+                    renderer.advance(step_result)
+                if autopilot is not None:
+                    autopilot.advance(step_result)
+                time_since_tick = 0.0
+                if step_result.game_over:
+                    state = _State.GAME_OVER
+                    game_over_timer = 0.0
+
+        elif state == _State.GAME_OVER:
+            game_over_timer += dt
+            if game_over_timer >= GAME_OVER_SECONDS:
+                state = _State.MENU
+                game = None
+                frame.mark_dirty()
+
+        if not frame.take():
+            continue
+        phase = _phase(state, paused)
+        stats.frames[phase] += 1
+        presented = True
         if state == _State.MENU:
             _render_menu(screen, screen_w, screen_h, menu_selection)
 
         elif state == _State.OPTIONS:
             _render_options(screen, screen_w, screen_h, options_selection, settings)
 
-        elif state == _State.PLAYING:
-            if game is not None:
-                if not paused:
-                    time_since_tick += dt
-                    if time_since_tick >= tick_interval:
-                        step_result = game.step()
-                        time_since_tick = 0.0
-                        if step_result.game_over:
-                            state = _State.GAME_OVER
-                            game_over_timer = 0.0
-                _render_playing(
-                    screen, game, paused, wraparound_enabled, grid_w, grid_h
-                )
+        elif state == _State.PLAYING and game is not None:
+            presented = _render_playing(
+                screen,
+                game,
+                paused,
+                wraparound_enabled,
+                grid_w,
+                grid_h,
+                autopilot is not None,
+                renderer,
+            )
 
         elif state == _State.GAME_OVER and game is not None:
-            game_over_timer += dt
             _render_game_over(screen, game, grid_w, grid_h)
-            if game_over_timer >= 2.0:
-                state = _State.MENU
-                game = None
-                observer = None
+        if presented:
+            stats.presents[phase] += 1
+
+
+def _wait_events(timeout_ms: int) -> list[pygame.event.Event]:
+    # Sleeps until an event arrives or ``timeout_ms`` passes, then drains the queue.
+    first = pygame.event.wait(timeout_ms)
+    rest = pygame.event.get()
+    return rest if first.type == pygame.NOEVENT else [first, *rest]
+
+
+def _phase(state: _State, paused: bool) -> str:
+    return "PAUSED" if paused and state == _State.PLAYING else state.name
+
+
+class _FrameStats:
+    # What the main loop did per phase (a state name, or PAUSED): seconds spent,
+    # CPU seconds used, frames rendered and frames presented to the display.
+    # Benchmarks and tests read it.
+    def __init__(self) -> None:
+        self.seconds: Counter[str] = Counter()
+        self.cpu: Counter[str] = Counter()
+        self.frames: Counter[str] = Counter()
+        self.presents: Counter[str] = Counter()
+        self._cpu_mark = time.process_time()
+
+    def tick(self, state: str, dt: float) -> None:
+        now = time.process_time()
+        self.seconds[state] += dt
+        self.cpu[state] += now - self._cpu_mark
+        self._cpu_mark = now
 
 
 def _render_menu(
@@ -302,14 +502,32 @@ def _render_playing(
     wraparound_enabled: bool,
     grid_w: int,
     grid_h: int,
+    autopilot: bool = False,
+    renderer: _PlayingRenderer | None = None,
+) -> bool:
+    # Whether anything was presented: an incremental frame may have nothing new.
+    status = "PAUSED" if paused else "AUTO" if autopilot else "RUNNING"
+    wrap_status = "ON" if wraparound_enabled else "OFF"
+    status_line = f"Score: {game.state.score}  {status}  Wrap: {wrap_status}"
+    if renderer is None:
+        _draw_playing(screen, game.state, grid_w, grid_h, status_line)
+        pygame.display.flip()
+        return True
+    rects = renderer.draw(screen, game, status_line)
+    if rects:
+        pygame.display.update(rects)
+    return bool(rects)
+
+
+def _draw_playing(
+    screen: _SurfaceLike,
+    state: GameState,
+    grid_w: int,
+    grid_h: int,
+    status_line: str,
 ) -> None:
-    screen.fill(COLOR_BG)
-
-    grid_rect = pygame.Rect(PADDING, PADDING, grid_w, grid_h)
-    _draw_rect(screen, COLOR_GRID, grid_rect)
-    _draw_rect(screen, COLOR_BORDER, grid_rect, width=2)
+    _draw_static_layer(screen, grid_w, grid_h, True)
 
-    state = game.state
     for index, (x, y) in enumerate(state.snake):
         color = COLOR_SNAKE_HEAD if index == 0 else COLOR_SNAKE_BODY
         rect = pygame.Rect(
@@ -330,16 +548,33 @@ def _render_playing(
         )
         _draw_rect(screen, COLOR_FOOD, rect)
 
-    status = "PAUSED" if paused else "RUNNING"
-    wrap_status = "ON" if wraparound_enabled else "OFF"
-    status_line = f"Score: {state.score}  {status}  Wrap: {wrap_status}"
-    controls_line = "Controls: arrows/WASD move, P pause"
-    controls_line_two = "R restart, Esc menu"
     _draw_text(screen, status_line, (PADDING, PADDING + grid_h + 14))
-    _draw_text(screen, controls_line, (PADDING, PADDING + grid_h + 42))
-    _draw_text(screen, controls_line_two, (PADDING, PADDING + grid_h + 62))
 
-    pygame.display.flip()
+
+def _draw_static_layer(
+    screen: _SurfaceLike, grid_w: int, grid_h: int, controls: bool
+) -> None:
+    surface = cast(pygame.Surface, screen)
+    surface.blit(_static_layer(surface.get_size(), grid_w, grid_h, controls), (0, 0))
+
+
+@lru_cache(maxsize=STATIC_LAYER_CACHE_SIZE)
+def _static_layer(
+    size: tuple[int, int], grid_w: int, grid_h: int, controls: bool
+) -> pygame.Surface:
+    # What PLAYING and GAME_OVER frames share until the window or grid changes:
+    # background, empty grid and border, plus the controls lines while playing.
+    layer = pygame.Surface(size)
+    layer.fill(COLOR_BG)
+    grid_rect = pygame.Rect(PADDING, PADDING, grid_w, grid_h)
+    _draw_rect(layer, COLOR_GRID, grid_rect)
+    _draw_rect(layer, COLOR_BORDER, grid_rect, width=2)
+    if controls:
+        controls_line = "Controls: arrows/WASD move, P pause"
+        controls_line_two = "R restart, T autopilot, Esc menu"
+        _draw_text(layer, controls_line, (PADDING, PADDING + grid_h + 42))
+        _draw_text(layer, controls_line_two, (PADDING, PADDING + grid_h + 62))
+    return layer
 
 
 def _render_game_over(
@@ -348,11 +583,7 @@ def _render_game_over(
     grid_w: int,
     grid_h: int,
 ) -> None:
-    screen.fill(COLOR_BG)
-
-    grid_rect = pygame.Rect(PADDING, PADDING, grid_w, grid_h)
-    _draw_rect(screen, COLOR_GRID, grid_rect)
-    _draw_rect(screen, COLOR_BORDER, grid_rect, width=2)
+    _draw_static_layer(screen, grid_w, grid_h, False)
 
     state = game.state
     for index, (x, y) in enumerate(state.snake):
@@ -456,30 +687,40 @@ def _draw_bitmap_text(
     pos: tuple[int, int],
     color: tuple[int, int, int],
 ) -> None:
-    x, y = pos
-    pixel = 2
-    spacing = 1
-    line_height = 7 * pixel + spacing * 2
-
-    for line in text.upper().splitlines():
-        cursor_x = x
-        for char in line:
-            glyph = _BITMAP_FONT.get(char)
-            if glyph is None:
-                cursor_x += (5 * pixel) + (spacing * 2)
-                continue
-            for row_idx, row in enumerate(glyph):
-                for col_idx, bit in enumerate(row):
-                    if bit == "1":
-                        rect = pygame.Rect(
-                            cursor_x + col_idx * pixel,
-                            y + row_idx * pixel,
-                            pixel,
-                            pixel,
-                        )
-                        _draw_rect(screen, color, rect)
-            cursor_x += (5 * pixel) + (spacing * 2)
-        y += line_height
+    cast(pygame.Surface, screen).blit(_text_surface(text, color), pos)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _text_surface(text: str, color: tuple[int, int, int]) -> pygame.Surface:
+    # The whole string on a transparent surface, so a frame blits it once.
+    lines = text.upper().splitlines()
+    columns = max((len(line) for line in lines), default=0)
+    surface = pygame.Surface(
+        (max(columns * GLYPH_ADVANCE, 1), max(len(lines) * LINE_HEIGHT, 1)),
+        pygame.SRCALPHA,
+    )
+    for row, line in enumerate(lines):
+        for column, char in enumerate(line):
+            glyph = _glyph_surface(char, color)
+            if glyph is not None:
+                surface.blit(glyph, (column * GLYPH_ADVANCE, row * LINE_HEIGHT))
+    return surface
+
+
+@lru_cache(maxsize=GLYPH_CACHE_SIZE)
+def _glyph_surface(char: str, color: tuple[int, int, int]) -> pygame.Surface | None:
+    # None for characters the font lacks; they leave a blank cell.
+    bitmap = _BITMAP_FONT.get(char)
+    if bitmap is None:
+        return None
+    surface = pygame.Surface((5 * GLYPH_PIXEL, 7 * GLYPH_PIXEL), pygame.SRCALPHA)
+    for y, row in enumerate(bitmap):
+        for x, bit in enumerate(row):
+            if bit == "1":
+                surface.fill(
+                    color, (x * GLYPH_PIXEL, y * GLYPH_PIXEL, GLYPH_PIXEL, GLYPH_PIXEL)
+                )
+    return surface
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+from snake_game.core import (
+    DOWN,
+    EVENT_STEP,
+    LEFT,
+    RIGHT,
+    UP,
+    WALL,
+    Cell,
+    GameState,
+    NeighborTable,
+    Position,
+    StandardMovementStrategy,
+    WraparoundMovementStrategy,
+    cell_positions,
+)
+
+# Clockwise, so consecutive sides of a cell share a corner.
+SIDES = (UP, RIGHT, DOWN, LEFT)
+
+
+class Reachability:
+    # Connected regions of the cells the snake does not cover, as a union-find
+    # forest kept in step with the game: call update() with each new state, or add
+    # it to a Game as an observer. A freed tail joins its neighbors' sets in near
+    # constant time. Sets cannot split, so when the new head's free neighbors are
+    # not joined through the ring of cells around it, searches from each of them
+    # run in turn until they meet; one that runs out of cells first has found a
+    # region cut off from the rest, which moves to a set of its own. That costs
+    # about the size of the smaller region. Covered cells stay in their sets as
+    # dead nodes; a freed cell gets a new node, and the forest is relabeled with
+    # one flood fill once dead nodes outnumber the cells.
+    #
+    # update() treats a body one move on from the last as a tick. A reset or
+    # restore can match that, so as an observer it reloads on every event but a
+    # step, and callers of update() call invalidate() after Game.restore().
+    def __init__(self, wrap: bool = False) -> None:
+        self._wrap = wrap
+        self._grid: tuple[int, int] | None = None
+        self._table: NeighborTable = {}
+        self._rows: tuple[list[Cell], ...] = ()
+        self._free = bytearray()
+        self._node: list[int] = []
+        self._parent: list[int] = []
+        self._size: list[int] = []
+        self._stale = True
+        self._head = WALL
+        self._tail = WALL
+        self._length = 0
+
+    def on_state_change(self, state: GameState, event: str) -> None:
+        if event != EVENT_STEP:
+            self.invalidate()
+        self.update(state)
+
+    def invalidate(self) -> None:
+        # The next update() loads its state from scratch.
+        self._grid = None
+
+    def update(self, state: GameState) -> None:
+        width = state.width
+        snake = state.snake
+        head_x, head_y = snake[0]
+        tail_x, tail_y = snake[-1]
+        head = head_y * width + head_x
+        tail = tail_y * width + tail_x
+        length = len(snake)
+        if self._grid != (width, state.height):
+            self._grid = (width, state.height)
+            strategy = (
+                WraparoundMovementStrategy()
+                if self._wrap
+                else StandardMovementStrategy()
+            )
+            self._table = strategy.neighbor_table(width, state.height)
+            self._rows = tuple(self._table[side] for side in SIDES)
+            self._load(state)
+        elif head != self._head or tail != self._tail or length != self._length:
+            old_head = self._head
+            old_tail = self._tail
+            if not (
+                length > 1
+                and any(row[old_head] == head for row in self._rows)
+                and snake[1] == cell_positions(width, state.height)[old_head]
+            ):
+                # More than one tick passed (or the game was reset or restored).
+                self._load(state)
+            elif length == self._length + 1 and tail == old_tail:
+                self._block(head)
+            elif length == self._length and any(
+                row[old_tail] == tail for row in self._rows
+            ):
+                if head != old_tail:
+                    self._unblock(old_tail)
+                    self._block(head)
+            else:
+                self._load(state)
+        self._head = head
+        self._tail = tail
+        self._length = length
+
+    def region_size(self, position: Position) -> int:
+        # Free cells reachable from ``position``, itself included; 0 if the snake
+        # covers it. The tail counts as covered.
+        cell = self._cell(position)
+        if not self._free[cell]:
+            return 0
+        if self._stale:
+            self._relabel()
+        return self._size[self._find(self._node[cell])]
+
+    def connected(self, a: Position, b: Position) -> bool:
+        first = self._cell(a)
+        second = self._cell(b)
+        if not (self._free[first] and self._free[second]):
+            return False
+        if self._stale:
+            self._relabel()
+        return self._find(self._node[first]) == self._find(self._node[second])
+
+    def _cell(self, position: Position) -> Cell:
+        if self._grid is None:
+            raise RuntimeError("Reachability has not seen a game state yet")
+        x, y = position
+        return y * self._grid[0] + x
+
+    def _load(self, state: GameState) -> None:
+        width = state.width
+        free = bytearray(b"\x01") * (width * state.height)
+        for x, y in state.snake:
+            free[y * width + x] = 0
+        self._free = free
+        self._stale = True
+
+    def _relabel(self) -> None:
+        free = self._free
+        rows = self._rows
+        count = len(free)
+        parent = list(range(count))
+        size = [0] * count
+        unseen = bytearray(free)
+        for start in range(count):
+            if not unseen[start]:
+                continue
+            unseen[start] = 0
+            region = [start]
+            # The loop also visits the cells appended while it runs.
+            for cell in region:
+                for row in rows:
+                    neighbor = row[cell]
+                    if neighbor != WALL and unseen[neighbor]:
+                        unseen[neighbor] = 0
+                        region.append(neighbor)
+            for cell in region:
+                parent[cell] = start
+            size[start] = len(region)
+        self._node = list(range(count))
+        self._parent = parent
+        self._size = size
+        self._stale = False
+
+    def _block(self, cell: Cell) -> None:
+        self._free[cell] = 0
+        if self._stale:
+            return
+        self._size[self._find(self._node[cell])] -= 1
+        starts = self._cut_sides(cell)
+        if len(starts) > 1:
+            self._split(starts)
+
+    def _unblock(self, cell: Cell) -> None:
+        free = self._free
+        free[cell] = 1
+        if self._stale:
+            return
+        node = self._new_node(1)
+        self._node[cell] = node
+        for row in self._rows:
+            neighbor = row[cell]
+            if neighbor != WALL and free[neighbor]:
+                self._union(node, self._node[neighbor])
+
+    def _cut_sides(self, cell: Cell) -> list[Cell]:
+        # One free side of ``cell`` per run of free sides joined clockwise through
+        # free corners. Sides in one run reach each other without ``cell``.
+        free = self._free
+        rows = self._rows
+        sides = [row[cell] for row in rows]
+        open_sides = [side != WALL and free[side] == 1 for side in sides]
+        starts = []
+        for index in range(4):
+            previous = index - 1
+            if open_sides[index] and not (
+                open_sides[previous] and free[rows[index][sides[previous]]]
+            ):
+                starts.append(sides[index])
+        return starts
+
+    def _split(self, starts: list[Cell]) -> None:
+        # Breadth-first searches from ``starts``, one cell each in turn. A search
+        # that reaches another's cell hands its cells over and stops; one that
+        # runs out of cells holds a whole region, which gets a set of its own.
+        free = self._free
+        rows = self._rows
+        owner = {start: search for search, start in enumerate(starts)}
+        found = [[start] for start in starts]
+        read = [0] * len(starts)
+        merged_into = list(range(len(starts)))
+        active = list(range(len(starts)))
+        while len(active) > 1:
+            for search in tuple(active):
+                if len(active) == 1:
+                    break
+                cells = found[search]
+                if read[search] == len(cells):
+                    active.remove(search)
+                    self._detach(cells)
+                    continue
+                cell = cells[read[search]]
+                read[search] += 1
+                for row in rows:
+                    neighbor = row[cell]
+                    if neighbor == WALL or not free[neighbor]:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = search
+                        cells.append(neighbor)
+                        continue
+                    while merged_into[other] != other:
+                        other = merged_into[other]
+                    if other != search:
+                        # Already expanded cells are expanded again; harmless.
+                        found[other].extend(cells)
+                        merged_into[search] = other
+                        active.remove(search)
+                        break
+
+    def _detach(self, cells: list[Cell]) -> None:
+        # Every cell of the cut-off region shares the new set's single node.
+        self._size[self._find(self._node[cells[0]])] -= len(cells)
+        node = self._new_node(len(cells))
+        for cell in cells:
+            self._node[cell] = node
+
+    def _new_node(self, size: int) -> int:
+        node = len(self._parent)
+        self._parent.append(node)
+        self._size.append(size)
+        if node >= 2 * len(self._free):
+            self._stale = True
+        return node
+
+    def _find(self, node: int) -> int:
+        parent = self._parent
+        while parent[node] != node:
+            # Path halving: point every other node at its grandparent.
+            grandparent = parent[parent[node]]
+            parent[node] = grandparent
+            node = grandparent
+        return node
+
+    def _union(self, a: int, b: int) -> None:
+        first = self._find(a)
+        second = self._find(b)
+        if first == second:
+            return
+        size = self._size
+        if size[first] < size[second]:
+            first, second = second, first
+        self._parent[second] = first
+        size[first] += size[second]
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import chain, islice, repeat
+from pathlib import Path
+from random import Random
+from types import TracebackType
+
+from snake_game.core import (
+    DOWN,
+    LEFT,
+    NO_FOOD,
+    RIGHT,
+    UP,
+    Direction,
+    Game,
+    GameObserver,
+    GameProtocol,
+    GameState,
+    MultiStepResult,
+    RandomState,
+    StepResult,
+    WraparoundMovementStrategy,
+    cell_positions,
+)
+
+# File layout (all integers are unsigned LEB128 varints unless noted):
+#
+#   MAGIC, VERSION byte, wrap byte, width, height, seed, keyframe_interval
+#   runs: one varint per run of ticks with the same heading,
+#         ``run_length << 2 | DIRECTIONS.index(direction)``
+#   keyframes: the state at ticks 0, K, 2K, ... (see _write_keyframe)
+#   index: one INDEX_ENTRY per keyframe: its offset, the offset of the run that
+#          holds the next tick, and how many ticks of that run came before it
+#   FOOTER: runs end, index offset, keyframe count, total ticks; then MAGIC
+#
+# Version 1 files (header without keyframe_interval, runs to the end of the file)
+# are still read.
+MAGIC = b"SNKR"
+VERSION = 2
+DIRECTIONS: tuple[Direction, ...] = (UP, DOWN, LEFT, RIGHT)
+SEED_BITS = 63
+DEFAULT_KEYFRAME_INTERVAL = 1024
+INDEX_ENTRY = struct.Struct("<QQQ")
+FOOTER = struct.Struct("<QQQQ4s")
+RNG_WORDS = struct.Struct("<625I")
+_RNG_VERSION = 3
+
+Runs = tuple[tuple[Direction, int], ...]
+
+
+@dataclass(frozen=True)
+class Replay:
+    width: int
+    height: int
+    wrap: bool
+    seed: int
+    # (heading, ticks) runs; the heading is the one the snake actually moved in.
+    runs: Runs = ()
+    # Ticks between state keyframes in the saved file; 0: none.
+    keyframe_interval: int = 0
+
+    @property
+    def ticks(self) -> int:
+        return sum(count for _direction, count in self.runs)
+
+    def directions(self) -> Iterator[Direction | None]:
+        # One entry per tick for Game.step_many: the heading at the start of each
+        # run, then None to keep it.
+        return _expand(iter(self.runs))
+
+    def new_game(self) -> Game:
+        strategy = WraparoundMovementStrategy() if self.wrap else None
+        return Game(self.width, self.height, seed=self.seed, strategy=strategy)
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        out.append(1 if self.wrap else 0)
+        for value in (self.width, self.height, self.seed, self.keyframe_interval):
+            _write_varint(out, value)
+        run_offsets = []
+        for direction, count in self.runs:
+            run_offsets.append(len(out))
+            _write_varint(out, count << 2 | DIRECTIONS.index(direction))
+        runs_end = len(out)
+
+        index = []
+        run = 0
+        run_start_tick = 0
+        for tick, state, rng_state in self._keyframes():
+            while run < len(self.runs) and run_start_tick + self.runs[run][1] <= tick:
+                run_start_tick += self.runs[run][1]
+                run += 1
+            run_offset = run_offsets[run] if run < len(self.runs) else runs_end
+            index.append((len(out), run_offset, tick - run_start_tick))
+            _write_keyframe(out, state, rng_state)
+        index_offset = len(out)
+        for entry in index:
+            out += INDEX_ENTRY.pack(*entry)
+        out += FOOTER.pack(runs_end, index_offset, len(index), self.ticks, MAGIC)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> Replay:
+        header = _Header.parse(data)
+        runs = tuple(_read_runs(data, header.runs_offset, header.runs_end))
+        return cls(
+            header.width,
+            header.height,
+            header.wrap,
+            header.seed,
+            runs,
+            header.keyframe_interval,
+        )
+
+    def save(self, path: Path) -> None:
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> Replay:
+        return cls.from_bytes(path.read_bytes())
+
+    def _keyframes(self) -> Iterator[tuple[int, GameState, RandomState]]:
+        interval = self.keyframe_interval
+        if not interval:
+            return
+        game = self.new_game()
+        directions = self.directions()
+        yield 0, game.state, game.rng_state()
+        for tick in range(interval, self.ticks + 1, interval):
+            game.step_many(islice(directions, interval))
+            yield tick, game.state, game.rng_state()
+
+
+def play(replay: Replay, game: Game | None = None) -> MultiStepResult:
+    # Re-simulates the whole recording with one step_many() call.
+    if game is None:
+        game = replay.new_game()
+    return game.step_many(replay.directions())
+
+
+class ReplayFile:
+    # Memory-mapped reader. game_at(tick) restores the nearest keyframe at or
+    # before ``tick`` (found by division, not search) and re-simulates at most
+    # keyframe_interval - 1 ticks, touching only those pages of the file.
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = memoryview(self._map)
+        try:
+            self._header = _Header.parse(self._data)
+        except ValueError:
+            self.close()
+            raise
+        header = self._header
+        self.width = header.width
+        self.height = header.height
+        self.wrap = header.wrap
+        self.seed = header.seed
+        self.keyframe_interval = header.keyframe_interval
+        self.ticks = header.ticks
+
+    def __enter__(self) -> ReplayFile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._data.release()
+        self._map.close()
+
+    def replay(self) -> Replay:
+        return Replay.from_bytes(self._data)
+
+    def state_at(self, tick: int) -> GameState:
+        return self.game_at(tick).state
+
+    def game_at(self, tick: int) -> Game:
+        if not 0 <= tick <= self.ticks:
+            raise IndexError(f"tick {tick} outside 0..{self.ticks}")
+        header = self._header
+        if header.keyframes:
+            keyframe = tick // self.keyframe_interval
+            offset, run_offset, skip = INDEX_ENTRY.unpack_from(
+                self._data, header.index_offset + keyframe * INDEX_ENTRY.size
+            )
+            state, rng_state = _read_keyframe(
+                self._data, offset, self.width, self.height
+            )
+            strategy = WraparoundMovementStrategy() if self.wrap else None
+            game = Game.from_state(state, rng_state, strategy)
+            remaining = tick - keyframe * self.keyframe_interval
+        else:
+            game = Replay(self.width, self.height, self.wrap, self.seed).new_game()
+            run_offset, skip, remaining = header.runs_offset, 0, tick
+        if remaining:
+            runs = _read_runs(self._data, run_offset, header.runs_end)
+            first_direction, first_count = next(runs)
+            directions = _expand(chain([(first_direction, first_count - skip)], runs))
+            game.step_many(islice(directions, remaining))
+        return game
+
+
+class ReplayRecorder(GameProtocol):
+    # A Game that records the heading of every tick. Each episode, the first and
+    # every one after reset(), is seeded from the recorder's own seed stream so
+    # it can be replayed exactly; finished episodes collect in ``episodes``.
+    def __init__(
+        self,
+        width: int = 20,
+        height: int = 15,
+        wrap: bool = False,
+        seed: int | None = None,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ) -> None:
+        if keyframe_interval < 0:
+            raise ValueError("keyframe_interval must not be negative")
+        self._wrap = wrap
+        self._keyframe_interval = keyframe_interval
+        self._seeds = Random(seed)
+        self._seed = self._seeds.getrandbits(SEED_BITS)
+        self._directions: list[Direction] = []
+        self._counts: list[int] = []
+        self._ticks = 0
+        self.episodes: list[Replay] = []
+        self.game = Replay(width, height, wrap, self._seed).new_game()
+
+    @property
+    def state(self) -> GameState:
+        return self.game.state
+
+    def set_direction(self, direction: Direction) -> None:
+        self.game.set_direction(direction)
+
+    def add_observer(self, observer: GameObserver) -> None:
+        self.game.add_observer(observer)
+
+    def step(self) -> StepResult:
+        state = self.game.state
+        if not state.alive:
+            return self.game.step()
+        if self._directions and self._directions[-1] == state.direction:
+            self._counts[-1] += 1
+        else:
+            self._directions.append(state.direction)
+            self._counts.append(1)
+        self._ticks += 1
+        return self.game.step()
+
+    def reset(self) -> None:
+        self.episodes.append(self.replay())
+        self._seed = self._seeds.getrandbits(SEED_BITS)
+        self._directions = []
+        self._counts = []
+        self._ticks = 0
+        self.game.reset(seed=self._seed)
+
+    def replay(self) -> Replay:
+        state = self.game.state
+        runs = tuple(zip(self._directions, self._counts, strict=True))
+        return Replay(
+            state.width,
+            state.height,
+            self._wrap,
+            self._seed,
+            runs,
+            self._keyframe_interval,
+        )
+
+
+@dataclass(frozen=True)
+class _Header:
+    width: int
+    height: int
+    wrap: bool
+    seed: int
+    keyframe_interval: int
+    runs_offset: int
+    runs_end: int
+    index_offset: int
+    keyframes: int
+    ticks: int
+
+    @classmethod
+    def parse(cls, data: bytes | memoryview) -> _Header:
+        if bytes(data[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a snake replay")
+        offset = len(MAGIC)
+        version = data[offset] if len(data) > offset else None
+        if version not in (1, VERSION):
+            raise ValueError("Unsupported replay version")
+        wrap = len(data) > offset + 1 and data[offset + 1] == 1
+        offset += 2
+        fields = []
+        for _ in range(3 if version == 1 else 4):
+            value, offset = _read_varint(data, offset)
+            fields.append(value)
+        if version == 1:
+            width, height, seed = fields
+            end = len(data)
+            ticks = sum(count for _direction, count in _read_runs(data, offset, end))
+            return cls(width, height, wrap, seed, 0, offset, end, end, 0, ticks)
+        if len(data) < offset + FOOTER.size:
+            raise ValueError("Truncated replay")
+        runs_end, index_offset, keyframes, ticks, magic = FOOTER.unpack_from(
+            data, len(data) - FOOTER.size
+        )
+        if magic != MAGIC:
+            raise ValueError("Truncated replay")
+        width, height, seed, interval = fields
+        return cls(
+            width,
+            height,
+            wrap,
+            seed,
+            interval,
+            offset,
+            runs_end,
+            index_offset,
+            keyframes,
+            ticks,
+        )
+
+
+def _expand(runs: Iterator[tuple[Direction, int]]) -> Iterator[Direction | None]:
+    return chain.from_iterable(
+        chain((direction,), repeat(None, count - 1)) for direction, count in runs
+    )
+
+
+def _read_runs(
+    data: bytes | memoryview, offset: int, end: int
+) -> Iterator[tuple[Direction, int]]:
+    while offset < end:
+        value, offset = _read_varint(data, offset)
+        yield DIRECTIONS[value & 3], value >> 2
+
+
+def _write_keyframe(out: bytearray, state: GameState, rng_state: RandomState) -> None:
+    # Direction code, food cell + 1 (0: none), score, alive byte, body length, the
+    # body tail to head as zigzag deltas between cells (one byte per segment on
+    # most boards), then the Mersenne Twister words. Game never calls gauss(), so
+    # its cached value is always None and is not stored.
+    width = state.width
+    _write_varint(out, DIRECTIONS.index(state.direction))
+    food_x, food_y = state.food
+    _write_varint(out, food_y * width + food_x + 1 if food_x >= 0 else 0)
+    _write_varint(out, state.score)
+    out.append(1 if state.alive else 0)
+    _write_varint(out, len(state.snake))
+    previous = 0
+    for x, y in reversed(state.snake):
+        cell = y * width + x
+        delta = cell - previous
+        _write_varint(out, delta << 1 if delta >= 0 else (~delta << 1) | 1)
+        previous = cell
+    version, words, gauss = rng_state
+    if version != _RNG_VERSION or gauss is not None:
+        raise ValueError("Unsupported random state")
+    out += RNG_WORDS.pack(*words)
+
+
+def _read_keyframe(
+    data: memoryview, offset: int, width: int, height: int
+) -> tuple[GameState, RandomState]:
+    positions = cell_positions(width, height)
+    code, offset = _read_varint(data, offset)
+    food, offset = _read_varint(data, offset)
+    score, offset = _read_varint(data, offset)
+    alive = data[offset] == 1
+    length, offset = _read_varint(data, offset + 1)
+    body = []
+    cell = 0
+    for _ in range(length):
+        value, offset = _read_varint(data, offset)
+        cell += value >> 1 if not value & 1 else ~(value >> 1)
+        body.append(positions[cell])
+    words = RNG_WORDS.unpack_from(data, offset)
+    state = GameState(
+        width,
+        height,
+        tuple(reversed(body)),
+        DIRECTIONS[code],
+        positions[food - 1] if food else NO_FOOD,
+        alive,
+        score,
+    )
+    return state, (_RNG_VERSION, words, None)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("Replay values must be non-negative")
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes | memoryview, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated replay")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+
+from snake_game.core import (
+    DOWN,
+    LEFT,
+    NO_FOOD,
+    RIGHT,
+    UP,
+    Cell,
+    Direction,
+    Game,
+    GameState,
+    MovementStrategy,
+    RandomState,
+    SnakeBody,
+    StandardMovementStrategy,
+    WraparoundMovementStrategy,
+    cell_positions,
+)
+
+# Layout (little-endian):
+#
+#   HEADER: MAGIC, VERSION, strategy id, direction code, flags, width, height,
+#           food cell (-1: none), score, body length
+#   body: one uint32 cell index per segment, tail to head
+#   RNG: the RNG_WORDS Mersenne Twister words, if FLAG_RNG is set
+#
+# Everything after the header is an array of uint32 words, so decoding casts a
+# memoryview of the input instead of slicing or unpacking it field by field.
+MAGIC = b"SNKS"
+VERSION = 1
+DIRECTIONS: tuple[Direction, ...] = (UP, DOWN, LEFT, RIGHT)
+STRATEGIES: tuple[type[MovementStrategy], ...] = (
+    StandardMovementStrategy,
+    WraparoundMovementStrategy,
+)
+NO_STRATEGY = 0xFF
+HEADER = struct.Struct("<4sBBBBIIiII")
+FLAG_ALIVE = 1
+FLAG_RNG = 2
+RNG_WORDS = 625
+_RNG_VERSION = 3
+_WORD = 4
+_SWAP = sys.byteorder != "little"
+
+Buffer = bytes | bytearray | memoryview
+
+
+def dump_state(state: GameState) -> bytes:
+    return _dump(state, NO_STRATEGY, None)
+
+
+def load_state(data: Buffer) -> GameState:
+    state, _strategy, _rng_state = _load(data)
+    return state
+
+
+def dump_game(game: Game) -> bytes:
+    try:
+        strategy = STRATEGIES.index(type(game.strategy))
+    except ValueError:
+        raise ValueError("Unsupported movement strategy") from None
+    return _dump(game.state, strategy, game.rng_state())
+
+
+def load_game(data: Buffer) -> Game:
+    state, strategy, rng_state = _load(data)
+    if rng_state is None:
+        raise ValueError("Snapshot holds a state, not a game")
+    if strategy >= len(STRATEGIES):
+        raise ValueError("Unsupported movement strategy")
+    return Game.from_state(state, rng_state, STRATEGIES[strategy]())
+
+
+def _dump(state: GameState, strategy: int, rng_state: RandomState | None) -> bytes:
+    width = state.width
+    snake = state.snake
+    if isinstance(snake, SnakeBody) and snake._positions is cell_positions(
+        width, state.height
+    ):
+        cells: list[Cell] = snake._cells()
+    else:
+        cells = [y * width + x for x, y in reversed(snake)]
+    food_x, food_y = state.food
+    flags = FLAG_ALIVE if state.alive else 0
+    words = [array("I", cells)]
+    if rng_state is not None:
+        version, mt, gauss = rng_state
+        # Game never calls gauss(), so its cached value is always None.
+        if version != _RNG_VERSION or gauss is not None:
+            raise ValueError("Unsupported random state")
+        flags |= FLAG_RNG
+        words.append(array("I", mt))
+    if _SWAP:
+        for chunk in words:
+            chunk.byteswap()
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        strategy,
+        DIRECTIONS.index(state.direction),
+        flags,
+        width,
+        state.height,
+        food_y * width + food_x if food_x >= 0 else -1,
+        state.score,
+        len(cells),
+    )
+    return b"".join((header, *words))
+
+
+def _load(data: Buffer) -> tuple[GameState, int, RandomState | None]:
+    with memoryview(data) as view:
+        if len(view) < HEADER.size:
+            raise ValueError("Truncated snapshot")
+        (magic, version, strategy, code, flags, width, height, food, score, length) = (
+            HEADER.unpack_from(view)
+        )
+        if magic != MAGIC:
+            raise ValueError("Not a snake snapshot")
+        if version != VERSION:
+            raise ValueError("Unsupported snapshot version")
+        body_end = HEADER.size + length * _WORD
+        end = body_end + (RNG_WORDS * _WORD if flags & FLAG_RNG else 0)
+        if len(view) < end:
+            raise ValueError("Truncated snapshot")
+        cells = _words(view[HEADER.size : body_end])
+        rng_state = None
+        if flags & FLAG_RNG:
+            rng_state = (_RNG_VERSION, tuple(_words(view[body_end:end])), None)
+    size = width * height
+    if (
+        width < 5
+        or height < 5
+        or not length
+        or code >= len(DIRECTIONS)
+        or not -1 <= food < size
+        or max(cells) >= size
+    ):
+        raise ValueError("Corrupt snapshot")
+    positions = cell_positions(width, height)
+    state = GameState(
+        width,
+        height,
+        SnakeBody(cells, 0, length, positions),
+        DIRECTIONS[code],
+        positions[food] if food >= 0 else NO_FOOD,
+        bool(flags & FLAG_ALIVE),
+        score,
+    )
+    return state, strategy, rng_state
+
+
+def _words(view: memoryview) -> list[int]:
+    if not _SWAP:
+        return view.cast("I").tolist()
+    words = array("I", view.tobytes())
+    words.byteswap()
+    return words.tolist()
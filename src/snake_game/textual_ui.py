@@ -9,6 +9,7 @@ from textual.binding import Binding
 from textual.screen import ModalScreen, Screen
 from textual.widgets import Static
 
+from snake_game.controllers import AutopilotController
 from snake_game.core import (
     DOWN,
     LEFT,
@@ -284,6 +285,7 @@ class GameScreen(Screen[None]):
         Binding("left,a", "move_left", show=False),
         Binding("right,d", "move_right", show=False),
         Binding("p", "pause", "Pause"),
+        Binding("t", "toggle_autopilot", "Autopilot"),
         Binding("r", "restart", "Restart"),
         Binding("escape", "return_to_menu", "Menu"),
     ]
@@ -299,6 +301,7 @@ class GameScreen(Screen[None]):
         self._tick_interval = tick_interval
         self._wrap_enabled = wrap_enabled
         self._paused = False
+        self._autopilot: AutopilotController | None = None
         self._game_over_shown = False
         self._observer = _TextualObserver(self)
         self._game.add_observer(self._observer)
@@ -308,7 +311,7 @@ class GameScreen(Screen[None]):
         yield Static("", id="board")
         yield Static("", id="status")
         yield Static(
-            "arrows/WASD: move | P: pause | R: restart | Esc: menu",
+            "arrows/WASD: move | P: pause | T: autopilot | R: restart | Esc: menu",
             id="controls",
         )
 
@@ -332,6 +335,14 @@ class GameScreen(Screen[None]):
         self._paused = not self._paused
         self.refresh_view()
 
+    def action_toggle_autopilot(self) -> None:
+        # Demo mode: the autopilot steers until toggled off again.
+        if self._autopilot is None:
+            self._autopilot = AutopilotController(wrap=self._wrap_enabled)
+        else:
+            self._autopilot = None
+        self.refresh_view()
+
     def action_restart(self) -> None:
         self._game.reset()
         self._paused = False
@@ -345,12 +356,25 @@ class GameScreen(Screen[None]):
         board = self.query_one("#board", Static)
         status = self.query_one("#status", Static)
         board.update(_render_board(self._game))
-        status.update(_render_status(self._game, self._paused, self._wrap_enabled))
+        status.update(
+            _render_status(
+                self._game,
+                self._paused,
+                self._wrap_enabled,
+                autopilot=self._autopilot is not None,
+            )
+        )
 
     def _on_tick(self) -> None:
         if self._paused or not self._game.state.alive:
             return
-        self._game.step()
+        if self._autopilot is not None:
+            direction = self._autopilot.choose(self._game)
+            if direction is not None:
+                self._game.set_direction(direction)
+        result = self._game.step()
+        if self._autopilot is not None:
+            self._autopilot.advance(result)
         if not self._game.state.alive and not self._game_over_shown:
             self._game_over_shown = True
             self.app.push_screen(GameOverOverlay(self._game.state.score))
@@ -406,7 +430,9 @@ def _render_board(game: GameProtocol) -> Text:
     return Text.from_markup("\n".join(lines))
 
 
-def _render_status(game: GameProtocol, paused: bool, wrap_enabled: bool) -> Text:
+def _render_status(
+    game: GameProtocol, paused: bool, wrap_enabled: bool, autopilot: bool = False
+) -> Text:
     state = game.state
     score_text = Text.from_markup(f"Score: [#e6a86c]{state.score}[/]  ")
 
@@ -414,6 +440,8 @@ def _render_status(game: GameProtocol, paused: bool, wrap_enabled: bool) -> Text
         status_text = Text.from_markup("[#e5584a]GAME OVER[/]")
     elif paused:
         status_text = Text.from_markup("[#e6a86c]PAUSED[/]")
+    elif autopilot:
+        status_text = Text.from_markup("[#6ac470]AUTOPILOT[/]")
     else:
         status_text = Text.from_markup("[#6ac470]RUNNING[/]")
 
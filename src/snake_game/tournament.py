@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from snake_game.headless import (
+    POLICIES,
+    GameOutcome,
+    SimulationReport,
+    build_report,
+    controller_factory,
+    play_game,
+    tick_limit,
+)
+
+CHUNK_GAMES = 25
+
+
+@dataclass(frozen=True)
+class Chunk:
+    # A batch of consecutive seeds for one policy. Workers get plain values and
+    # build their own controllers, so nothing unpicklable crosses processes.
+    policy: str
+    first_seed: int
+    games: int
+    width: int
+    height: int
+    wrap: bool
+    max_ticks: int
+    script: Path | None = None
+
+
+@dataclass(frozen=True)
+class ChunkResult:
+    chunk: Chunk
+    outcomes: tuple[GameOutcome, ...]
+    seconds: float
+    worker: int
+
+
+@dataclass(frozen=True)
+class WorkerStats:
+    worker: int
+    chunks: int
+    games: int
+    ticks: int
+    seconds: float
+    ticks_per_sec: float
+
+
+@dataclass(frozen=True)
+class TournamentReport:
+    width: int
+    height: int
+    wrap: bool
+    seed: int
+    games: int
+    workers: int
+    seconds: float
+    # Per policy, over the seeds in order; each report's seconds add up the time
+    # workers spent on that policy.
+    policies: dict[str, SimulationReport]
+    worker_stats: list[WorkerStats]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+def plan_chunks(
+    policies: Sequence[str],
+    games: int,
+    width: int,
+    height: int,
+    wrap: bool,
+    seed: int,
+    max_ticks: int,
+    chunk_size: int = CHUNK_GAMES,
+    script: Path | None = None,
+) -> list[Chunk]:
+    # Every policy plays the same seeds.
+    return [
+        Chunk(
+            policy,
+            first,
+            min(chunk_size, seed + games - first),
+            width,
+            height,
+            wrap,
+            max_ticks,
+            script,
+        )
+        for policy in policies
+        for first in range(seed, seed + games, chunk_size)
+    ]
+
+
+def play_chunk(chunk: Chunk) -> ChunkResult:
+    factory = controller_factory(chunk.policy, chunk.wrap, chunk.script)
+    started = time.perf_counter()
+    outcomes = tuple(
+        play_game(
+            factory(seed), chunk.width, chunk.height, seed, chunk.wrap, chunk.max_ticks
+        )
+        for seed in range(chunk.first_seed, chunk.first_seed + chunk.games)
+    )
+    return ChunkResult(chunk, outcomes, time.perf_counter() - started, os.getpid())
+
+
+def run_chunks(
+    chunks: Iterable[Chunk], workers: int | None = None
+) -> Iterator[ChunkResult]:
+    # Yields results in the order they finish. One worker plays the chunks in
+    # this process, in order.
+    if workers == 1:
+        yield from map(play_chunk, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_chunk, chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def run_tournament(
+    policies: Sequence[str],
+    games: int,
+    width: int = 20,
+    height: int = 15,
+    wrap: bool = False,
+    seed: int = 0,
+    max_ticks: int | None = None,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_GAMES,
+    script: Path | None = None,
+    on_chunk: Callable[[ChunkResult], None] | None = None,
+) -> TournamentReport:
+    if games < 1:
+        raise ValueError("Need at least one game")
+    if not policies:
+        raise ValueError("Need at least one policy")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    for policy in policies:
+        # Fail on unknown policies or a missing script before starting workers.
+        controller_factory(policy, wrap, script)
+    chunks = plan_chunks(
+        policies,
+        games,
+        width,
+        height,
+        wrap,
+        seed,
+        tick_limit(width, height, max_ticks),
+        chunk_size,
+        script,
+    )
+    results: list[ChunkResult] = []
+    started = time.perf_counter()
+    for result in run_chunks(chunks, workers):
+        results.append(result)
+        if on_chunk is not None:
+            on_chunk(result)
+    seconds = time.perf_counter() - started
+    return TournamentReport(
+        width=width,
+        height=height,
+        wrap=wrap,
+        seed=seed,
+        games=games,
+        workers=workers or os.cpu_count() or 1,
+        seconds=seconds,
+        policies={
+            policy: _policy_report(policy, results, width, height, wrap)
+            for policy in dict.fromkeys(policies)
+        },
+        worker_stats=_worker_stats(results),
+    )
+
+
+def _policy_report(
+    policy: str,
+    results: Sequence[ChunkResult],
+    width: int,
+    height: int,
+    wrap: bool,
+) -> SimulationReport:
+    # Chunks finish in any order; sorting by seed makes the report match a serial
+    # run exactly (apart from timings).
+    mine = [result for result in results if result.chunk.policy == policy]
+    outcomes = sorted(
+        (outcome for result in mine for outcome in result.outcomes),
+        key=lambda outcome: outcome.seed,
+    )
+    seconds = sum(result.seconds for result in mine)
+    return build_report(outcomes, policy, width, height, wrap, seconds)
+
+
+def _worker_stats(results: Sequence[ChunkResult]) -> list[WorkerStats]:
+    by_worker: dict[int, list[ChunkResult]] = {}
+    for result in results:
+        by_worker.setdefault(result.worker, []).append(result)
+    stats = []
+    for worker, mine in sorted(by_worker.items()):
+        ticks = sum(outcome.ticks for result in mine for outcome in result.outcomes)
+        seconds = sum(result.seconds for result in mine)
+        stats.append(
+            WorkerStats(
+                worker=worker,
+                chunks=len(mine),
+                games=sum(result.chunk.games for result in mine),
+                ticks=ticks,
+                seconds=seconds,
+                ticks_per_sec=ticks / max(seconds, 1e-9),
+            )
+        )
+    return stats
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m snake_game.tournament",
+        description="Play several policies on the same seeds across worker "
+        "processes and report each policy's results as JSON.",
+    )
+    parser.add_argument(
+        "--policies", nargs="+", choices=POLICIES, default=["greedy", "autopilot"]
+    )
+    parser.add_argument("--games", type=int, default=1000, help="games per policy")
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--height", type=int, default=15)
+    parser.add_argument("--wrap", action="store_true")
+    parser.add_argument(
+        "--script", type=Path, help="direction file for the script policy"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-ticks", type=int, help="per-game tick cap")
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: CPU count)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_GAMES)
+    parser.add_argument(
+        "--progress", action="store_true", help="log each finished chunk to stderr"
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    def log(result: ChunkResult) -> None:
+        chunk = result.chunk
+        last = chunk.first_seed + chunk.games - 1
+        sys.stderr.write(
+            f"{chunk.policy} seeds {chunk.first_seed}-{last}: "
+            f"{result.seconds:.2f}s (worker {result.worker})\n"
+        )
+
+    try:
+        report = run_tournament(
+            args.policies,
+            games=args.games,
+            width=args.width,
+            height=args.height,
+            wrap=args.wrap,
+            seed=args.seed,
+            max_ticks=args.max_ticks,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            script=args.script,
+            on_chunk=log if args.progress else None,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    text = report.to_json() + "\n"
+    if args.output is not None:
+        args.output.write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -1,13 +1,13 @@
+from dataclasses import replace
+
 import pytest
 from test_support import FakeGame, make_event_observer, make_factory_class
 
-from snake_game.core import GameState
-
 
 @pytest.fixture
 def state_factory():
     def _factory(game, **overrides):
-        return GameState(**{**game.state.__dict__, **overrides})
+        return replace(game.state, **overrides)
 
     return _factory
 
@@ -0,0 +1,104 @@
+from random import Random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from snake_game.batched import DIRECTIONS, KEEP, BatchedGame  # noqa: E402
+from snake_game.core import (  # noqa: E402
+    RIGHT,
+    UP,
+    Game,
+    StandardMovementStrategy,
+    WraparoundMovementStrategy,
+)
+
+
+def test_rejects_small_grid_and_empty_batch():
+    with pytest.raises(ValueError, match="Grid too small"):
+        BatchedGame([1], width=4, height=5)
+    with pytest.raises(ValueError, match="at least one seed"):
+        BatchedGame([])
+
+
+def test_rejects_strategy_without_neighbor_table():
+    class PlainStrategy:
+        def next_head(self, state):
+            return state.head
+
+    with pytest.raises(TypeError, match="neighbor_table"):
+        BatchedGame([1], strategy=PlainStrategy())
+
+
+def test_rejects_wrong_number_of_directions():
+    batch = BatchedGame([1, 2])
+    with pytest.raises(ValueError, match="Expected 2"):
+        batch.step([KEEP])
+
+
+def test_initial_state_matches_core_game():
+    batch = BatchedGame([3, 4], width=9, height=7)
+    assert len(batch) == 2
+    assert (batch.width, batch.height) == (9, 7)
+    for index, seed in enumerate([3, 4]):
+        assert batch.state(index) == Game(width=9, height=7, seed=seed).state
+    assert batch.heads.tolist() == [3 * 9 + 4] * 2
+    assert batch.lengths.tolist() == [3, 3]
+    assert batch.scores.tolist() == [0, 0]
+    assert batch.directions.tolist() == [DIRECTIONS.index(RIGHT)] * 2
+    assert batch.episode_seeds.tolist() == [3, 4]
+    assert batch.food.tolist() == [
+        cell
+        for seed in (3, 4)
+        for x, y in [Game(width=9, height=7, seed=seed).state.food]
+        for cell in [y * 9 + x]
+    ]
+
+
+@pytest.mark.parametrize(
+    "strategy", [StandardMovementStrategy(), WraparoundMovementStrategy()]
+)
+def test_matches_core_game_including_auto_reset(strategy):
+    width, height = 7, 6
+    seeds = list(range(12))
+    batch = BatchedGame(seeds, width=width, height=height, strategy=strategy)
+    games = [Game(width, height, seed=seed, strategy=strategy) for seed in seeds]
+    inputs = Random(99)
+    finished = 0
+
+    for _ in range(400):
+        codes = [inputs.choice([KEEP, 0, 1, 2, 3]) for _ in seeds]
+        for game, code in zip(games, codes, strict=True):
+            if code != KEEP:
+                game.set_direction(DIRECTIONS[code])
+        result = batch.step(np.array(codes))
+        seeds_after = batch.episode_seeds
+        for index, game in enumerate(games):
+            outcome = game.step()
+            assert bool(result.game_over[index]) == outcome.game_over
+            assert bool(result.grew[index]) == outcome.grew
+            if outcome.game_over:
+                finished += 1
+                assert result.final_score[index] == game.state.score
+                assert result.final_length[index] == len(game.state.snake)
+                games[index] = Game(
+                    width, height, seed=int(seeds_after[index]), strategy=strategy
+                )
+            assert batch.state(index) == games[index].state
+
+    assert finished > 0
+
+
+def test_full_board_leaves_no_food():
+    batch = BatchedGame([1], width=5, height=5)
+    batch._free_count[0] = 0
+    assert batch._sample_food(0) == -1
+    batch._food[0] = -1
+    assert batch.state(0).food == (-1, -1)
+
+
+def test_step_without_directions_keeps_heading():
+    batch = BatchedGame([5], width=10, height=10)
+    batch.step([DIRECTIONS.index(UP)])
+    batch.step()
+    assert batch.state(0).direction == UP
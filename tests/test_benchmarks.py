@@ -0,0 +1,114 @@
+import pytest
+
+from benchmarks import bench_alloc
+from benchmarks.__main__ import main
+from benchmarks.harness import (
+    Metric,
+    compare,
+    format_comparison,
+    format_metric,
+    load_baseline,
+    save_baseline,
+    time_per_call,
+)
+from benchmarks.scenarios import (
+    cycle_moves,
+    cycle_positions,
+    game_on_cycle,
+    snake_length,
+)
+from snake_game.hamiltonian import build_cycle
+
+
+@pytest.mark.parametrize(("width", "height"), [(6, 4), (6, 5)])
+def test_cycle_positions_follow_the_walls_cycle(width, height):
+    cycle = cycle_positions(width, height)
+    assert len(set(cycle)) == width * height
+    rank = build_cycle(width, height, wrap=False).rank
+    assert [rank[y * width + x] for x, y in cycle] == list(range(width * height))
+    for (ax, ay), (bx, by) in zip(cycle, cycle[1:] + cycle[:1], strict=True):
+        assert abs(ax - bx) + abs(ay - by) == 1
+
+
+def test_cycle_positions_need_a_cycle():
+    with pytest.raises(ValueError, match="No Hamiltonian cycle"):
+        cycle_positions(7, 5)
+
+
+def test_game_on_cycle_survives_at_high_fill():
+    length = snake_length(10, 10, 0.9)
+    game, turns = game_on_cycle(10, 10, length)
+    assert len(game.state.snake) == length
+    for _ in range(500):
+        game.set_direction(turns[game.state.head])
+        assert game.step().game_over is False
+
+
+def test_time_per_call_counts_calls():
+    calls = []
+    assert time_per_call(lambda: calls.append(1), number=4, repeat=2) >= 0
+    assert len(calls) == 8
+
+
+def test_baseline_round_trip(tmp_path):
+    metrics = [Metric("a", 1.0), Metric("b", 5.0, "ticks/s", True)]
+    path = tmp_path / "baseline.json"
+    save_baseline(metrics, path)
+    assert load_baseline(path) == {m.name: m for m in metrics}
+
+
+def test_compare_respects_metric_direction():
+    baseline = {
+        "slow": Metric("slow", 1.0),
+        "fast": Metric("fast", 100.0, "ticks/s", True),
+        "fine": Metric("fine", 1.0),
+    }
+    current = [
+        Metric("slow", 1.5),
+        Metric("fast", 50.0, "ticks/s", True),
+        Metric("fine", 1.1),
+        Metric("new", 3.0),
+    ]
+    results = {r.name: r for r in compare(baseline, current, threshold=0.2)}
+    assert set(results) == {"slow", "fast", "fine"}
+    assert results["slow"].regressed
+    assert results["fast"].change == pytest.approx(1.0)
+    assert results["fast"].regressed
+    assert not results["fine"].regressed
+    assert "REGRESSED" in format_comparison(results["slow"])
+    assert "ok" in format_comparison(results["fine"])
+
+
+def test_format_metric_scales_units():
+    assert format_metric(Metric("t", 5e-9)).endswith("ns")
+    assert format_metric(Metric("t", 5e-6)).endswith("us")
+    assert format_metric(Metric("t", 5e-3)).endswith("ms")
+    assert format_metric(Metric("t", 5.0)).endswith(" s")
+    assert format_metric(Metric("t", 5.0, "ticks/s", True)).endswith("ticks/s")
+
+
+def test_main_run_then_compare(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    argv = ["--suite", "textual", "--match", "render_status", "--quick"]
+    assert main(["run", *argv, "--baseline", str(baseline)]) == 0
+    assert set(load_baseline(baseline)) == {"textual.render_status"}
+    assert (
+        main(["compare", *argv, "--baseline", str(baseline), "--threshold", "100"]) == 0
+    )
+    assert "textual.render_status" in capsys.readouterr().out
+
+    save_baseline([Metric("textual.render_status", 1e-12)], baseline)
+    assert main(["compare", *argv, "--baseline", str(baseline)]) == 1
+
+
+def test_alloc_suite_reports_retained_memory():
+    metrics = {m.name: m for m in bench_alloc.collect(quick=True)}
+    assert metrics["alloc.step/20x20/bytes"].unit == "B"
+    assert metrics["alloc.step/20x20/blocks"].value > 0
+    assert metrics["alloc.set_direction/20x20/blocks"].value < 1
+
+
+def test_cycle_moves_follow_the_cycle():
+    game, turns = game_on_cycle(6, 6, 20)
+    result = game.step_many(cycle_moves(turns, game.state.head, 100))
+    assert (result.ticks, result.game_over) == (100, False)
@@ -0,0 +1,298 @@
+from random import Random
+
+import pytest
+
+from snake_game.controllers import (
+    DIRECTIONS,
+    UNREACHABLE,
+    AutopilotController,
+    GreedyController,
+    HamiltonianController,
+    RandomController,
+    ScriptedController,
+    parse_script,
+)
+from snake_game.core import (
+    DOWN,
+    LEFT,
+    NO_FOOD,
+    RIGHT,
+    UP,
+    Game,
+    WraparoundMovementStrategy,
+)
+from snake_game.hamiltonian import CycleCache
+
+
+def test_random_controller_is_seeded():
+    game = Game(width=10, height=10, seed=1)
+    picks = RandomController(7)
+    again = RandomController(7)
+    sequence = [picks.choose(game) for _ in range(20)]
+    assert sequence == [again.choose(game) for _ in range(20)]
+    assert set(sequence) <= set(DIRECTIONS)
+
+
+def test_greedy_moves_toward_food(set_state):
+    game = Game(width=10, height=10, seed=1)
+    set_state(game, snake=((5, 5), (4, 5), (3, 5)), direction=RIGHT, food=(5, 1))
+    assert GreedyController().choose(game) == UP
+
+
+def test_greedy_avoids_walls_and_body(set_state):
+    game = Game(width=10, height=10, seed=1)
+    set_state(
+        game,
+        snake=((9, 0), (8, 0), (8, 1), (9, 1), (9, 2)),
+        direction=RIGHT,
+        food=(0, 9),
+    )
+    assert GreedyController().choose(game) is None
+
+
+def test_greedy_uses_wraparound_distance(set_state):
+    game = Game(width=10, height=10, seed=1)
+    set_state(game, snake=((9, 5), (8, 5), (7, 5)), direction=RIGHT, food=(1, 5))
+    assert GreedyController(wrap=True).choose(game) == RIGHT
+    assert GreedyController(wrap=False).choose(game) in (UP, DOWN)
+
+
+def fresh_field(game, wrap=False):
+    controller = AutopilotController(wrap=wrap)
+    controller.choose(game)
+    return controller._distance
+
+
+def test_autopilot_takes_the_shortest_path_around_the_body(set_state):
+    game = Game(width=10, height=10, seed=1)
+    # The body walls off the direct route to the food; the way round is below.
+    body = ((4, 3), (5, 3), (5, 2), (5, 1), (5, 0))
+    set_state(game, snake=body, direction=LEFT, food=(6, 1))
+    assert GreedyController().choose(game) == UP
+    assert AutopilotController().choose(game) == DOWN
+
+
+def test_autopilot_respects_walls_or_wraparound(set_state):
+    game = Game(width=10, height=10, seed=1)
+    set_state(game, snake=((9, 5), (8, 5), (7, 5)), direction=RIGHT, food=(1, 5))
+    assert AutopilotController(wrap=True).choose(game) == RIGHT
+    assert AutopilotController(wrap=False).choose(game) in (UP, DOWN)
+
+
+def test_autopilot_gives_up_only_without_a_safe_move(set_state):
+    game = Game(width=10, height=10, seed=1)
+    set_state(
+        game,
+        snake=((9, 0), (8, 0), (8, 1), (9, 1), (9, 2)),
+        direction=RIGHT,
+        food=(0, 9),
+    )
+    assert AutopilotController().choose(game) is None
+    # Enclosed away from the food, it still moves into its own tail.
+    set_state(game, snake=((9, 0), (8, 0), (8, 1), (9, 1)), direction=RIGHT)
+    controller = AutopilotController()
+    assert controller.choose(game) == DOWN
+    assert controller._distance[9] == UNREACHABLE
+    set_state(game, food=NO_FOOD)
+    assert controller.choose(game) == DOWN
+    set_state(game, alive=False)
+    assert controller.choose(game) is None
+
+
+def test_autopilot_builds_the_field_once_per_food(monkeypatch):
+    game = Game(width=12, height=12, seed=2, strategy=WraparoundMovementStrategy())
+    controller = AutopilotController(wrap=True)
+    rebuilds = []
+    rebuild = controller._rebuild
+    monkeypatch.setattr(
+        controller, "_rebuild", lambda *args: rebuilds.append(1) or rebuild(*args)
+    )
+    ticks = 0
+    while game.state.score < 10:
+        game.set_direction(controller.choose(game))
+        controller.advance(game.step())
+        ticks += 1
+        assert game.state.alive
+    assert len(rebuilds) == 10
+    assert ticks > 30
+    controller.choose(game)
+    assert len(rebuilds) == 11
+    assert controller._distance == fresh_field(game, wrap=True)
+
+
+def test_autopilot_patches_match_a_fresh_field():
+    moves = Random(0)
+    for seed in range(4):
+        game = Game(width=9, height=8, seed=seed)
+        controller = AutopilotController()
+        while game.state.alive:
+            direction = controller.choose(game)
+            assert controller._distance == fresh_field(game)
+            if moves.random() < 0.2:
+                direction = moves.choice(DIRECTIONS)
+            if direction is not None:
+                game.set_direction(direction)
+            controller.advance(game.step())
+
+
+def test_autopilot_rebuilds_after_skipped_ticks_and_into_its_tail(set_state):
+    game = Game(width=10, height=10, seed=1)
+    controller = AutopilotController()
+    controller.choose(game)
+    controller.choose(game)
+    game.step_many(2)
+    controller.choose(game)
+    assert controller._distance == fresh_field(game)
+
+    set_state(
+        game,
+        snake=((1, 1), (1, 2), (0, 2), (0, 1)),
+        direction=UP,
+        food=(6, 6),
+    )
+    controller.choose(game)
+    game.set_direction(LEFT)
+    controller.advance(game.step())
+    assert game.state.head == (0, 1)
+    controller.choose(game)
+    assert controller._distance == fresh_field(game)
+
+
+def test_autopilot_rebuilds_for_states_that_are_not_a_reported_step(
+    set_state, monkeypatch
+):
+    game = Game(width=20, height=20, seed=0)
+    controller = AutopilotController()
+    rebuilds = []
+    rebuild = controller._rebuild
+    monkeypatch.setattr(
+        controller, "_rebuild", lambda *args: rebuilds.append(1) or rebuild(*args)
+    )
+    # The starting body ((10, 10), (9, 10), (8, 10)) is one move on from this
+    # one at both ends.
+    set_state(game, snake=((9, 10), (9, 11), (8, 11)), direction=UP, food=(0, 0))
+    controller.choose(game)
+    controller.advance(game.step())
+    game.reset(0)
+    set_state(game, food=(0, 0))
+    controller.choose(game)
+    assert controller._distance == fresh_field(game)
+    assert len(rebuilds) == 2
+
+    # An unreported step, then a reported one from the state it left.
+    controller.advance(game.step())
+    controller.choose(game)
+    game.step()
+    controller.advance(game.step())
+    controller.choose(game)
+    assert controller._distance == fresh_field(game)
+    assert len(rebuilds) == 3
+
+    # A reported step, then a restore before the next decision.
+    controller.advance(game.step())
+    game.restore(Game(width=20, height=20, seed=0).state)
+    set_state(game, food=(0, 0))
+    controller.choose(game)
+    assert controller._distance == fresh_field(game)
+    assert len(rebuilds) == 4
+
+
+@pytest.fixture
+def cycles(tmp_path):
+    return CycleCache(tmp_path)
+
+
+@pytest.mark.parametrize(("width", "height", "wrap"), [(8, 6, False), (7, 7, True)])
+def test_hamiltonian_plays_perfect_games(cycles, width, height, wrap):
+    strategy = WraparoundMovementStrategy() if wrap else None
+    game = Game(width=width, height=height, seed=3, strategy=strategy)
+    controller = HamiltonianController(wrap=wrap, cache=cycles)
+    for _ in range(width * height * width * height):
+        game.set_direction(controller.choose(game))
+        assert not game.step().game_over
+        if game.state.food == NO_FOOD:
+            break
+    assert len(game.state.snake) == width * height
+
+
+def test_hamiltonian_shortcuts_only_while_short(cycles, set_state):
+    game = Game(width=8, height=8, seed=1)
+    # Serpentine rows: row 2 runs left to right, so the food is 5 cells ahead along
+    # the cycle but 1 step below on the board.
+    set_state(game, snake=((3, 2), (2, 2), (1, 2)), direction=RIGHT, food=(3, 3))
+    assert HamiltonianController(cache=cycles).choose(game) == DOWN
+    patient = HamiltonianController(cache=cycles, shortcut_fill=0)
+    assert patient.choose(game) == RIGHT
+    # Never past the food, and never onto or behind the tail.
+    set_state(game, food=(4, 2))
+    assert HamiltonianController(cache=cycles).choose(game) == RIGHT
+    set_state(game, snake=((3, 2), (2, 2), (1, 2), (1, 3), (2, 3), (3, 3), (4, 3)))
+    set_state(game, food=(3, 4))
+    assert HamiltonianController(cache=cycles).choose(game) == RIGHT
+
+
+def test_hamiltonian_rejoins_the_cycle_after_outside_moves(cycles, set_state):
+    game = Game(width=8, height=8, seed=1)
+    controller = HamiltonianController(cache=cycles)
+    # Row 3 runs right to left, against the snake's heading; row 4 runs left to
+    # right, so stepping down rejoins the cycle a few cells ahead.
+    set_state(game, snake=((4, 3), (3, 3), (2, 3)), direction=RIGHT, food=(6, 6))
+    assert controller.choose(game) == DOWN
+    assert not controller._ordered
+    for _ in range(64):
+        game.set_direction(controller.choose(game))
+        game.step()
+        if controller._ordered:
+            break
+    assert controller._ordered
+    set_state(game, snake=((4, 3), (3, 3), (2, 3)), direction=RIGHT)
+    controller.choose(game)
+    assert not controller._ordered
+
+    set_state(game, snake=((0, 0), (1, 0), (1, 1), (0, 1), (0, 2)), direction=LEFT)
+    assert controller.choose(game) is None
+    set_state(game, alive=False)
+    assert controller.choose(game) is None
+
+
+def test_hamiltonian_rechecks_the_order_of_states_it_did_not_lead_to(cycles, set_state):
+    game = Game(width=8, height=8, seed=1)
+    controller = HamiltonianController(cache=cycles)
+    set_state(game, snake=((3, 2), (2, 2), (1, 2)), direction=RIGHT, food=(6, 6))
+    assert controller.choose(game) == DOWN
+    assert controller._ordered
+    # Restores onto the cell the snake was at, or was about to move to, with a
+    # body running against the cycle along row 3.
+    set_state(game, snake=((3, 3), (2, 3), (1, 3)), direction=RIGHT)
+    controller.choose(game)
+    assert not controller._ordered
+    set_state(game, snake=((3, 2), (2, 2), (1, 2)), direction=RIGHT)
+    controller.choose(game)
+    assert controller._ordered
+    set_state(game, snake=((3, 2), (3, 3), (2, 3)), direction=UP)
+    controller.choose(game)
+    assert not controller._ordered
+    set_state(game, snake=((3, 2),), direction=RIGHT)
+    game.set_direction(controller.choose(game))
+    head_x, head_y = game.step().state.head
+    assert head_y * 8 + head_x == controller._target
+    assert controller._continues(controller._target, controller._target, 1)
+
+
+def test_scripted_controller_replays_then_keeps_heading():
+    game = Game(width=10, height=10, seed=1)
+    controller = ScriptedController([UP, None, LEFT])
+    assert [controller.choose(game) for _ in range(5)] == [UP, None, LEFT, None, None]
+
+
+def test_scripted_controller_from_file(tmp_path):
+    path = tmp_path / "moves.txt"
+    path.write_text("u . # comment\nL r\n")
+    controller = ScriptedController.from_file(path)
+    game = Game(width=10, height=10, seed=1)
+    assert [controller.choose(game) for _ in range(4)] == [UP, None, LEFT, RIGHT]
+
+
+def test_parse_script_rejects_unknown_tokens():
+    with pytest.raises(ValueError, match="Unknown script token"):
+        parse_script("U X")
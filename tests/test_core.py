@@ -1,21 +1,30 @@
 import importlib
+from dataclasses import FrozenInstanceError, replace
+from random import Random
 
 import pytest
 
+from snake_game.controllers import GreedyController
 from snake_game.core import (
     DOWN,
     EVENT_GAME_OVER,
     EVENT_RESET,
     EVENT_STEP,
     LEFT,
+    NO_FOOD,
     RIGHT,
     UP,
+    WALL,
     Game,
     GameFactory,
-    GameState,
+    MultiStepResult,
+    SnakeBody,
     StandardMovementStrategy,
+    StepDelta,
+    StepResult,
     WraparoundGameFactory,
     WraparoundMovementStrategy,
+    _FreeCells,
 )
 
 
@@ -89,15 +98,16 @@ def test_hits_wall_boundaries():
 
 def test_next_head_math():
     state = Game(width=5, height=5, seed=1).state
-    state = GameState(**{**state.__dict__, "direction": UP})
+    state = replace(state, direction=UP)
     expected = (state.head[0], state.head[1] - 1)
     assert StandardMovementStrategy().next_head(state) == expected
 
 
-def test_place_food_full_grid_returns_sentinel():
+def test_place_food_full_grid_returns_sentinel(set_state):
     game = Game(width=5, height=5, seed=1)
     snake = [(x, y) for y in range(game.state.height) for x in range(game.state.width)]
-    assert game._place_food(snake) == (-1, -1)
+    set_state(game, snake=tuple(snake))
+    assert game._place_food() == WALL
 
 
 def test_growth_repositions_food_away_from_snake(set_state):
@@ -244,6 +254,80 @@ def test_observer_duplicate_add_not_notified_twice(event_log, observer_from_log)
     assert event_log == [EVENT_STEP]
 
 
+def test_observer_can_subscribe_to_specific_events(event_log, observer_from_log):
+    game = Game(width=6, height=6, seed=1)
+    game.add_observer(observer_from_log(event_log), events=[EVENT_GAME_OVER])
+    for _ in range(10):
+        game.step()
+    game.reset()
+
+    assert event_log == [EVENT_GAME_OVER]
+    with pytest.raises(ValueError, match="Unknown event"):
+        game.add_observer(observer_from_log([]), events=["tick"])
+
+
+def test_coalesced_observer_gets_every_nth_step_with_latest_state():
+    game = Game(width=20, height=6, seed=1)
+    heads = []
+
+    class Recorder:
+        def on_state_change(self, state, event):
+            heads.append((event, state.head))
+
+    recorder = Recorder()
+    game.add_observer(recorder, every=3)
+    for _ in range(7):
+        game.step()
+    game.reset()
+
+    start_x = game.state.head[0]
+    assert heads == [
+        (EVENT_STEP, (start_x + 3, 3)),
+        (EVENT_STEP, (start_x + 6, 3)),
+        (EVENT_RESET, (start_x, 3)),
+    ]
+    [stats] = game.observer_stats()
+    assert (stats.observer, stats.calls, stats.coalesced) == (recorder, 3, 5)
+    assert stats.seconds >= 0
+
+
+def test_interval_coalescing_uses_wall_clock(monkeypatch, event_log, observer_from_log):
+    now = [100.0]
+    monkeypatch.setattr("snake_game.core.perf_counter", lambda: now[0])
+    game = Game(width=20, height=6, seed=1)
+    game.add_observer(observer_from_log(event_log), interval=0.5)
+    for _ in range(4):
+        game.step()
+        now[0] += 0.2
+
+    assert event_log == [EVENT_STEP, EVENT_STEP]
+    assert game.observer_stats()[0].coalesced == 2
+
+
+def test_add_observer_validates_coalescing(observer_from_log):
+    game = Game(width=6, height=6, seed=1)
+    with pytest.raises(ValueError, match="every"):
+        game.add_observer(observer_from_log([]), every=0)
+    with pytest.raises(ValueError, match="interval"):
+        game.add_observer(observer_from_log([]), interval=0)
+    assert game.observer_stats() == []
+
+
+def test_observer_added_during_dispatch_sees_next_event(event_log, observer_from_log):
+    game = Game(width=20, height=6, seed=1)
+    late = observer_from_log(event_log)
+
+    class Subscriber:
+        def on_state_change(self, state, event):
+            game.add_observer(late)
+
+    game.add_observer(Subscriber())
+    game.step()
+    assert event_log == []
+    game.step()
+    assert event_log == [EVENT_STEP]
+
+
 def test_factories_accept_tick_interval():
     game = GameFactory().create(width=5, height=5, seed=1, tick_interval=0.1)
     assert game.state.width == 5
@@ -274,3 +358,531 @@ def test_add_observer_ignores_duplicates():
     observer = Observer()
     game.add_observer(observer)
     game.add_observer(observer)
+
+
+def test_moving_into_vacated_tail_cell_is_allowed(set_state):
+    game = Game(width=6, height=6, seed=1)
+    set_state(
+        game,
+        snake=((2, 2), (2, 3), (3, 3), (3, 2)),
+        direction=RIGHT,
+        food=(0, 0),
+    )
+    result = game.step()
+    assert result.game_over is False
+    assert game.state.head == (3, 2)
+
+
+def test_occupancy_index_tracks_snake(set_state):
+    game = Game(width=8, height=8, seed=3)
+
+    def occupied_cells():
+        return {divmod(cell, 8)[::-1] for cell, bit in enumerate(game._occupied) if bit}
+
+    assert occupied_cells() == set(game.state.snake)
+    head_x, head_y = game.state.head
+    set_state(game, food=(head_x + 1, head_y), direction=RIGHT)
+    game.step()
+    game.set_direction(DOWN)
+    game.step()
+    assert occupied_cells() == set(game.state.snake)
+
+
+def test_state_snake_is_a_view_of_the_shared_trail():
+    game = Game(width=8, height=8, seed=1)
+    game.step()
+    state = game.state
+    snake = state.snake
+    assert isinstance(snake, SnakeBody)
+    assert snake == ((5, 4), (4, 4), (3, 4))
+    assert replace(state, snake=tuple(snake)) == state
+    assert state.head == snake[0] == (5, 4)
+    assert snake[-1] == (3, 4)
+    assert snake[1:] == ((4, 4), (3, 4))
+    assert list(reversed(snake)) == [(3, 4), (4, 4), (5, 4)]
+    assert (4, 4) in snake
+    assert (0, 0) not in snake
+    assert hash(snake) == hash(tuple(snake))
+    assert repr(snake) == repr(tuple(snake))
+    assert snake != [(5, 4), (4, 4), (3, 4)]
+    with pytest.raises(IndexError):
+        _ = snake[3]
+    with pytest.raises(IndexError):
+        _ = snake[-4]
+
+    game.step()
+    later = game.state.snake
+    assert isinstance(later, SnakeBody)
+    assert later._trail is snake._trail
+    assert later != snake
+    assert snake == SnakeBody(list(snake._cells()), 0, 3, snake._positions)
+    assert snake != SnakeBody(snake._cells()[1:], 0, 2, snake._positions)
+
+
+def test_snapshots_share_body_storage():
+    game = Game(width=400, height=5, seed=1)
+    game._state = replace(game.state, food=(0, 0))
+    history = [game.step().state for _ in range(40)]
+    trails = {id(state.snake._trail) for state in history}
+    assert len(trails) == 1
+    assert len(history[0].snake._trail) == len(history[-1].snake._trail) == 43
+
+
+def test_loading_a_state_copies_its_body():
+    game = Game(width=8, height=8, seed=1)
+    game.step()
+    state = game.state
+    other = Game(width=8, height=8, seed=2)
+    other._state = state
+    assert other._trail is not game._trail
+    other.step()
+    game.set_direction(DOWN)
+    game.step()
+    assert state.snake == ((5, 4), (4, 4), (3, 4))
+    assert other.state.head == (6, 4)
+    assert game.state.head == (5, 5)
+
+
+def test_published_states_survive_later_steps_and_compaction():
+    game = Game(width=400, height=5, seed=1)
+    game._state = replace(game.state, food=(0, 0))
+    history = []
+    for _ in range(150):
+        history.append(game.step().state)
+    assert game._start < 150
+    for tick, state in enumerate(history, start=1):
+        head_x = 200 + tick
+        assert state.head == (head_x, 2)
+        assert state.snake == ((head_x, 2), (head_x - 1, 2), (head_x - 2, 2))
+    assert game.state.snake == history[-1].snake
+
+
+def test_free_cell_index_tracks_complement_of_snake(set_state):
+    game = Game(width=7, height=6, seed=5)
+    all_cells = set(range(7 * 6))
+    head_x, head_y = game.state.head
+    set_state(game, food=(head_x + 1, head_y), direction=RIGHT)
+    for direction in (RIGHT, DOWN, DOWN, LEFT):
+        game.set_direction(direction)
+        game.step()
+        snake_cells = {y * 7 + x for x, y in game.state.snake}
+        assert free_set(game._free) == all_cells - snake_cells
+        assert len(game._free) == len(all_cells - snake_cells)
+
+
+def free_set(free):
+    return {cell for cell in range(free._size) if cell in free}
+
+
+def test_food_is_the_seeded_choice_among_free_cells_in_row_major_order():
+    # The original rule: rng.choice() over the free cells listed row by row.
+    def expected(rng, state):
+        occupied = set(state.snake)
+        free = [(x, y) for y in range(7) for x in range(9) if (x, y) not in occupied]
+        return rng.choice(free)
+
+    apples = 0
+    for seed in range(20):
+        game = Game(width=9, height=7, seed=seed)
+        controller = GreedyController()
+        rng = Random(seed)
+        assert game.state.food == expected(rng, game.state)
+        for _ in range(150):
+            direction = controller.choose(game)
+            if direction is None:
+                break
+            game.set_direction(direction)
+            result = game.step()
+            if result.game_over:
+                break
+            if result.grew:
+                apples += 1
+                assert result.state.food == expected(rng, result.state)
+    assert apples > 100
+
+
+def test_free_cells_add_and_discard_are_idempotent():
+    free = _FreeCells(25, [0])
+    free.add(6)
+    free.discard(0)
+    assert len(free) == 24
+    assert 0 not in free
+    free.add(0)
+    assert 0 in free
+    free.discard(24)
+    assert len(free) == 24
+
+
+def test_free_cells_build_their_index_on_first_read():
+    free = _FreeCells(9, [0, 1])
+    free.add(0)
+    free.discard(4)
+    assert free._tree == []
+    assert 0 in free
+    assert free_set(free) == {0, 2, 3, 5, 6, 7, 8}
+    # The k-th free cell in row-major order, whatever order they were freed in.
+    assert [free.choice(FixedRandom(k)) for k in range(7)] == [0, 2, 3, 5, 6, 7, 8]
+
+    busy = _FreeCells(4, [0])
+    for _ in range(3):
+        busy.discard(1)
+        busy.add(1)
+    assert busy._pending is None
+    assert 1 in busy
+    assert _FreeCells(0, []).copy()._top == 0
+
+
+class FixedRandom(Random):
+    def __init__(self, value):
+        super().__init__(0)
+        self.value = value
+
+    def randrange(self, stop):
+        assert 0 <= self.value < stop
+        return self.value
+
+
+def test_free_cells_copy_is_copy_on_write():
+    free = _FreeCells(9, [0, 1])
+    clone = free.copy()
+    assert clone._tree is free._tree
+    clone.add(0)
+    clone.discard(5)
+    free.discard(2)
+    assert clone._tree is free._tree
+    assert 0 in clone
+    assert 5 not in clone
+    assert len(clone) == 7
+    assert free_set(clone) == {0, 2, 3, 4, 6, 7, 8}
+    assert clone._tree is not free._tree
+    assert len(free) == 6
+    assert free_set(free) == {3, 4, 5, 6, 7, 8}
+    assert clone.copy()._pending == []
+
+    grandchild = free.copy()
+    for _ in range(5):
+        grandchild.add(0)
+        grandchild.discard(0)
+    assert grandchild._pending is None
+    assert 0 not in grandchild
+
+
+def test_food_placement_is_reproducible_per_seed(set_state):
+    def foods(seed):
+        game = Game(width=30, height=30, seed=seed)
+        placed = [game.state.food]
+        for _ in range(5):
+            head_x, head_y = game.state.head
+            set_state(game, food=(head_x + 1, head_y), direction=RIGHT)
+            game.step()
+            placed.append(game.state.food)
+        return placed
+
+    assert foods(11) == foods(11)
+    assert foods(11) != foods(12)
+
+
+@pytest.mark.parametrize(
+    "strategy", [StandardMovementStrategy(), WraparoundMovementStrategy()]
+)
+def test_neighbor_tables_match_next_head(strategy):
+    width, height = 6, 5
+    table = strategy.neighbor_table(width, height)
+    assert strategy.neighbor_table(width, height) is table
+    base = Game(width=width, height=height, seed=1).state
+    for direction in (UP, DOWN, LEFT, RIGHT):
+        for y in range(height):
+            for x in range(width):
+                state = replace(base, snake=((x, y),), direction=direction)
+                nx, ny = strategy.next_head(state)
+                in_bounds = 0 <= nx < width and 0 <= ny < height
+                expected = ny * width + nx if in_bounds else WALL
+                assert table[direction][y * width + x] == expected
+
+
+def test_custom_strategy_without_table_uses_next_head():
+    class WallStrategy:
+        def next_head(self, state):
+            return state.width, 0
+
+    game = Game(width=5, height=5, seed=1, strategy=WallStrategy())
+    assert game.step().game_over is True
+
+
+def test_state_classes_are_slotted():
+    state = Game(width=8, height=8, seed=1).state
+    assert not hasattr(state, "__dict__")
+    assert not hasattr(StepResult(state, grew=False, game_over=False), "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        state.score = 3  # type: ignore[misc]
+
+
+def occupied_cells(game):
+    overlay = game._overlay or {}
+    width = game.state.width
+    return {
+        (cell % width, cell // width)
+        for cell, bit in enumerate(game._occupied)
+        if overlay.get(cell, bit)
+    }
+
+
+def test_fork_shares_structure_after_a_move(set_state, event_log, observer_from_log):
+    game = Game(width=10, height=10, seed=3)
+    game.add_observer(observer_from_log(event_log))
+    occupied = game._occupied
+    child = game.fork()
+    assert child._base is game._trail
+    assert child._trail == [55]
+    assert child._occupied is occupied
+    assert child.state == game.state
+
+    child.set_direction(DOWN)
+    child.step()
+    assert child._base is game._trail == [53, 54, 55]
+    assert child._occupied is occupied
+    assert child._overlay == {53: 0, 65: 1}
+    assert event_log == []
+    assert game.state.head == (5, 5)
+    assert child.state.snake == ((5, 6), (5, 5), (4, 5))
+
+    game.step()
+    assert game._occupied is occupied
+    assert game._overlay == {53: 0, 56: 1}
+    assert bytes(occupied).count(1) == 3
+    assert game.state.head == (6, 5)
+    assert child.state.head == (5, 6)
+    assert occupied_cells(game) == set(game.state.snake)
+    assert occupied_cells(child) == set(child.state.snake)
+    assert event_log == [EVENT_STEP]
+
+
+def test_fork_body_reaches_into_the_parent_trail():
+    game = Game(width=10, height=10, seed=3)
+    child = game.fork()
+    child.step()
+    snake = child.state.snake
+    assert isinstance(snake, SnakeBody)
+    assert snake._start == -1
+    assert snake == ((6, 5), (5, 5), (4, 5))
+    assert (snake[0], snake[1], snake[-1]) == ((6, 5), (5, 5), (4, 5))
+    assert snake._cells() == [54, 55, 56]
+    child.step()
+    assert child._start == 0
+    assert child._base == ()
+    assert child.state.snake._cells() == [55, 56, 57]
+    assert snake._cells() == [54, 55, 56]
+
+
+def test_fork_of_a_fork_reads_one_trail(set_state):
+    game = Game(width=10, height=10, seed=3)
+    child = game.fork()
+    unmoved = child.fork()
+    assert unmoved._base is game._trail
+    assert unmoved._start == child._start == -2
+    child.step()
+    grandchild = child.fork()
+    assert child._trail == [54, 55, 56]
+    assert child._base == ()
+    assert grandchild._base is child._trail
+    assert grandchild._overlay == child._overlay == {53: 0, 56: 1}
+    assert grandchild._overlay is not child._overlay
+    grandchild.set_direction(DOWN)
+    grandchild.step()
+    unmoved.set_direction(UP)
+    unmoved.step()
+    assert grandchild.state.snake == ((6, 6), (6, 5), (5, 5))
+    assert unmoved.state.snake == ((5, 4), (5, 5), (4, 5))
+    assert child.state.snake == ((6, 5), (5, 5), (4, 5))
+    for branch in (game, child, grandchild, unmoved):
+        assert occupied_cells(branch) == set(branch.state.snake)
+
+
+def test_forks_fold_their_overlay_back_into_a_private_map():
+    game = Game(width=6, height=6, seed=4, strategy=WraparoundMovementStrategy())
+    occupied = game._occupied
+    child = game.fork()
+    for _ in range(7):
+        child.set_direction(DOWN)
+        child.step()
+    assert child._overlay is None
+    assert child._occupied is not occupied
+    assert occupied_cells(child) == set(child.state.snake)
+    assert game._overlay == {}
+    assert occupied_cells(game) == set(game.state.snake)
+    child.step()
+    assert occupied_cells(child) == set(child.state.snake)
+
+
+def test_fork_continues_rng_stream_or_uses_seed(set_state):
+    game = Game(width=30, height=30, seed=9)
+    head_x, head_y = game.state.head
+    set_state(game, food=(head_x + 1, head_y), direction=RIGHT)
+    same = game.fork()
+    seeded = game.fork(seed=1)
+    foods = [g.step().state.food for g in (game, same, seeded)]
+    assert foods[0] == foods[1]
+    assert game._rng.random() == same._rng.random()
+    assert seeded._rng.getstate() != same._rng.getstate()
+
+
+def test_fork_of_loaded_state_is_independent():
+    game = Game(width=8, height=8, seed=1)
+    child = game.fork()
+    child._state = replace(game.state, snake=((2, 2), (1, 2), (0, 2)))
+    assert child._overlay is None
+    assert child._base == ()
+    assert game._overlay == {}
+    child.step()
+    assert game.state.head == (4, 4)
+    assert child.state.head == (3, 2)
+
+
+def test_forks_do_not_disturb_the_parent():
+    strategy = WraparoundMovementStrategy()
+    reference = Game(width=6, height=6, seed=4, strategy=strategy)
+    game = Game(width=6, height=6, seed=4, strategy=strategy)
+    moves = Random(0)
+    for _ in range(200):
+        direction = moves.choice((UP, DOWN, LEFT, RIGHT))
+        for branch in (game.fork(), game.fork(seed=1)):
+            for _ in range(3):
+                branch.set_direction(moves.choice((UP, DOWN, LEFT, RIGHT)))
+                branch.step()
+        expected = (reference.set_direction(direction), reference.step())[1]
+        game.set_direction(direction)
+        assert game.step() == expected
+    assert game.state.score > 0
+
+
+def test_fork_trees_play_like_rebuilt_games():
+    strategy = WraparoundMovementStrategy()
+    games = [Game(width=7, height=7, seed=5, strategy=strategy)]
+    moves = Random(2)
+    for _ in range(300):
+        branch = moves.choice(games).fork()
+        rebuilt = Game.from_state(branch.state, branch.rng_state(), strategy)
+        for _ in range(moves.randrange(1, 12)):
+            direction = moves.choice((UP, DOWN, LEFT, RIGHT))
+            branch.set_direction(direction)
+            rebuilt.set_direction(direction)
+            assert branch.step() == rebuilt.step()
+        assert occupied_cells(branch) == set(branch.state.snake)
+        games.append(branch)
+    assert all(occupied_cells(game) == set(game.state.snake) for game in games)
+
+
+def test_step_deltas_track_the_board_incrementally():
+    game = Game(width=6, height=6, seed=2, strategy=WraparoundMovementStrategy())
+    body = set(game.state.snake)
+    food = game.state.food
+    score = game.state.score
+    moves = Random(1)
+    result = game.step()
+    while not result.game_over:
+        delta = result.delta
+        assert delta is not None
+        assert delta.old_food == food
+        if delta.tail is not None:
+            body.discard(delta.tail)
+        body.add(delta.head)
+        food = delta.food
+        assert delta.score_changed == (result.state.score != score)
+        score = result.state.score
+        assert (body, food) == (set(result.state.snake), result.state.food)
+        assert (delta.tail is None) == result.grew
+        game.set_direction(moves.choice((UP, DOWN, LEFT, RIGHT)))
+        result = game.step()
+    assert score > 0
+    assert result.delta == StepDelta(None, None, food, food, alive_changed=True)
+    assert game.step().delta == StepDelta(None, None, food, food)
+
+
+def test_step_delta_reports_missing_food_when_board_fills(set_state):
+    game = Game(width=5, height=6, seed=1)
+    cycle = [
+        (x, y)
+        for y in range(6)
+        for x in (range(1, 5) if y % 2 == 0 else range(4, 0, -1))
+    ] + [(0, y) for y in range(5, -1, -1)]
+    set_state(game, snake=tuple(reversed(cycle)), direction=UP, food=NO_FOOD)
+    game.set_direction(RIGHT)
+    result = game.step()
+    assert result.delta == StepDelta((1, 0), (1, 0), NO_FOOD, NO_FOOD)
+    assert result.state.alive
+
+
+def test_step_many_matches_single_steps(event_log, observer_from_log):
+    strategy = WraparoundMovementStrategy()
+    reference = Game(width=8, height=8, seed=6, strategy=strategy)
+    game = Game(width=8, height=8, seed=6, strategy=strategy)
+    game.add_observer(observer_from_log(event_log))
+    moves = Random(2)
+    script = [moves.choice((UP, DOWN, LEFT, RIGHT, None)) for _ in range(40)]
+    for direction in script:
+        if direction is not None:
+            reference.set_direction(direction)
+        reference.step()
+
+    result = game.step_many(iter(script))
+    assert result.state == reference.state
+    assert result.game_over is not reference.state.alive
+    assert result.grew == reference.state.score
+    assert len(event_log) == 1
+
+
+def test_step_many_with_count_stops_at_death(event_log, observer_from_log):
+    game = Game(width=10, height=10, seed=1)
+    game.add_observer(observer_from_log(event_log))
+    result = game.step_many(3)
+    assert (result.ticks, result.game_over) == (3, False)
+    assert result.state.head == (8, 5)
+    assert event_log == [EVENT_STEP]
+
+    result = game.step_many(100)
+    assert (result.ticks, result.game_over) == (2, True)
+    assert result.state.head == (9, 5)
+    assert event_log == [EVENT_STEP, EVENT_GAME_OVER]
+
+    assert game.step_many(5) == MultiStepResult(game.state, 0, 0, game_over=True)
+    assert game.step_many(0).ticks == 0
+    assert event_log == [EVENT_STEP, EVENT_GAME_OVER]
+
+
+def test_step_many_counts_food_eaten(set_state):
+    game = Game(width=10, height=10, seed=1)
+    head_x, head_y = game.state.head
+    set_state(game, food=(head_x + 2, head_y), direction=RIGHT)
+    result = game.step_many([None, None, UP])
+    assert (result.ticks, result.grew, result.game_over) == (3, 1, False)
+    assert len(result.state.snake) == 4
+
+
+def test_restored_game_places_the_same_food_as_the_live_one():
+    game = Game(width=12, height=12, seed=3, strategy=WraparoundMovementStrategy())
+    moves = Random(4)
+    for _ in range(60):
+        game.set_direction(moves.choice((UP, LEFT)))
+        game.step()
+    twin = Game(width=12, height=12, seed=99, strategy=WraparoundMovementStrategy())
+    twin.restore(game.state, game.rng_state())
+    assert twin.rng_state() == game.rng_state()
+    assert twin.step_many(100) == game.step_many(100)
+
+
+def test_from_state_loads_without_a_starting_board():
+    game = Game(width=12, height=12, seed=3)
+    for direction in (DOWN, DOWN, LEFT):
+        game.set_direction(direction)
+        game.step()
+    twin = Game.from_state(game.state, game.rng_state())
+    assert twin.state is game.state
+    assert isinstance(twin.strategy, StandardMovementStrategy)
+    assert twin._free._pending == []
+    assert twin.step_many(200) == game.step_many(200)
+
+    wrapped = Game.from_state(game.state, strategy=WraparoundMovementStrategy())
+    assert isinstance(wrapped.strategy, WraparoundMovementStrategy)
+    assert wrapped.state is game.state
+    with pytest.raises(ValueError, match="too small"):
+        Game.from_state(replace(game.state, width=4))
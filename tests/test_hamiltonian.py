@@ -0,0 +1,130 @@
+from pathlib import Path
+
+import pytest
+
+from snake_game import hamiltonian
+from snake_game.hamiltonian import (
+    HEADER,
+    CycleCache,
+    HamiltonianCycle,
+    build_cycle,
+    decode_cycle,
+    encode_cycle,
+)
+
+
+def assert_cycle(cycle):
+    width, height, size = cycle.width, cycle.height, len(cycle)
+    order = [0] * size
+    for cell, rank in enumerate(cycle.rank):
+        order[rank] = cell
+    assert sorted(cycle.rank) == list(range(size))
+    for index in range(size):
+        a, b = order[index], order[(index + 1) % size]
+        dx = abs(a % width - b % width)
+        dy = abs(a // width - b // width)
+        if cycle.wrap:
+            dx = min(dx, width - dx)
+            dy = min(dy, height - dy)
+        assert dx + dy == 1
+
+
+@pytest.mark.parametrize(
+    ("width", "height", "wrap"),
+    [(6, 6, False), (5, 6, False), (6, 5, False), (20, 15, True), (7, 9, True)],
+)
+def test_cycles_visit_every_cell_through_neighbors(width, height, wrap):
+    cycle = build_cycle(width, height, wrap)
+    assert (cycle.width, cycle.height, cycle.wrap) == (width, height, wrap)
+    assert_cycle(cycle)
+
+
+def test_odd_board_with_walls_has_no_cycle():
+    with pytest.raises(ValueError, match="odd-sized board"):
+        build_cycle(7, 9, wrap=False)
+
+
+def test_encoding_is_compact_and_round_trips(monkeypatch):
+    cycle = build_cycle(200, 200, wrap=True)
+    data = encode_cycle(cycle)
+    assert len(data) < len(cycle) // 20
+    assert decode_cycle(data) == cycle
+
+    monkeypatch.setattr(hamiltonian, "_SWAP", True)
+    swapped = encode_cycle(cycle)
+    assert swapped != data
+    assert decode_cycle(swapped) == cycle
+
+
+def test_decoding_rejects_bad_data():
+    data = encode_cycle(build_cycle(6, 6, wrap=False))
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_cycle(data[: HEADER.size - 1])
+    with pytest.raises(ValueError, match="Not a snake cycle"):
+        decode_cycle(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="Corrupt"):
+        decode_cycle(data[:-4])
+    magic, version, wrap, _width, height, crc = HEADER.unpack_from(data)
+    wrong = HEADER.pack(magic, version, wrap, 6, 7, crc) + data[HEADER.size :]
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_cycle(wrong)
+    older = HEADER.pack(magic, 1, wrap, 6, height, crc) + data[HEADER.size :]
+    with pytest.raises(ValueError, match="Not a snake cycle"):
+        decode_cycle(older)
+    # Ranks that are not the ones the header's crc was taken over.
+    other = encode_cycle(HamiltonianCycle(6, 6, False, [0] * 36))
+    with pytest.raises(ValueError, match="Corrupt"):
+        decode_cycle(data[: HEADER.size] + other[HEADER.size :])
+
+
+def test_cache_builds_once_then_reads_from_disk(tmp_path, monkeypatch):
+    cache = CycleCache(tmp_path / "cycles")
+    cycle = cache.load(8, 6, wrap=False)
+    path = cache.path(8, 6, wrap=False)
+    assert path.read_bytes() == encode_cycle(cycle)
+    assert cache.load(8, 6, wrap=False) is cycle
+    assert [p.name for p in path.parent.iterdir()] == ["8x6-walls.cycle"]
+
+    def fail(*_args):
+        raise AssertionError("rebuilt a cached cycle")
+
+    monkeypatch.setattr(hamiltonian, "build_cycle", fail)
+    assert CycleCache(tmp_path / "cycles").load(8, 6, wrap=False) == cycle
+
+
+def test_cache_replaces_unreadable_files(tmp_path):
+    cache = CycleCache(tmp_path)
+    path = cache.path(6, 6, wrap=True)
+    path.write_bytes(b"garbage")
+    cycle = cache.load(6, 6, wrap=True)
+    assert decode_cycle(path.read_bytes()) == cycle
+
+    other = CycleCache(tmp_path)
+    path.write_bytes(encode_cycle(build_cycle(6, 6, wrap=False)))
+    assert other.load(6, 6, wrap=True) == cycle
+    assert decode_cycle(path.read_bytes()).wrap
+
+
+def test_cache_keeps_cycles_in_memory_without_a_writable_directory(
+    tmp_path, monkeypatch
+):
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    cache = CycleCache(blocker / "cycles")
+    cycle = cache.load(6, 6, wrap=False)
+    assert cycle == build_cycle(6, 6, wrap=False)
+    assert cache.load(6, 6, wrap=False) is cycle
+
+    def fail(*_args):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(Path, "replace", fail)
+    cache = CycleCache(tmp_path / "cycles")
+    assert cache.load(6, 6, wrap=True) == build_cycle(6, 6, wrap=True)
+    # The partial file is cleaned up.
+    assert list((tmp_path / "cycles").iterdir()) == []
+
+
+def test_default_cache_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(hamiltonian, "DEFAULT_CACHE_DIR", tmp_path)
+    assert CycleCache().path(5, 6, wrap=True) == tmp_path / "5x6-wrap.cycle"
@@ -0,0 +1,120 @@
+import json
+import runpy
+import sys
+
+import pytest
+
+from snake_game import hamiltonian
+from snake_game.controllers import RandomController
+from snake_game.headless import (
+    Distribution,
+    controller_factory,
+    main,
+    play_game,
+    simulate,
+)
+
+
+def test_distribution_summary():
+    dist = Distribution.of([3, 1, 2, 2, 10])
+    assert (dist.min, dist.max, dist.median) == (1, 10, 2)
+    assert dist.mean == pytest.approx(3.6)
+    assert dist.p90 == 10
+    assert dist.counts == {"1": 1, "2": 2, "3": 1, "10": 1}
+
+
+def test_play_game_respects_tick_cap():
+    outcome = play_game(
+        controller_factory("greedy", wrap=True)(0),
+        width=10,
+        height=10,
+        seed=0,
+        wrap=True,
+        max_ticks=25,
+    )
+    assert outcome.ticks == 25
+    assert outcome.died is False
+
+
+def test_simulate_is_deterministic_per_seed():
+    first = simulate(RandomController, games=5, seed=3, policy="random")
+    second = simulate(RandomController, games=5, seed=3, policy="random")
+    assert first.scores == second.scores
+    assert first.ticks == second.ticks
+    assert first.games == 5
+    assert first.deaths == 5
+    assert first.ticks_per_sec > 0
+    assert first.games_per_sec > 0
+
+
+def test_simulate_requires_games():
+    with pytest.raises(ValueError, match="at least one game"):
+        simulate(RandomController, games=0)
+
+
+def test_main_runs_autopilot_policy(capsys):
+    argv = ["--games", "2", "--policy", "autopilot", "--wrap", "--width", "10"]
+    assert main(argv) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["policy"] == "autopilot"
+    assert report["scores"]["min"] > 5
+
+
+def test_main_runs_hamiltonian_policy(capsys, monkeypatch, tmp_path):
+    monkeypatch.setattr(hamiltonian, "DEFAULT_CACHE_DIR", tmp_path)
+    argv = ["--games", "2", "--policy", "hamiltonian", "--width", "6"]
+    argv += ["--height", "6", "--max-ticks", "5000"]
+    assert main(argv) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["policy"] == "hamiltonian"
+    assert report["scores"]["min"] == 33
+    assert [path.name for path in tmp_path.iterdir()] == ["6x6-walls.cycle"]
+
+
+def test_controller_factory_errors(tmp_path):
+    with pytest.raises(ValueError, match="needs --script"):
+        controller_factory("script", wrap=False)
+    with pytest.raises(ValueError, match="Unknown policy"):
+        controller_factory("psychic", wrap=False)
+
+
+def test_main_prints_json_report(capsys):
+    assert main(["--games", "3", "--policy", "greedy", "--width", "8"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["games"] == 3
+    assert report["policy"] == "greedy"
+    assert report["width"] == 8
+    assert set(report["scores"]) >= {"min", "max", "mean", "median", "p90"}
+
+
+def test_main_writes_output_file_for_script_policy(tmp_path):
+    script = tmp_path / "moves.txt"
+    script.write_text("U U L L D D R R\n")
+    output = tmp_path / "report.json"
+    argv = ["--games", "2", "--policy", "script", "--script", str(script)]
+    assert main([*argv, "--wrap", "--max-ticks", "40", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["wrap"] is True
+    assert report["ticks"] <= 80
+
+
+def test_main_reports_bad_arguments(capsys):
+    with pytest.raises(SystemExit):
+        main(["--width", "3"])
+    assert "Grid too small" in capsys.readouterr().err
+
+
+def test_main_reports_a_missing_script(capsys, tmp_path):
+    missing = tmp_path / "missing.txt"
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--policy", "script", "--script", str(missing)])
+    assert exit_info.value.code == 2
+    assert "No such file" in capsys.readouterr().err
+
+
+def test_module_entry_point(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["snake_game", "--games", "1"])
+    with pytest.raises(SystemExit) as exit_info:
+        runpy.run_module("snake_game", run_name="__main__")
+    assert exit_info.value.code == 0
+    assert json.loads(capsys.readouterr().out)["games"] == 1
@@ -1,20 +1,30 @@
+from dataclasses import replace
+from random import Random
 from types import SimpleNamespace
 
 import pytest
-from test_support import FakeGame
+from test_support import FakeGame, make_factory_class
 
 import snake_game.pygame_ui as ui
-from snake_game.core import GameState
+from snake_game.controllers import DIRECTIONS, GreedyController
+from snake_game.core import Game, WraparoundMovementStrategy
 from snake_game.settings import Settings, SettingsStore, SpeedPreset
 
 
 class FakeSurface:
     def __init__(self):
         self.fill_calls = []
+        self.blit_calls = []
 
     def fill(self, color):
         self.fill_calls.append(color)
 
+    def blit(self, source, dest, area=None):
+        self.blit_calls.append((source, dest, area))
+
+    def get_size(self):
+        return (96, 188)
+
 
 class FakeRect:
     def __init__(self, x, y, w, h):
@@ -25,7 +35,7 @@ class FakeClock:
     def __init__(self, dt=1.0):
         self._dt = dt
 
-    def tick(self, _fps):
+    def tick(self, _fps=0):
         return int(self._dt * 1000)
 
 
@@ -48,6 +58,14 @@ class DyingGame(FakeGame):
         return SR(self._state, grew=False, game_over=True)
 
 
+@pytest.fixture(autouse=True)
+def fresh_static_layers():
+    # Layers drawn through a patched pygame.draw must not leak into other tests.
+    ui._static_layer.cache_clear()
+    yield
+    ui._static_layer.cache_clear()
+
+
 def _event(key, type_=None):
     if type_ is None:
         type_ = ui.pygame.KEYDOWN
@@ -71,6 +89,10 @@ def patch_main_monkeypatch(monkeypatch, surface, fake_clock_dt=0.0):
     monkeypatch.setattr(ui, "_render_options", lambda *_a, **_kw: None)
     monkeypatch.setattr(ui, "_render_playing", lambda *_a, **_kw: None)
     monkeypatch.setattr(ui, "_render_game_over", lambda *_a, **_kw: None)
+    # Idle waits time out at once; tests script events through event.get().
+    monkeypatch.setattr(
+        ui.pygame.event, "wait", lambda *_: _event(None, ui.pygame.NOEVENT)
+    )
 
 
 def test_run_calls_init_and_quit(monkeypatch):
@@ -164,6 +186,7 @@ def test_menu_navigate_up_then_start(monkeypatch, fake_game_factory, factory_for
                 [_event(ui.pygame.K_DOWN)],
                 [_event(ui.pygame.K_UP)],
                 [_event(ui.pygame.K_RETURN)],
+                [],
                 [_event(ui.pygame.K_ESCAPE)],
             ]
         ),
@@ -392,6 +415,37 @@ def test_playing_keys_then_escape(monkeypatch, fake_game_factory, factory_for_ga
     assert fake_game.reset_calls == 1
 
 
+def test_playing_autopilot_toggle(monkeypatch, fake_game_factory, factory_for_game):
+    fake_game = fake_game_factory()
+    surface = FakeSurface()
+    monkeypatch.setattr(ui, "GameFactory", factory_for_game(fake_game))
+    monkeypatch.setattr(ui, "WraparoundGameFactory", factory_for_game(fake_game))
+    patch_main_monkeypatch(monkeypatch, surface)
+    autopilot_flags = []
+    monkeypatch.setattr(
+        ui,
+        "_render_playing",
+        lambda *args: autopilot_flags.append(args[6]),
+    )
+    monkeypatch.setattr(
+        ui.pygame.event,
+        "get",
+        make_event_generator(
+            [
+                [_event(ui.pygame.K_RETURN)],
+                [_event(ui.pygame.K_t)],
+                [_event(ui.pygame.K_t)],
+            ]
+        ),
+    )
+    monkeypatch.setattr(ui.pygame.time, "Clock", lambda: FakeClock())
+
+    ui._main(FakeSettingsStore())
+    assert fake_game.set_direction_calls == [ui.RIGHT]
+    assert True in autopilot_flags
+    assert autopilot_flags[-1] is False
+
+
 def test_playing_escape_returns_to_menu(
     monkeypatch, fake_game_factory, factory_for_game
 ):
@@ -523,9 +577,7 @@ def test_render_playing_status_and_food(monkeypatch):
     monkeypatch.setattr(ui, "_draw_text", fake_draw_text)
 
     game = FakeGame(snake=((2, 2),))
-    game._state = GameState(
-        **{**game.state.__dict__, "food": (4, 4), "score": 3, "alive": True}
-    )
+    game._state = replace(game.state, food=(4, 4), score=3, alive=True)
     ui._render_playing(
         surface, game, paused=True, wraparound_enabled=True, grid_w=56, grid_h=56
     )
@@ -533,11 +585,15 @@ def test_render_playing_status_and_food(monkeypatch):
     assert any("PAUSED" in text for text in drawn_text)
     assert any("Wrap: ON" in text for text in drawn_text)
     assert any("Esc menu" in text for text in drawn_text)
+
+    drawn_text.clear()
+    ui._render_playing(surface, game, False, False, 56, 56, autopilot=True)
+    assert any("AUTO" in text for text in drawn_text)
     assert any(color == ui.COLOR_FOOD for color, _width in rect_calls)
 
     rect_calls.clear()
     drawn_text.clear()
-    game._state = GameState(**{**game.state.__dict__, "food": (4, 4), "alive": False})
+    game._state = replace(game.state, food=(4, 4), alive=False)
     ui._render_playing(
         surface, game, paused=False, wraparound_enabled=False, grid_w=56, grid_h=56
     )
@@ -557,7 +613,7 @@ def test_render_game_over(monkeypatch):
     monkeypatch.setattr(ui, "_draw_bitmap_text", fake_bitmap)
 
     game = FakeGame(snake=((2, 2),))
-    game._state = GameState(**{**game.state.__dict__, "alive": False, "score": 7})
+    game._state = replace(game.state, alive=False, score=7)
     ui._render_game_over(surface, game, grid_w=56, grid_h=56)
     assert any("GAME OVER" in t for t in drawn_texts)
     assert any("Score: 7" in t for t in drawn_texts)
@@ -576,17 +632,36 @@ def test_draw_text_uses_bitmap(monkeypatch):
     assert calls == [("HI", (2, 3), ui.COLOR_TEXT)]
 
 
-def test_draw_bitmap_text(monkeypatch):
-    rect_calls = []
-
-    def fake_rect(_screen, _color, rect, width=0):
-        rect_calls.append(rect.args)
-
-    monkeypatch.setattr(ui.pygame, "Rect", FakeRect)
-    monkeypatch.setattr(ui.pygame.draw, "rect", fake_rect)
-
-    ui._draw_bitmap_text(FakeSurface(), "A?", (0, 0), ui.COLOR_TEXT)
-    assert rect_calls
+def test_draw_bitmap_text():
+    surface = ui.pygame.Surface((40, 40))
+    surface.fill(ui.COLOR_BG)
+    ui._text_surface.cache_clear()
+    ui._draw_bitmap_text(surface, "a?\n1", (3, 2), ui.COLOR_TEXT)
+    # Every lit font pixel is a 2x2 square; "?" is not in the font and only
+    # advances the cursor.
+    expected = set()
+    for text, origin_y in (("A", 2), ("1", 2 + ui.LINE_HEIGHT)):
+        for y, row in enumerate(ui._BITMAP_FONT[text]):
+            for x, bit in enumerate(row):
+                if bit == "1":
+                    expected.update(
+                        (3 + x * 2 + dx, origin_y + y * 2 + dy)
+                        for dx in (0, 1)
+                        for dy in (0, 1)
+                    )
+    lit = {
+        (x, y)
+        for x in range(40)
+        for y in range(40)
+        if surface.get_at((x, y))[:3] == ui.COLOR_TEXT
+    }
+    assert lit == expected
+    assert surface.get_at((0, 0))[:3] == ui.COLOR_BG
+
+    ui._draw_bitmap_text(surface, "a?\n1", (3, 2), ui.COLOR_TEXT)
+    ui._draw_bitmap_text(surface, "", (0, 0), ui.COLOR_TEXT)
+    info = ui._text_surface.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
 
 
 def test_non_keydown_event_ignored(monkeypatch, fake_game_factory, factory_for_game):
@@ -669,9 +744,285 @@ def test_game_over_key_ignored(monkeypatch, factory_for_game):
         make_event_generator(
             [
                 [_event(ui.pygame.K_RETURN)],
+                [],
                 [_event(ui.pygame.K_p)],
             ]
         ),
     )
     monkeypatch.setattr(ui.pygame.time, "Clock", lambda: FakeClock(dt=3.0))
     ui._main(FakeSettingsStore())
+
+
+def screen_for(game):
+    return ui.pygame.Surface(
+        (
+            game.state.width * ui.CELL_SIZE + ui.PADDING * 2,
+            game.state.height * ui.CELL_SIZE + ui.PADDING * 2 + ui.INFO_HEIGHT,
+        )
+    )
+
+
+@pytest.mark.parametrize(("seed", "wrap"), [(1, False), (2, True)])
+def test_incremental_frames_match_full_redraws(monkeypatch, seed, wrap):
+    updates = []
+    monkeypatch.setattr(ui.pygame.display, "update", updates.append)
+    monkeypatch.setattr(ui.pygame.display, "flip", lambda: None)
+    strategy = WraparoundMovementStrategy() if wrap else None
+    game = Game(width=7, height=6, seed=seed, strategy=strategy)
+    grid_w, grid_h = 7 * ui.CELL_SIZE, 6 * ui.CELL_SIZE
+    renderer = ui._PlayingRenderer(grid_w, grid_h)
+    drawn = screen_for(game)
+    # What the display shows: only the rects handed to display.update().
+    shown = screen_for(game)
+    full = screen_for(game)
+    controller = GreedyController(wrap=wrap)
+    moves = Random(seed)
+    small_frames = 0
+    for tick in range(300):
+        paused = tick % 50 < 3
+        ui._render_playing(drawn, game, paused, wrap, grid_w, grid_h, False, renderer)
+        ui._render_playing(full, game, paused, wrap, grid_w, grid_h)
+        rects = updates.pop() if updates else []
+        small_frames += bool(rects) and rects[0].size != drawn.get_size()
+        for rect in rects:
+            shown.blit(drawn, rect, rect)
+        assert ui.pygame.image.tobytes(shown, "RGB") == ui.pygame.image.tobytes(
+            full, "RGB"
+        )
+        if not game.state.alive:
+            game.reset(seed)
+            continue
+        direction = controller.choose(game)
+        if direction is None or moves.random() < 0.2:
+            direction = moves.choice(DIRECTIONS)
+        game.set_direction(direction)
+        if not paused:
+            renderer.advance(game.step())
+    assert small_frames > 200
+
+
+def test_renderer_repaints_only_what_changed(monkeypatch, set_state):
+    updates = []
+    monkeypatch.setattr(ui.pygame.display, "update", updates.append)
+    game = Game(width=8, height=8, seed=0)
+    set_state(game, snake=((3, 3), (2, 3), (1, 3)), direction=ui.RIGHT, food=(4, 3))
+    grid = 8 * ui.CELL_SIZE
+    renderer = ui._PlayingRenderer(grid, grid)
+    screen = screen_for(game)
+    assert ui._render_playing(screen, game, False, False, grid, grid, False, renderer)
+    assert len(updates.pop()) == 1
+    # Nothing changed: nothing to present.
+    assert not ui._render_playing(
+        screen, game, False, False, grid, grid, False, renderer
+    )
+    assert updates == []
+    # Eating: new head, old head, the new food and the score.
+    renderer.advance(game.step())
+    ui._render_playing(screen, game, False, False, grid, grid, False, renderer)
+    assert len(updates.pop()) == 4
+    # A plain move: new head, old head and the vacated tail.
+    renderer.advance(game.step())
+    ui._render_playing(screen, game, False, False, grid, grid, False, renderer)
+    assert [len(rects) for rects in updates] == [3]
+    updates.clear()
+    renderer.invalidate()
+    ui._render_playing(screen, game, False, False, grid, grid, False, renderer)
+    assert updates.pop()[0].size == screen.get_size()
+    # A step the renderer was not told about.
+    game.step()
+    renderer.advance(game.step())
+    ui._render_playing(screen, game, False, False, grid, grid, False, renderer)
+    assert updates.pop()[0].size == screen.get_size()
+
+
+def test_reset_while_playing_repaints_the_whole_board(monkeypatch, set_state):
+    updates = []
+    monkeypatch.setattr(ui.pygame.display, "update", updates.append)
+    monkeypatch.setattr(ui.pygame.display, "flip", lambda: None)
+    game = Game(width=20, height=20, seed=0)
+    # The starting body ((10, 10), (9, 10), (8, 10)) has its neck on this head.
+    set_state(game, snake=((9, 10), (9, 11), (10, 11)), direction=ui.UP, food=(0, 0))
+    grid = 20 * ui.CELL_SIZE
+    renderer = ui._PlayingRenderer(grid, grid)
+    screen = screen_for(game)
+    full = screen_for(game)
+    ui._render_playing(screen, game, False, False, grid, grid, False, renderer)
+    game.reset(0)
+    set_state(game, food=(0, 0))
+    ui._render_playing(screen, game, False, False, grid, grid, False, renderer)
+    ui._render_playing(full, game, False, False, grid, grid)
+    assert updates[-1][0].size == screen.get_size()
+    assert ui.pygame.image.tobytes(screen, "RGB") == ui.pygame.image.tobytes(
+        full, "RGB"
+    )
+
+
+def test_static_layers_are_built_once_per_size(monkeypatch):
+    monkeypatch.setattr(ui.pygame.display, "flip", lambda: None)
+    game = Game(width=7, height=6, seed=0)
+    grid_w, grid_h = 7 * ui.CELL_SIZE, 6 * ui.CELL_SIZE
+    screen = screen_for(game)
+    controls = ui.pygame.Rect(0, ui.PADDING + grid_h + 42, screen.get_width(), 36)
+
+    def controls_lit():
+        return any(
+            screen.get_at((x, y))[:3] == ui.COLOR_TEXT
+            for x in range(controls.left, controls.right)
+            for y in range(controls.top, controls.bottom)
+        )
+
+    for _ in range(3):
+        ui._render_playing(screen, game, False, False, grid_w, grid_h)
+    assert controls_lit()
+    ui._render_game_over(screen, game, grid_w, grid_h)
+    ui._render_game_over(screen, game, grid_w, grid_h)
+    assert not controls_lit()
+    info = ui._static_layer.cache_info()
+    assert (info.hits, info.misses) == (3, 2)
+
+    bigger = Game(width=8, height=6, seed=0)
+    ui._render_playing(
+        screen_for(bigger), bigger, False, False, 8 * ui.CELL_SIZE, grid_h
+    )
+    assert ui._static_layer.cache_info().misses == 3
+
+
+def test_frames_render_only_when_something_changed(
+    monkeypatch, fake_game_factory, factory_for_game
+):
+    fake_game = fake_game_factory(snake=((2, 2),))
+    monkeypatch.setattr(ui, "GameFactory", factory_for_game(fake_game))
+    patch_main_monkeypatch(monkeypatch, FakeSurface())
+    waits = []
+
+    def wait(timeout):
+        waits.append(timeout)
+        return _event(None, ui.pygame.NOEVENT)
+
+    invalidated = []
+    monkeypatch.setattr(ui.pygame.event, "wait", wait)
+    monkeypatch.setattr(
+        ui._PlayingRenderer, "invalidate", lambda self: invalidated.append(self)
+    )
+    monkeypatch.setattr(
+        ui.pygame.event,
+        "get",
+        make_event_generator(
+            [
+                [],
+                [],
+                [_event(ui.pygame.K_DOWN)],
+                [_event(ui.pygame.K_UP)],
+                [_event(ui.pygame.K_RETURN)],
+                [_event(ui.pygame.K_p)],
+                [],
+                [_event(ui.pygame.K_LEFT)],
+                [_event(None, type_=ui.pygame.WINDOWEXPOSED)],
+            ]
+        ),
+    )
+    monkeypatch.setattr(ui.pygame.time, "Clock", lambda: FakeClock(dt=0.05))
+    stats = ui._FrameStats()
+    ui._main(FakeSettingsStore(), stats)
+
+    # Menu: the first frame and one per key. Then the started game and the pause
+    # key; paused, a turn changes nothing on screen but an exposed window does.
+    assert stats.frames == {"MENU": 3, "PLAYING": 1, "PAUSED": 2}
+    assert fake_game.step_calls == 0
+    assert len(invalidated) == 1
+    # Only the running game polls; menus and pauses sleep.
+    assert waits == [ui.IDLE_WAIT_MS] * 9
+    assert stats.seconds["MENU"] == pytest.approx(0.25)
+    assert stats.cpu["MENU"] >= 0
+
+
+def test_game_over_renders_once_and_sleeps_out_the_countdown(
+    monkeypatch, factory_for_game
+):
+    game = DyingGame(snake=((2, 2),))
+    monkeypatch.setattr(ui, "GameFactory", factory_for_game(game))
+    patch_main_monkeypatch(monkeypatch, FakeSurface())
+    waits = []
+
+    def wait(timeout):
+        waits.append(timeout)
+        return _event(None, ui.pygame.NOEVENT)
+
+    monkeypatch.setattr(ui.pygame.event, "wait", wait)
+    frames = [[_event(ui.pygame.K_RETURN)]] + [[]] * 6
+    monkeypatch.setattr(ui.pygame.event, "get", make_event_generator(frames))
+    monkeypatch.setattr(ui.pygame.time, "Clock", lambda: FakeClock(dt=0.5))
+    stats = ui._FrameStats()
+    ui._main(FakeSettingsStore(), stats)
+
+    # The first running iteration takes the fatal step; the menu is drawn again
+    # once the countdown ends.
+    assert stats.frames == {"PLAYING": 1, "GAME_OVER": 1, "MENU": 1}
+    assert waits[1:5] == [2000, 1500, 1000, 500]
+
+
+def test_starting_or_resuming_does_not_count_the_idle_wait(
+    monkeypatch, fake_game_factory, factory_for_game
+):
+    game = fake_game_factory(snake=((2, 2),))
+    monkeypatch.setattr(ui, "GameFactory", factory_for_game(game))
+    patch_main_monkeypatch(monkeypatch, FakeSurface())
+    frames = [
+        [_event(ui.pygame.K_RETURN)],
+        [_event(ui.pygame.K_p)],
+        [],
+        [_event(ui.pygame.K_p)],
+    ]
+    monkeypatch.setattr(ui.pygame.event, "get", make_event_generator(frames))
+    # Every tick reports a long wait, far more than a game tick.
+    monkeypatch.setattr(ui.pygame.time, "Clock", lambda: FakeClock(dt=5.0))
+    ui._main(FakeSettingsStore())
+    # Only the iteration after the resume (ended by the quit) steps.
+    assert game.step_calls == 1
+
+
+def test_wait_events_drains_the_queue(monkeypatch):
+    first = _event(ui.pygame.K_a)
+    rest = [_event(ui.pygame.K_b)]
+    monkeypatch.setattr(ui.pygame.event, "wait", lambda _timeout: first)
+    monkeypatch.setattr(ui.pygame.event, "get", lambda: list(rest))
+    assert ui._wait_events(10) == [first, *rest]
+
+
+def test_each_changed_frame_is_presented_once(monkeypatch, observer_from_log):
+    game = Game(width=20, height=20, seed=0)
+    steps = []
+    game.add_observer(observer_from_log(steps))
+    monkeypatch.setattr(ui, "GameFactory", make_factory_class(game))
+    screen = screen_for(game)
+    monkeypatch.setattr(ui.pygame.display, "set_mode", lambda *_: screen)
+    monkeypatch.setattr(ui.pygame.display, "set_caption", lambda *_: None)
+    monkeypatch.setattr(
+        ui.pygame.event, "wait", lambda *_: _event(None, ui.pygame.NOEVENT)
+    )
+    presents = []
+    monkeypatch.setattr(ui.pygame.display, "flip", lambda: presents.append("flip"))
+    monkeypatch.setattr(ui.pygame.display, "update", presents.append)
+    frames = [
+        [_event(ui.pygame.K_RETURN)],
+        [],
+        [],
+        [_event(ui.pygame.K_UP)],
+        [],
+        [_event(ui.pygame.K_p)],
+        [],
+        [_event(ui.pygame.K_p)],
+        [],
+    ]
+    monkeypatch.setattr(ui.pygame.event, "get", make_event_generator(frames))
+    monkeypatch.setattr(ui.pygame.time, "Clock", lambda: FakeClock(dt=0.2))
+    stats = ui._FrameStats()
+    ui._main(FakeSettingsStore(), stats)
+
+    # A tick per running iteration except those that start or resume the game
+    # (the last one still steps after the quit), and the pause: one frame each,
+    # presented once. The game's own step notifications draw nothing.
+    assert steps == ["step"] * 6
+    assert stats.frames == {"PLAYING": 8, "PAUSED": 1}
+    assert stats.presents == stats.frames
+    assert len(presents) == 9
@@ -0,0 +1,202 @@
+from random import Random
+
+import pytest
+
+from snake_game.controllers import DIRECTIONS, GreedyController
+from snake_game.core import (
+    DOWN,
+    LEFT,
+    RIGHT,
+    UP,
+    Game,
+    WraparoundMovementStrategy,
+)
+from snake_game.reachability import Reachability
+
+
+def flood_sizes(state, wrap):
+    width, height = state.width, state.height
+    body = set(state.snake)
+    sizes = {}
+    for start in ((x, y) for y in range(height) for x in range(width)):
+        if start in body or start in sizes:
+            continue
+        region = [start]
+        seen = {start}
+        for x, y in region:
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if wrap:
+                    nx, ny = nx % width, ny % height
+                elif not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                if (nx, ny) not in body and (nx, ny) not in seen:
+                    seen.add((nx, ny))
+                    region.append((nx, ny))
+        sizes.update(dict.fromkeys(region, len(region)))
+    return sizes
+
+
+def count_relabels(monkeypatch):
+    calls = []
+    relabel = Reachability._relabel
+
+    def counting(self):
+        calls.append(1)
+        relabel(self)
+
+    monkeypatch.setattr(Reachability, "_relabel", counting)
+    return calls
+
+
+@pytest.mark.parametrize(("seed", "wrap"), [(1, False), (2, True), (3, False)])
+def test_region_sizes_match_a_flood_fill_every_tick(seed, wrap):
+    strategy = WraparoundMovementStrategy() if wrap else None
+    game = Game(width=7, height=6, seed=seed, strategy=strategy)
+    reachability = Reachability(wrap=wrap)
+    controller = GreedyController(wrap=wrap)
+    moves = Random(seed)
+    for _ in range(600):
+        state = game.state
+        reachability.update(state)
+        expected = flood_sizes(state, wrap)
+        for y in range(state.height):
+            for x in range(state.width):
+                assert reachability.region_size((x, y)) == expected.get((x, y), 0)
+        direction = controller.choose(game)
+        if direction is None or moves.random() < 0.2:
+            direction = moves.choice(DIRECTIONS)
+        game.set_direction(direction)
+        if game.step().game_over:
+            game.reset(seed)
+
+
+def test_head_splitting_a_region_is_detected(set_state, monkeypatch):
+    relabels = count_relabels(monkeypatch)
+    game = Game(width=5, height=5, seed=0)
+    snake = ((2, 2), (1, 2), (0, 2), (0, 3), (0, 4))
+    set_state(game, snake=snake, direction=RIGHT, food=(4, 4))
+    reachability = Reachability()
+    reachability.update(game.state)
+    assert reachability.region_size((2, 0)) == 20
+    game.step()
+    reachability.update(game.state)
+    assert reachability.region_size((4, 0)) == 20
+    assert len(relabels) == 1
+    # The body now runs across the board and cuts it in two.
+    game.step()
+    reachability.update(game.state)
+    assert reachability.region_size((4, 0)) == 10
+    assert reachability.region_size((0, 4)) == 10
+    assert reachability.connected((0, 0), (4, 1))
+    assert not reachability.connected((0, 0), (4, 4))
+    assert not reachability.connected((4, 2), (4, 4))
+    assert reachability.region_size((4, 2)) == 0
+    assert len(relabels) == 1
+    # One step forward, but the body lost two segments: start over.
+    set_state(game, snake=((4, 3), (4, 2), (3, 2)), direction=DOWN)
+    reachability.update(game.state)
+    assert reachability.connected((0, 0), (4, 4))
+    assert len(relabels) == 2
+
+
+def test_head_cutting_three_ways_searches_only_the_small_regions(
+    set_state, monkeypatch
+):
+    relabels = count_relabels(monkeypatch)
+    game = Game(width=7, height=7, seed=0)
+    body = [(1, 3), (1, 2), (1, 1), (2, 1), (3, 1), (4, 1), (4, 2), (5, 2), (5, 3)]
+    snake = ((2, 3), *body, (5, 4), (4, 4), (4, 5))
+    set_state(game, snake=snake, direction=RIGHT, food=(0, 6))
+    reachability = Reachability()
+    reachability.update(game.state)
+    assert reachability.region_size((3, 3)) == 36
+    game.step()
+    reachability.update(game.state)
+    assert reachability.region_size((3, 2)) == 2
+    assert reachability.region_size((4, 3)) == 1
+    assert reachability.region_size((3, 4)) == 33
+    assert len(relabels) == 1
+
+
+def test_observer_follows_growth_and_fast_forwards(set_state, monkeypatch):
+    relabels = count_relabels(monkeypatch)
+    game = Game(width=8, height=8, seed=0)
+    set_state(game, snake=((3, 3), (2, 3), (1, 3)), direction=RIGHT, food=(4, 3))
+    reachability = Reachability()
+    game.add_observer(reachability)
+    game.step()
+    assert game.state.score == 1
+    assert reachability.region_size((0, 0)) == 60
+    game.set_direction(DOWN)
+    game.step()
+    assert reachability.region_size((0, 0)) == 60
+    assert len(relabels) == 1
+
+    game.step_many([LEFT, LEFT, UP])
+    expected = flood_sizes(game.state, wrap=False)
+    game.step()
+    expected = flood_sizes(game.state, wrap=False)
+    assert reachability.region_size((0, 0)) == expected[(0, 0)]
+    assert len(relabels) == 2
+
+
+def test_reset_and_restore_reload_instead_of_passing_for_a_tick(set_state):
+    # The starting body ((10, 10), (9, 10), (8, 10)) is one move on from this
+    # one at both ends.
+    body = ((9, 10), (9, 11), (8, 11))
+    game = Game(width=20, height=20, seed=0)
+    set_state(game, snake=body, direction=UP, food=(0, 0))
+    reachability = Reachability()
+    game.add_observer(reachability)
+    reachability.update(game.state)
+    game.reset(0)
+    assert reachability.region_size((9, 11)) == 397
+    assert reachability.region_size((8, 10)) == 0
+
+    set_state(game, snake=body, direction=UP, food=(0, 0))
+    reachability.update(game.state)
+    game.restore(Game(width=20, height=20, seed=0).state)
+    reachability.invalidate()
+    reachability.update(game.state)
+    assert reachability.region_size((9, 11)) == 397
+    assert reachability.region_size((8, 10)) == 0
+
+
+def test_dead_nodes_are_compacted(set_state, monkeypatch):
+    relabels = count_relabels(monkeypatch)
+    game = Game(width=6, height=6, seed=0)
+    set_state(game, snake=((2, 0), (1, 0), (0, 0)), direction=RIGHT, food=(3, 3))
+    reachability = Reachability()
+    laps = [RIGHT] * 3 + [DOWN] * 5 + [LEFT] * 5 + [UP] * 5 + [RIGHT] * 2
+    for direction in laps * 3:
+        game.set_direction(direction)
+        game.step()
+        reachability.update(game.state)
+        assert reachability.region_size((3, 3)) == 33
+    assert len(reachability._parent) < 3 * 36
+    assert len(relabels) == 2
+
+
+def test_searches_that_meet_count_as_one_region(set_state, monkeypatch):
+    relabels = count_relabels(monkeypatch)
+    game = Game(width=7, height=7, seed=0)
+    # Only the cells matter here, so the body need not be contiguous.
+    body = ((2, 3), (4, 2), (4, 4), (5, 4), (1, 3), (3, 5), (0, 4))
+    set_state(game, snake=body, food=(0, 0))
+    reachability = Reachability()
+    reachability.update(game.state)
+    assert reachability.region_size((3, 3)) == 42
+    # The searches from above and from the right meet first; the one from below
+    # then runs into cells of the search that stopped.
+    set_state(game, snake=((3, 3), *body))
+    reachability.update(game.state)
+    assert reachability.region_size((3, 2)) == 41
+    assert reachability.connected((4, 3), (3, 4))
+    assert len(relabels) == 1
+
+
+def test_queries_need_a_state():
+    reachability = Reachability()
+    with pytest.raises(RuntimeError, match="has not seen"):
+        reachability.region_size((0, 0))
@@ -0,0 +1,187 @@
+from random import Random
+
+import pytest
+
+from snake_game.core import DOWN, EVENT_STEP, LEFT, RIGHT, UP
+from snake_game.replay import (
+    FOOTER,
+    MAGIC,
+    Replay,
+    ReplayFile,
+    ReplayRecorder,
+    _write_keyframe,
+    play,
+)
+
+
+def record(recorder, moves, ticks):
+    for _ in range(ticks):
+        recorder.set_direction(moves.choice((UP, DOWN, LEFT, RIGHT)))
+        recorder.step()
+
+
+def test_playback_reproduces_recorded_game():
+    recorder = ReplayRecorder(8, 8, wrap=True, seed=3)
+    record(recorder, Random(1), 300)
+    replay = recorder.replay()
+    assert not recorder.state.alive
+    assert recorder.state.score > 0
+
+    result = play(replay)
+    assert result.state == recorder.state
+    assert result.ticks == replay.ticks
+    assert result.game_over
+
+
+def test_playback_of_live_game_stops_at_recorded_tick():
+    recorder = ReplayRecorder(20, 20, seed=5)
+    for direction in (RIGHT, RIGHT, DOWN, DOWN, DOWN, LEFT):
+        recorder.set_direction(direction)
+        recorder.step()
+    replay = recorder.replay()
+    assert replay.runs == ((RIGHT, 2), (DOWN, 3), (LEFT, 1))
+
+    game = replay.new_game()
+    result = play(replay, game)
+    assert result.state == recorder.state
+    assert game.state == recorder.state
+    assert not result.game_over
+
+
+def test_binary_round_trip_is_compact(tmp_path):
+    recorder = ReplayRecorder(30, 30, seed=2, keyframe_interval=0)
+    recorder.set_direction(DOWN)
+    for _ in range(10):
+        recorder.step()
+    replay = recorder.replay()
+    data = replay.to_bytes()
+    assert Replay.from_bytes(data) == replay
+    assert len(data) <= 4 + 2 + 1 + 1 + 9 + 1 + 1 + FOOTER.size
+
+    path = tmp_path / "game.snkr"
+    replay.save(path)
+    assert Replay.load(path) == replay
+
+
+def test_reset_reseeds_deterministically():
+    def episodes(seed):
+        recorder = ReplayRecorder(10, 10, seed=seed)
+        moves = Random(0)
+        for _ in range(3):
+            record(recorder, moves, 40)
+            recorder.reset()
+        return recorder.episodes
+
+    first = episodes(9)
+    assert first == episodes(9)
+    assert len({replay.seed for replay in first}) == 3
+    for replay in first:
+        assert play(replay).ticks == replay.ticks
+    assert first != episodes(10)
+
+
+def test_recorder_forwards_observers_and_skips_dead_ticks(event_log, observer_from_log):
+    recorder = ReplayRecorder(6, 6, seed=1)
+    recorder.add_observer(observer_from_log(event_log))
+    for _ in range(5):
+        recorder.step()
+    assert recorder.replay().ticks == 3
+    assert event_log[0] == EVENT_STEP
+
+
+def test_decoding_rejects_bad_data():
+    data = Replay(10, 10, False, 7, ((UP, 300),)).to_bytes()
+    with pytest.raises(ValueError, match="Not a snake replay"):
+        Replay.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="version"):
+        Replay.from_bytes(data[:4] + b"\x09" + data[5:])
+    with pytest.raises(ValueError, match="Truncated"):
+        Replay.from_bytes(data[:-1])
+    with pytest.raises(ValueError, match="non-negative"):
+        Replay(10, 10, False, -1).to_bytes()
+
+
+def record_states(recorder, moves, ticks):
+    states = [recorder.state]
+    for _ in range(ticks):
+        recorder.set_direction(moves.choice((UP, DOWN, LEFT, LEFT, DOWN)))
+        if recorder.step().game_over:
+            break
+        states.append(recorder.state)
+    return states
+
+
+def test_keyframed_file_seeks_to_every_tick(tmp_path):
+    recorder = ReplayRecorder(12, 12, wrap=True, seed=4, keyframe_interval=16)
+    states = record_states(recorder, Random(2), 400)
+    replay = recorder.replay()
+    assert replay.ticks > 3 * 16
+    assert recorder.state.score > 3
+    path = tmp_path / "game.snkr"
+    replay.save(path)
+
+    with ReplayFile(path) as reader:
+        assert (reader.width, reader.height, reader.wrap) == (12, 12, True)
+        assert reader.ticks == replay.ticks
+        assert reader.replay() == replay
+        for tick in range(replay.ticks - 1, -1, -7):
+            assert reader.state_at(tick) == states[tick]
+        assert reader.state_at(replay.ticks) == recorder.state
+        with pytest.raises(IndexError):
+            reader.game_at(replay.ticks + 1)
+
+    result = play(replay)
+    assert result.state == recorder.state
+    assert (result.ticks, result.grew) == (replay.ticks, recorder.state.score)
+
+
+def test_keyframed_playback_of_exact_multiple_of_interval():
+    recorder = ReplayRecorder(20, 20, seed=1, keyframe_interval=4)
+    recorder.set_direction(DOWN)
+    for _ in range(8):
+        recorder.step()
+    result = play(recorder.replay())
+    assert result.state == recorder.state
+    assert (result.ticks, result.game_over) == (8, False)
+
+
+def test_file_without_keyframes_seeks_from_the_start(tmp_path):
+    recorder = ReplayRecorder(10, 10, seed=8, keyframe_interval=0)
+    states = record_states(recorder, Random(5), 30)
+    path = tmp_path / "game.snkr"
+    recorder.replay().save(path)
+    with ReplayFile(path) as reader:
+        assert reader.keyframe_interval == 0
+        assert reader.state_at(len(states) - 1) == states[-1]
+        assert reader.state_at(0) == states[0]
+
+
+def test_version_1_files_are_still_read(tmp_path):
+    data = MAGIC + bytes([1, 0, 10, 10, 7, 5 << 2 | 3, 2 << 2 | 1])
+    replay = Replay.from_bytes(data)
+    assert replay == Replay(10, 10, False, 7, ((RIGHT, 5), (DOWN, 2)))
+    path = tmp_path / "old.snkr"
+    path.write_bytes(data)
+    with ReplayFile(path) as reader:
+        assert reader.ticks == 7
+        assert reader.state_at(7) == play(replay).state
+
+
+def test_reader_rejects_bad_files(tmp_path):
+    path = tmp_path / "bad.snkr"
+    path.write_bytes(b"nope")
+    with pytest.raises(ValueError, match="Not a snake replay"):
+        ReplayFile(path)
+    path.write_bytes(MAGIC + bytes([2, 0, 10, 10, 7, 0]))
+    with pytest.raises(ValueError, match="Truncated"):
+        ReplayFile(path)
+    with pytest.raises(ValueError, match="Truncated"):
+        Replay.from_bytes(MAGIC + bytes([2, 0, 0x80]))
+    with pytest.raises(ValueError, match="keyframe_interval"):
+        ReplayRecorder(keyframe_interval=-1)
+
+
+def test_keyframes_need_a_plain_mersenne_twister_state():
+    state = ReplayRecorder(seed=1).state
+    with pytest.raises(ValueError, match="random state"):
+        _write_keyframe(bytearray(), state, (3, (0,) * 625, 0.5))
@@ -0,0 +1,172 @@
+import mmap
+from random import Random
+
+import pytest
+
+from snake_game import snapshot
+from snake_game.controllers import GreedyController
+from snake_game.core import (
+    DOWN,
+    LEFT,
+    NO_FOOD,
+    UP,
+    Game,
+    GameState,
+    MovementStrategy,
+    WraparoundMovementStrategy,
+)
+from snake_game.snapshot import (
+    HEADER,
+    RNG_WORDS,
+    dump_game,
+    dump_state,
+    load_game,
+    load_state,
+)
+
+
+def play(game, moves, ticks):
+    for _ in range(ticks):
+        game.set_direction(moves.choice((UP, DOWN, LEFT, LEFT, DOWN)))
+        game.step()
+
+
+def test_state_round_trip_packs_one_word_per_segment():
+    game = Game(width=12, height=9, seed=4, strategy=WraparoundMovementStrategy())
+    play(game, Random(2), 80)
+    state = game.state
+    assert state.score > 0
+
+    data = dump_state(state)
+    assert len(data) == HEADER.size + 4 * len(state.snake)
+    loaded = load_state(data)
+    assert loaded == state
+    assert loaded.snake._positions is state.snake._positions
+
+
+def test_state_round_trip_of_plain_and_finished_states():
+    state = GameState(
+        7, 6, ((3, 2), (2, 2), (2, 3)), LEFT, NO_FOOD, alive=False, score=12
+    )
+    loaded = load_state(bytearray(dump_state(state)))
+    assert loaded == state
+    assert list(loaded.snake) == [(3, 2), (2, 2), (2, 3)]
+    assert not loaded.alive
+
+
+def test_game_round_trip_continues_identically():
+    game = Game(width=10, height=10, seed=8, strategy=WraparoundMovementStrategy())
+    play(game, Random(3), 40)
+    restored = load_game(dump_game(game))
+    assert isinstance(restored.strategy, WraparoundMovementStrategy)
+    assert restored.state == game.state
+    assert restored.rng_state() == game.rng_state()
+
+    play(game, Random(5), 200)
+    play(restored, Random(5), 200)
+    assert restored.state == game.state
+    assert game.state.score > 0
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+def test_loaded_games_keep_placing_the_same_food(wrap):
+    # A game's history (which cells it freed, in which order) must not leak into
+    # the food it places after loading.
+    apples = 0
+    for seed in range(30):
+        strategy = WraparoundMovementStrategy() if wrap else None
+        game = Game(width=9, height=8, seed=seed, strategy=strategy)
+        controller = GreedyController(wrap=wrap)
+        for _ in range(Random(seed).randrange(20, 120)):
+            game.set_direction(controller.choose(game) or UP)
+            if game.step().game_over:
+                game.reset(seed)
+        restored = load_game(dump_game(game))
+        eaten = 0
+        while eaten < 4:
+            direction = controller.choose(game) or UP
+            game.set_direction(direction)
+            restored.set_direction(direction)
+            result = game.step()
+            assert restored.step() == result
+            if result.game_over:
+                break
+            eaten += result.grew
+        apples += eaten
+    assert apples > 100
+
+
+def test_restore_of_forked_game_leaves_the_parent_alone():
+    game = Game(width=10, height=10, seed=8)
+    fork = game.fork()
+    restored = load_game(memoryview(dump_game(fork)))
+    play(restored, Random(1), 30)
+    assert game.rng_state() == fork.rng_state()
+    assert load_state(dump_state(game.state)) == fork.state
+
+
+def test_decoding_reads_mapped_files_without_holding_them(tmp_path):
+    game = Game(width=20, height=20, seed=1)
+    path = tmp_path / "game.snk"
+    path.write_bytes(b"pad!" + dump_game(game))
+    with path.open("rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        restored = load_game(memoryview(mapped)[4:])
+        state = load_state(memoryview(mapped)[4:])
+        mapped.close()
+    assert restored.state == game.state == state
+
+
+def test_other_byte_orders_swap_words(monkeypatch):
+    game = Game(width=10, height=10, seed=8)
+    native = dump_game(game)
+    monkeypatch.setattr(snapshot, "_SWAP", True)
+    swapped = dump_game(game)
+    assert swapped != native
+    assert swapped[: HEADER.size] == native[: HEADER.size]
+    restored = load_game(swapped)
+    assert restored.state == game.state
+    assert restored.rng_state() == game.rng_state()
+
+
+def test_games_need_a_known_strategy_and_rng_state():
+    class Diagonal(MovementStrategy):
+        def next_head(self, state):
+            return state.head[0] + 1, state.head[1] + 1
+
+    with pytest.raises(ValueError, match="movement strategy"):
+        dump_game(Game(width=10, height=10, strategy=Diagonal()))
+    game = Game(width=10, height=10)
+    with pytest.raises(ValueError, match="not a game"):
+        load_game(dump_state(game.state))
+    data = bytearray(dump_game(game))
+    data[5] = 9
+    with pytest.raises(ValueError, match="movement strategy"):
+        load_game(data)
+
+    game._rng.gauss(0, 1)
+    with pytest.raises(ValueError, match="random state"):
+        dump_game(game)
+
+
+def test_decoding_rejects_bad_data():
+    data = dump_game(Game(width=10, height=10, seed=2))
+    assert len(data) == HEADER.size + 4 * (3 + RNG_WORDS)
+    with pytest.raises(ValueError, match="Truncated"):
+        load_state(data[: HEADER.size - 1])
+    with pytest.raises(ValueError, match="Not a snake snapshot"):
+        load_state(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="version"):
+        load_state(data[:4] + b"\x09" + data[5:])
+    with pytest.raises(ValueError, match="Truncated"):
+        load_game(data[:-1])
+    with pytest.raises(ValueError, match="Corrupt"):
+        load_state(data[:6] + b"\x07" + data[7:])
+    with pytest.raises(ValueError, match="Corrupt"):
+        load_state(data[: HEADER.size] + b"\xff" * 4 + data[HEADER.size + 4 :])
+    fields = HEADER.unpack_from(data)
+    # Width, height, food cell and body length out of range.
+    for index, value in ((5, 4), (6, 4), (7, -2), (7, 100), (9, 0)):
+        header = HEADER.pack(*fields[:index], value, *fields[index + 1 :])
+        with pytest.raises(ValueError, match="Corrupt"):
+            load_state(header + data[HEADER.size :])
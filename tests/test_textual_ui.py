@@ -1,19 +1,20 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from unittest.mock import MagicMock, patch
 
 import pytest
 from test_support import FakeGame
 
 import snake_game.textual_ui as ui
-from snake_game.core import DOWN, LEFT, RIGHT, UP, GameState, StepResult
+from snake_game.core import DOWN, LEFT, RIGHT, UP, StepResult
 from snake_game.settings import Settings, SettingsStore, SpeedPreset
 
 
 class DyingGame(FakeGame):
     def step(self) -> StepResult:
         self.step_calls += 1
-        self._state = GameState(**{**self._state.__dict__, "alive": False, "score": 5})
+        self._state = replace(self._state, alive=False, score=5)
         for observer in list(self._observers):
             observer.on_state_change(self._state, "game_over")
         return StepResult(self._state, grew=False, game_over=True)
@@ -72,9 +73,7 @@ def test_render_board_has_correct_dimensions():
 
 def test_render_board_shows_snake():
     game = ui._create_game(False, 20, 15)
-    game._state = GameState(
-        **{**game.state.__dict__, "snake": ((5, 5), (4, 5), (3, 5))}
-    )
+    game._state = replace(game.state, snake=((5, 5), (4, 5), (3, 5)))
     result = ui._render_board(game)
     assert "@" in result.plain
     assert "o" in result.plain
@@ -82,21 +81,21 @@ def test_render_board_shows_snake():
 
 def test_render_board_shows_food():
     game = ui._create_game(False, 20, 15)
-    game._state = GameState(**{**game.state.__dict__, "food": (10, 7)})
+    game._state = replace(game.state, food=(10, 7))
     result = ui._render_board(game)
     assert "*" in result.plain
 
 
 def test_render_board_hides_food_when_dead():
     game = ui._create_game(False, 20, 15)
-    game._state = GameState(**{**game.state.__dict__, "alive": False, "food": (10, 7)})
+    game._state = replace(game.state, alive=False, food=(10, 7))
     result = ui._render_board(game)
     assert "*" not in result.plain
 
 
 def test_render_status_running():
     game = ui._create_game(False, 20, 15)
-    game._state = GameState(**{**game.state.__dict__, "score": 5})
+    game._state = replace(game.state, score=5)
     result = ui._render_status(game, paused=False, wrap_enabled=False)
     result_str = result.plain
     assert "Score:" in result_str
@@ -115,7 +114,7 @@ def test_render_status_paused():
 
 def test_render_status_game_over():
     game = ui._create_game(False, 20, 15)
-    game._state = GameState(**{**game.state.__dict__, "alive": False})
+    game._state = replace(game.state, alive=False)
     result = ui._render_status(game, paused=False, wrap_enabled=False)
     result_str = result.plain
     assert "GAME OVER" in result_str
@@ -133,6 +132,12 @@ def test_render_status_wrap_on():
     assert "Wrap: ON" in result.plain
 
 
+def test_render_status_autopilot():
+    game = ui._create_game(False, 20, 15)
+    result = ui._render_status(game, paused=False, wrap_enabled=False, autopilot=True)
+    assert "AUTOPILOT" in result.plain
+
+
 def test_observer_calls_refresh_view():
     screen = MagicMock()
     observer = ui._TextualObserver(screen)
@@ -535,3 +540,16 @@ async def test_game_over_overlay_mount(tmp_path):
         await app.push_screen(overlay)
         await pilot.pause()
         assert isinstance(app.screen, ui.GameOverOverlay)
+
+
+def test_game_screen_autopilot_steers_until_toggled_off(fake_game):
+    screen = ui.GameScreen(fake_game, 0.12, wrap_enabled=False)
+    screen.refresh_view = MagicMock()
+    screen.action_toggle_autopilot()
+    screen._on_tick()
+    assert fake_game.set_direction_calls == [RIGHT]
+    assert fake_game.step_calls == 1
+    screen.action_toggle_autopilot()
+    screen._on_tick()
+    assert fake_game.set_direction_calls == [RIGHT]
+    assert fake_game.step_calls == 2
@@ -0,0 +1,118 @@
+import json
+import os
+
+import pytest
+
+from snake_game.headless import controller_factory, simulate
+from snake_game.tournament import (
+    main,
+    plan_chunks,
+    play_chunk,
+    run_chunks,
+    run_tournament,
+)
+
+
+def test_plan_covers_every_seed_once_per_policy():
+    chunks = plan_chunks(["greedy", "random"], 7, 10, 8, False, 5, 100, 3)
+    assert [(c.policy, c.first_seed, c.games) for c in chunks] == [
+        ("greedy", 5, 3),
+        ("greedy", 8, 3),
+        ("greedy", 11, 1),
+        ("random", 5, 3),
+        ("random", 8, 3),
+        ("random", 11, 1),
+    ]
+    result = play_chunk(chunks[2])
+    assert [outcome.seed for outcome in result.outcomes] == [11]
+    assert result.worker == os.getpid()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_match_a_serial_simulation(workers):
+    seen = []
+    report = run_tournament(
+        ["greedy", "random"],
+        games=9,
+        width=8,
+        height=7,
+        wrap=True,
+        seed=3,
+        workers=workers,
+        chunk_size=2,
+        on_chunk=seen.append,
+    )
+    assert len(seen) == 10
+    assert report.workers == workers
+    for policy in ("greedy", "random"):
+        expected = simulate(
+            controller_factory(policy, wrap=True),
+            games=9,
+            width=8,
+            height=7,
+            wrap=True,
+            seed=3,
+            policy=policy,
+        )
+        actual = report.policies[policy]
+        assert (actual.games, actual.ticks, actual.deaths) == (
+            expected.games,
+            expected.ticks,
+            expected.deaths,
+        )
+        assert actual.scores == expected.scores
+        assert actual.lengths == expected.lengths
+
+    stats = report.worker_stats
+    assert sum(worker.games for worker in stats) == 18
+    assert sum(worker.chunks for worker in stats) == 10
+    assert sum(worker.ticks for worker in stats) == sum(
+        policy.ticks for policy in report.policies.values()
+    )
+    assert all(worker.ticks_per_sec > 0 for worker in stats)
+    if workers == 1:
+        assert [worker.worker for worker in stats] == [os.getpid()]
+        assert [result.chunk.first_seed for result in seen[:5]] == [3, 5, 7, 9, 11]
+
+
+def test_closing_the_stream_early_cancels_pending_chunks():
+    chunks = plan_chunks(["greedy"], 40, 8, 7, False, 0, 200, 1)
+    results = run_chunks(chunks, workers=2)
+    first = next(results)
+    results.close()
+    assert first.chunk.games == 1
+
+
+def test_tournament_checks_its_arguments():
+    with pytest.raises(ValueError, match="at least one game"):
+        run_tournament(["greedy"], games=0)
+    with pytest.raises(ValueError, match="at least one policy"):
+        run_tournament([], games=1)
+    with pytest.raises(ValueError, match="chunk_size"):
+        run_tournament(["greedy"], games=1, chunk_size=0)
+    with pytest.raises(ValueError, match="workers"):
+        run_tournament(["greedy"], games=1, workers=0)
+    with pytest.raises(ValueError, match="needs --script"):
+        run_tournament(["script"], games=1, workers=1)
+
+
+def test_main_streams_progress_and_prints_json(capsys, tmp_path):
+    script = tmp_path / "moves.txt"
+    script.write_text("R R D D L L U U\n")
+    argv = ["--policies", "greedy", "script", "--games", "4", "--width", "8"]
+    argv += ["--height", "8", "--workers", "1", "--chunk-size", "3"]
+    argv += ["--script", str(script), "--progress"]
+    assert main(argv) == 0
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert sorted(report["policies"]) == ["greedy", "script"]
+    assert report["policies"]["script"]["games"] == 4
+    assert captured.err.startswith("greedy seeds 0-2: ")
+    assert "script seeds 3-3: " in captured.err
+
+    output = tmp_path / "report.json"
+    argv = ["--policies", "random", "--games", "2", "--workers", "1"]
+    assert main([*argv, "--output", str(output)]) == 0
+    assert json.loads(output.read_text())["policies"]["random"]["games"] == 2
+    with pytest.raises(SystemExit):
+        main(["--policies", "script", "--games", "2"])